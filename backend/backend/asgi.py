@@ -5,6 +5,15 @@ It exposes the ASGI callable as a module-level variable named ``application``.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
+
+Serve it with an ASGI server, e.g.:
+
+    uvicorn backend.asgi:application --workers 4
+
+The async read endpoints live under /api/async/; every other view still
+runs synchronously (in a thread) under ASGI. The live event stream at
+/api/events/ needs ASGI, and its broker is per process: with several
+workers a client only sees writes handled by the worker it is connected to.
 """
 
 import os
@@ -12,5 +21,8 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend.settings')
+# Persistent connections are per thread and leak under ASGI, where requests
+# do not reuse threads; Django recommends CONN_MAX_AGE = 0 here
+os.environ.setdefault('DB_CONN_MAX_AGE', '0')
 
 application = get_asgi_application()
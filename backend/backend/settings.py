@@ -10,7 +10,9 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import os
 from pathlib import Path
+from django.core.exceptions import ImproperlyConfigured
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -36,6 +38,9 @@ CORS_ALLOWED_ORIGINS = [
     'http://127.0.0.1:5173',
     'http://127.0.0.1:5174',
 ]
+# Browsers may send Idempotency-Key on writes (see inventory/idempotency.py)
+from corsheaders.defaults import default_headers
+CORS_ALLOW_HEADERS = (*default_headers, 'idempotency-key')
 CSRF_TRUSTED_ORIGINS = [
     "http://localhost:5173",
     'http://127.0.0.1:5173',
@@ -58,6 +63,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'inventory.instrumentation.InstrumentationMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -91,13 +97,81 @@ WSGI_APPLICATION = 'backend.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
-DATABASES = {
+# DATABASE_PROFILE picks the backend:
+# - 'sqlite' (default): WAL journal (readers never block the writer),
+#   synchronous=NORMAL, memory-mapped reads, a busy timeout and IMMEDIATE write
+#   transactions, so concurrent writers queue for the lock instead of failing
+#   with "database is locked". Connections are kept open between requests.
+# - 'postgres': psycopg 3 with a connection pool (pip install "psycopg[pool]").
+
+DATABASE_PROFILE = os.environ.get('DATABASE_PROFILE', 'sqlite')
+
+if DATABASE_PROFILE == 'sqlite':
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': os.environ.get('SQLITE_PATH', BASE_DIR / 'db.sqlite3'),
+            'CONN_MAX_AGE': int(os.environ.get('DB_CONN_MAX_AGE', 600)),
+            'CONN_HEALTH_CHECKS': True,
+            # Tests run on a file rather than the default in-memory database,
+            # which threads can only share with table-level locks that fail
+            # instead of waiting (see the concurrency tests)
+            'TEST': {'NAME': os.environ.get('SQLITE_TEST_PATH', BASE_DIR / 'test_db.sqlite3')},
+            'OPTIONS': {
+                # Seconds a connection waits for a lock before raising
+                'timeout': int(os.environ.get('SQLITE_BUSY_TIMEOUT', 20)),
+                'transaction_mode': 'IMMEDIATE',
+                # Run on every new connection
+                'init_command': ';'.join([
+                    'PRAGMA journal_mode=WAL',
+                    'PRAGMA synchronous=NORMAL',
+                    f"PRAGMA mmap_size={int(os.environ.get('SQLITE_MMAP_SIZE', 134217728))}",
+                    'PRAGMA temp_store=MEMORY',
+                ]),
+            },
+        }
+    }
+elif DATABASE_PROFILE == 'postgres':
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.postgresql',
+            'NAME': os.environ.get('POSTGRES_DB', 'inventory'),
+            'USER': os.environ.get('POSTGRES_USER', 'inventory'),
+            'PASSWORD': os.environ.get('POSTGRES_PASSWORD', ''),
+            'HOST': os.environ.get('POSTGRES_HOST', 'localhost'),
+            'PORT': os.environ.get('POSTGRES_PORT', '5432'),
+            # The pool replaces persistent connections; Django requires CONN_MAX_AGE = 0 with it
+            'CONN_MAX_AGE': 0,
+            'OPTIONS': {
+                'pool': {
+                    'min_size': int(os.environ.get('POSTGRES_POOL_MIN_SIZE', 2)),
+                    'max_size': int(os.environ.get('POSTGRES_POOL_MAX_SIZE', 10)),
+                    'timeout': int(os.environ.get('POSTGRES_POOL_TIMEOUT', 10)),
+                },
+            },
+        }
+    }
+else:
+    raise ImproperlyConfigured(f"Unknown DATABASE_PROFILE '{DATABASE_PROFILE}' (expected 'sqlite' or 'postgres').")
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+# Per-process memory cache by default; point the env vars at a shared backend
+# (e.g. django.core.cache.backends.redis.RedisCache) when running several workers.
+# Cached responses are keyed on table versions kept in the database, so a
+# per-process cache only costs hit ratio, never freshness.
+
+CACHES = {
     'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+        'BACKEND': os.environ.get('CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.environ.get('CACHE_LOCATION', 'inventory'),
     }
 }
 
+# Seconds a cached product/customer response may live (it is also invalidated on writes)
+INVENTORY_CACHE_TIMEOUT = int(os.environ.get('INVENTORY_CACHE_TIMEOUT', 300))
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -120,9 +194,35 @@ AUTH_PASSWORD_VALIDATORS = [
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
         'rest_framework_simplejwt.authentication.JWTAuthentication',
-    )
+    ),
+    'DEFAULT_RENDERER_CLASSES': (
+        'inventory.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
 }
 
+# Serve list endpoints from '.values()' rows instead of DRF serializers by
+# default (clients can still choose per request with '?fast=0' / '?fast=1')
+INVENTORY_FAST_SERIALIZATION = os.environ.get('INVENTORY_FAST_SERIALIZATION', '').lower() in ('1', 'true', 'yes')
+
+# The changes/ feed skips entries younger than this. Keep 0 on the sqlite
+# profile, where write transactions commit in change-token order. On
+# postgres set it above the longest write transaction, so a client never
+# moves its token past an entry that has not committed yet.
+INVENTORY_CHANGES_SETTLE_SECONDS = float(os.environ.get('INVENTORY_CHANGES_SETTLE_SECONDS', 0))
+
+# Where background jobs keep uploads to process and files they produce
+INVENTORY_JOB_FILES_DIR = Path(os.environ.get('INVENTORY_JOB_FILES_DIR', BASE_DIR / 'job_files'))
+
+# How long a response to a request with an Idempotency-Key is kept for replay
+INVENTORY_IDEMPOTENCY_TTL_SECONDS = int(os.environ.get('INVENTORY_IDEMPOTENCY_TTL_SECONDS', 24 * 60 * 60))
+
+# Share of requests (0..1) measured by InstrumentationMiddleware for
+# Server-Timing headers and the /api/metrics/ endpoint; 0 turns it off
+INVENTORY_METRICS_SAMPLE_RATE = float(os.environ.get('INVENTORY_METRICS_SAMPLE_RATE', 0))
+# Sampled requests slower than this are logged with their slowest queries
+INVENTORY_SLOW_REQUEST_MS = int(os.environ.get('INVENTORY_SLOW_REQUEST_MS', 500))
+
 from datetime import timedelta
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(minutes=5),
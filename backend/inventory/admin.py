@@ -3,9 +3,22 @@ from .models import Customer
 from .models import Product
 from .models import Order
 from .models import OrderItem
+from .models import InventoryMovement
+
+
+@admin.register(Product)
+class ProductAdmin(admin.ModelAdmin):
+    def save_model(self, request, obj, form, change):
+        # Stock edited here goes to the ledger like API edits, so
+        # reconcile_stock does not report it as drift
+        if change:
+            with InventoryMovement.objects.tracking(Product.objects.filter(pk=obj.pk), InventoryMovement.Reason.ADJUSTMENT):
+                super().save_model(request, obj, form, change)
+        else:
+            super().save_model(request, obj, form, change)
+            InventoryMovement.objects.record({obj.pk: obj.stock_quantity}, InventoryMovement.Reason.OPENING)
 
 
 admin.site.register(Customer)
-admin.site.register(Product)
 admin.site.register(Order)
-admin.site.register(OrderItem)
\ No newline at end of file
+admin.site.register(OrderItem)
@@ -0,0 +1,154 @@
+from contextlib import nullcontext
+from django.db import transaction
+from django.utils import timezone
+from rest_framework import serializers, status
+from rest_framework.response import Response
+from .cache import invalidate
+from .models import ChangeLog, Customer, InventoryMovement, Order, Product
+
+BATCH_CHUNK_SIZE = 500
+MAX_BATCH_ROWS = 10000
+
+
+def _stock_ledger(model, key_field, keys):
+    # Product upserts overwrite stock_quantity; log the differences
+    if model is Product:
+        products = Product.objects.filter(**{f'{key_field}__in': keys})
+        return InventoryMovement.objects.tracking(products, InventoryMovement.Reason.ADJUSTMENT)
+    return nullcontext()
+
+
+def upsert_rows(serializer_class, key_field, rows, chunk_size=BATCH_CHUNK_SIZE):
+    """
+    Validate and upsert a list of rows keyed on a unique field.
+
+    - Each row is validated with serializer_class. Invalid rows are reported
+      and skipped, and the rest are still written.
+    - If a key appears more than once, the last row for it wins.
+    - Rows are written in chunks, one transaction per chunk. New keys use
+      bulk_create(update_conflicts=True) and existing keys use bulk_update.
+      Each chunk costs a fixed number of queries.
+
+    Returns:
+        list: One result dict per input row, in input order, with 'index',
+        'status' ('created', 'updated', 'skipped' or 'error') and either the
+        row 'id' or 'errors'.
+    """
+    model = serializer_class.Meta.model
+    child = serializer_class()
+    results = [None] * len(rows)
+
+    latest = {}
+    for index, row in enumerate(rows):
+        try:
+            data = child.run_validation(row)
+        except serializers.ValidationError as exc:
+            results[index] = {'index': index, 'status': 'error', 'errors': exc.detail}
+            continue
+        key = data[key_field]
+        if key in latest:
+            results[latest[key][0]] = {
+                'index': latest[key][0],
+                'status': 'skipped',
+                'errors': {key_field: [f'Superseded by a later row with the same {key_field}']},
+            }
+        latest[key] = (index, data)
+
+    pending = list(latest.values())
+    for start in range(0, len(pending), chunk_size):
+        chunk = pending[start:start + chunk_size]
+        keys = [data[key_field] for _, data in chunk]
+        with transaction.atomic(), _stock_ledger(model, key_field, keys):
+            existing = model.objects.in_bulk(keys, field_name=key_field)
+
+            # bulk_update skips pre_save(), so auto_now fields are set by hand
+            now = timezone.now()
+            auto_now = [f.name for f in model._meta.concrete_fields if getattr(f, 'auto_now', False)]
+
+            to_create, to_update, update_fields = [], [], set(auto_now)
+            for index, data in chunk:
+                instance = existing.get(data[key_field])
+                if instance is None:
+                    to_create.append((index, model(**data)))
+                    continue
+                for field, value in data.items():
+                    setattr(instance, field, value)
+                for field in auto_now:
+                    setattr(instance, field, now)
+                update_fields.update(data)
+                to_update.append((index, instance))
+
+            if to_create:
+                model.objects.bulk_create(
+                    [obj for _, obj in to_create],
+                    update_conflicts=True,
+                    unique_fields=[key_field],
+                    update_fields=[
+                        f.name for f in model._meta.concrete_fields
+                        if not f.primary_key and f.name != key_field
+                    ],
+                )
+            update_fields.discard(key_field)
+            if to_update and update_fields:
+                model.objects.bulk_update([obj for _, obj in to_update], sorted(update_fields))
+            # bulk writes skip the post_save signal that feeds the change log
+            ChangeLog.objects.record(model, [obj.pk for _, obj in to_create + to_update])
+            invalidate(model)
+
+        for status, written in (('created', to_create), ('updated', to_update)):
+            for index, obj in written:
+                results[index] = {'index': index, 'status': status, 'id': obj.pk, key_field: getattr(obj, key_field)}
+
+    return results
+
+
+def delete_by_keys(model, key_field, keys):
+    """
+    Delete all rows whose key_field is in keys.
+
+    Returns:
+        list: One result dict per requested key with status 'deleted' or
+        'not_found'.
+    """
+    with transaction.atomic():
+        found = set(model.objects.filter(**{f'{key_field}__in': keys}).values_list(key_field, flat=True))
+        if model is Customer:
+            # Their orders go first, so they also leave the sales rollups
+            Order.objects.filter(**{f'customer__{key_field}__in': found}).delete_in_chunks()
+        model.objects.filter(**{f'{key_field}__in': found}).delete()
+    return [
+        {key_field: key, 'status': 'deleted' if key in found else 'not_found'}
+        for key in keys
+    ]
+
+
+def batch_response(request, serializer_class, key_field, keys_param):
+    """
+    Shared handler for the product/customer batch endpoints.
+
+    - POST: body is a JSON array of rows to upsert on key_field.
+    - DELETE: body is {keys_param: [...]} listing the keys to delete.
+
+    Returns:
+        - 200 OK with per-row 'results' and a count per status.
+        - 400 Bad Request if the body has the wrong shape or too many rows.
+    """
+    if request.method == 'DELETE':
+        keys = request.data.get(keys_param) if isinstance(request.data, dict) else None
+        if not isinstance(keys, list) or not keys:
+            return Response({'error': f"'{keys_param}' must be a non-empty list"}, status=status.HTTP_400_BAD_REQUEST)
+        if len(keys) > MAX_BATCH_ROWS:
+            return Response({'error': f'At most {MAX_BATCH_ROWS} keys per request'}, status=status.HTTP_400_BAD_REQUEST)
+        results = delete_by_keys(serializer_class.Meta.model, key_field, keys)
+    else:
+        rows = request.data
+        if not isinstance(rows, list) or not rows:
+            return Response({'error': 'Request body must be a non-empty JSON array'}, status=status.HTTP_400_BAD_REQUEST)
+        if len(rows) > MAX_BATCH_ROWS:
+            return Response({'error': f'At most {MAX_BATCH_ROWS} rows per request'}, status=status.HTTP_400_BAD_REQUEST)
+        results = upsert_rows(serializer_class, key_field, rows)
+
+    summary = {}
+    for result in results:
+        summary[result['status']] = summary.get(result['status'], 0) + 1
+    return Response({'summary': summary, 'results': results}, status=status.HTTP_200_OK)
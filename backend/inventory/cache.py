@@ -0,0 +1,128 @@
+import hashlib
+import time
+from functools import wraps
+from django.conf import settings
+from django.core.cache import caches
+from django.db import models
+from rest_framework import status
+from rest_framework.response import Response
+
+CACHED_RESOURCES = ('product', 'customer')
+# Resources with a version that every write bumps. The cached responses and
+# the list ETags in conditional.py are keyed on it.
+VERSIONED_RESOURCES = ('product', 'customer', 'order')
+KEY_PREFIX = 'inventory'
+
+
+def _cache():
+    return caches[getattr(settings, 'INVENTORY_CACHE_ALIAS', 'default')]
+
+
+def _timeout():
+    return getattr(settings, 'INVENTORY_CACHE_TIMEOUT', 300)
+
+
+def _stat_key(resource, outcome):
+    return f'{KEY_PREFIX}:stats:{resource}:{outcome}'
+
+
+def _incr(cache, key, seed):
+    # incr() fails on a missing key; add() is a no-op if another process won the race
+    cache.add(key, seed, timeout=None)
+    try:
+        return cache.incr(key)
+    except ValueError:
+        cache.set(key, seed + 1, timeout=None)
+        return seed + 1
+
+
+def get_versions(resources):
+    """
+    Current versions of several resources, in one query. Every cached
+    response key embeds them, so bumping a version invalidates all of that
+    resource's responses at once.
+    """
+    # Imported here, models.py imports this module
+    from .models import TableVersion
+    versions = dict(TableVersion.objects.filter(resource__in=resources).values_list('resource', 'version'))
+    return {resource: versions.get(resource, 0) for resource in resources}
+
+
+def get_version(resource):
+    return get_versions([resource])[resource]
+
+
+def _bump(resource):
+    from .models import TableVersion
+    if not TableVersion.objects.filter(resource=resource).update(version=models.F('version') + 1):
+        # Seed from the clock so a recreated row never reuses an old version
+        TableVersion.objects.bulk_create(
+            [TableVersion(resource=resource, version=int(time.time() * 1000))], ignore_conflicts=True,
+        )
+
+
+def invalidate(*models_or_resources):
+    """
+    Bump the version of the given models (or resource names) in the current
+    transaction, so it commits or rolls back with the write itself. That
+    drops their cached responses and changes their list ETags in every
+    worker process.
+    """
+    for item in models_or_resources:
+        resource = item if isinstance(item, str) else item._meta.model_name
+        if resource in VERSIONED_RESOURCES:
+            _bump(resource)
+
+
+def _record(resource, outcome):
+    _incr(_cache(), _stat_key(resource, outcome), 0)
+
+
+def get_stats():
+    """
+    Hit/miss counters per cached resource since the cache was last cleared.
+    """
+    cache = _cache()
+    keys = [_stat_key(r, o) for r in CACHED_RESOURCES for o in ('hits', 'misses')]
+    values = cache.get_many(keys)
+    stats = {}
+    for resource in CACHED_RESOURCES:
+        hits = values.get(_stat_key(resource, 'hits'), 0)
+        misses = values.get(_stat_key(resource, 'misses'), 0)
+        total = hits + misses
+        stats[resource] = {
+            'hits': hits,
+            'misses': misses,
+            'hit_ratio': round(hits / total, 4) if total else None,
+        }
+    return stats
+
+
+def cached_response(resource):
+    """
+    Read-through cache for GET views returning data about a resource.
+
+    The key covers the resource version and the full request URL (path,
+    query string and host, since paginated responses embed absolute links).
+    Only 200 responses are stored.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            url = request.build_absolute_uri()
+            digest = hashlib.md5(url.encode(), usedforsecurity=False).hexdigest()
+            key = f'{KEY_PREFIX}:{resource}:v{get_version(resource)}:{digest}'
+
+            cache = _cache()
+            data = cache.get(key)
+            if data is not None:
+                _record(resource, 'hits')
+                return Response(data, status=status.HTTP_200_OK)
+
+            _record(resource, 'misses')
+            response = view(request, *args, **kwargs)
+            if response.status_code == status.HTTP_200_OK:
+                cache.set(key, response.data, _timeout())
+            return response
+        return wrapper
+    return decorator
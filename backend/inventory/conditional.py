@@ -0,0 +1,91 @@
+import hashlib
+from django.db.models import Count, Max
+from django.views.decorators.http import condition
+from .cache import get_versions
+from .models import Customer, Order, Product
+
+# Tables whose rows are embedded in each resource's responses
+RESPONSE_TABLES = {
+    Product: (Product,),
+    Customer: (Customer,),
+    Order: (Order, Customer, Product),
+}
+
+
+def _stamp(moment):
+    return moment.isoformat() if moment else '-'
+
+
+def _detail_marker(model, pk):
+    """
+    Timestamps of every row rendered in a detail response, or None if the
+    row does not exist (so the view runs and returns its own 404).
+    """
+    if model is Order:
+        row = (
+            Order.objects.filter(pk=pk)
+            .annotate(items=Count('orderitem'), products_updated=Max('orderitem__product__updated_at'))
+            .values_list('updated_at', 'customer__updated_at', 'products_updated', 'items')
+            .first()
+        )
+        if row is None:
+            return None
+        order_updated, customer_updated, products_updated, items = row
+        stamps = [t for t in (order_updated, customer_updated, products_updated) if t]
+        return {'parts': [_stamp(t) for t in stamps] + [str(items)], 'last_modified': max(stamps)}
+
+    updated = model.objects.filter(pk=pk).values_list('updated_at', flat=True).first()
+    if updated is None:
+        return None
+    return {'parts': [_stamp(updated)], 'last_modified': updated}
+
+
+def _list_marker(model):
+    # Table versions are bumped by every write, deletes and bulk writes
+    # included (see cache.invalidate), so this is one indexed query instead
+    # of an aggregate that grows with the table
+    versions = get_versions([table._meta.model_name for table in RESPONSE_TABLES[model]])
+    parts = [f"{resource}:{version}" for resource, version in versions.items()]
+    return {'parts': parts, 'last_modified': None}
+
+
+def _marker(request, model, pk):
+    # etag_func and last_modified_func share one lookup per request
+    cache_attr = '_inventory_conditional_marker'
+    if not hasattr(request, cache_attr):
+        setattr(request, cache_attr, _detail_marker(model, pk) if pk is not None else _list_marker(model))
+    return getattr(request, cache_attr)
+
+
+def conditional_get(model):
+    """
+    Add strong ETag / Last-Modified headers to a GET view and answer
+    If-None-Match / If-Modified-Since with 304 before the view runs.
+
+    Detail ETags come from the rows' updated_at values, list ETags from the
+    versions of the tables in the response (see cache.invalidate). They are
+    never a hash of the rendered body, so a 304 costs one indexed query and
+    no serialization. The request URL
+    and Accept header are part of the tag, because every page and rendering
+    is a separate representation.
+
+    List responses carry no Last-Modified, since table versions are not
+    timestamps.
+    """
+    def etag_func(request, id=None, **kwargs):
+        marker = _marker(request, model, id)
+        if marker is None:
+            return None
+        seed = '|'.join([
+            model._meta.model_name,
+            request.get_full_path(),
+            request.META.get('HTTP_ACCEPT', ''),
+            *marker['parts'],
+        ])
+        return '"%s"' % hashlib.sha1(seed.encode(), usedforsecurity=False).hexdigest()
+
+    def last_modified_func(request, id=None, **kwargs):
+        marker = _marker(request, model, id)
+        return marker and marker['last_modified']
+
+    return condition(etag_func=etag_func, last_modified_func=last_modified_func)
@@ -0,0 +1,180 @@
+import asyncio
+import json
+import threading
+import time
+from collections import OrderedDict, deque
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+
+# Events kept for Last-Event-ID replay after a reconnect
+EVENT_BUFFER_SIZE = 1000
+# Undelivered events per subscriber before it is sent a 'reset' instead
+MAX_PENDING_EVENTS = 500
+# Idle streams get a comment line this often, so proxies keep them open
+HEARTBEAT_SECONDS = 15
+# A stream waits this long after the first new event, so bursts go out coalesced
+COALESCE_SECONDS = 0.25
+# Client reconnect delay sent in the stream's 'retry' field
+RETRY_MILLISECONDS = 3000
+
+
+class Event:
+    __slots__ = ('id', 'type', 'key', 'data')
+
+    def __init__(self, id, type, key, data):
+        self.id = id
+        self.type = type
+        self.key = key
+        self.data = data
+
+    def encode(self):
+        payload = json.dumps(self.data, cls=DjangoJSONEncoder, separators=(',', ':'))
+        return f'id: {self.id}\nevent: {self.type}\ndata: {payload}\n\n'
+
+
+class Subscription:
+    """
+    One connected client. Lives on the event loop serving its stream.
+
+    Pending events are coalesced by (type, key): a newer stock level for a
+    product replaces one the client has not received yet. If the client
+    reads slower than events arrive and more than MAX_PENDING_EVENTS pile
+    up, they are dropped and the client is told to reset (refetch) instead,
+    so a stuck client never holds more than that in memory.
+    """
+    def __init__(self, loop):
+        self.loop = loop
+        self.pending = OrderedDict()
+        self.overflowed = False
+        self.wakeup = asyncio.Event()
+
+    def deliver(self, event):
+        # Runs on self.loop (see EventBroker.publish)
+        key = (event.type, event.key)
+        self.pending.pop(key, None)
+        self.pending[key] = event
+        if len(self.pending) > MAX_PENDING_EVENTS:
+            self.pending.clear()
+            self.overflowed = True
+        self.wakeup.set()
+
+    async def wait(self, timeout):
+        """
+        Wait up to timeout seconds for events. Returns True if any arrived.
+        """
+        try:
+            await asyncio.wait_for(self.wakeup.wait(), timeout)
+        except asyncio.TimeoutError:
+            return False
+        return True
+
+    def drain(self):
+        """
+        Return (events, overflowed) and clear both.
+        """
+        events, overflowed = list(self.pending.values()), self.overflowed
+        self.pending.clear()
+        self.overflowed = False
+        self.wakeup.clear()
+        return events, overflowed
+
+
+class EventBroker:
+    """
+    In-process publish/subscribe for live events.
+
+    publish() can be called from any thread. Events go into a bounded ring
+    buffer for replay and are handed to each subscriber's event loop with
+    call_soon_threadsafe. Subscribers only exist in the process serving
+    their stream, so run the SSE endpoint in the same process that handles
+    writes (one ASGI worker), or clients miss events from other workers.
+    """
+    def __init__(self, buffer_size=EVENT_BUFFER_SIZE):
+        self._lock = threading.Lock()
+        self._buffer = deque(maxlen=buffer_size)
+        self._subscribers = set()
+        # Seed from the clock so IDs keep growing across restarts; an ID from
+        # a previous run then falls before the buffer and triggers a reset
+        self._last_id = int(time.time() * 1000)
+
+    def publish(self, type, data, key=None):
+        with self._lock:
+            self._last_id += 1
+            event = Event(self._last_id, type, key, data)
+            self._buffer.append(event)
+            for subscription in list(self._subscribers):
+                try:
+                    subscription.loop.call_soon_threadsafe(subscription.deliver, event)
+                except RuntimeError:
+                    # Its event loop has shut down
+                    self._subscribers.discard(subscription)
+
+    def subscribe(self, last_event_id=None):
+        """
+        Register a subscriber on the running event loop.
+
+        Args:
+            last_event_id: ID of the last event the client received. Buffered
+                events after it are queued for replay.
+
+        Returns:
+            tuple: (Subscription, replay_ok). replay_ok is False if events
+            after last_event_id have already left the buffer (or the ID is
+            unknown), so the client has to reset.
+        """
+        subscription = Subscription(asyncio.get_running_loop())
+        with self._lock:
+            self._subscribers.add(subscription)
+            replay_ok = True
+            if last_event_id is not None:
+                oldest = self._buffer[0].id if self._buffer else self._last_id + 1
+                replay_ok = oldest - 1 <= last_event_id <= self._last_id
+                if replay_ok:
+                    for event in self._buffer:
+                        if event.id > last_event_id:
+                            subscription.deliver(event)
+        return subscription, replay_ok
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            self._subscribers.discard(subscription)
+
+    def subscriber_count(self):
+        with self._lock:
+            return len(self._subscribers)
+
+
+BROKER = EventBroker()
+
+
+def publish_on_commit(type, data, key=None):
+    """
+    Publish once the current transaction commits (immediately outside one),
+    so subscribers never see a change that is rolled back.
+    """
+    transaction.on_commit(lambda: BROKER.publish(type, data, key))
+
+
+def publish_stock_levels(products):
+    """
+    After commit, publish a 'stock' event per product with its current
+    stock level. Events for the same product are coalesced per subscriber.
+
+    Args:
+        products: Product queryset; evaluated (one query) after commit.
+    """
+    def publish():
+        for row in products.values('id', 'sku', 'product_name', 'stock_quantity'):
+            BROKER.publish('stock', row, key=row['id'])
+    transaction.on_commit(publish)
+
+
+def publish_deleted_orders(order_ids):
+    """
+    After commit, publish an 'order_deleted' event per order, from one
+    on_commit callback however many orders a bulk delete removed.
+    """
+    def publish():
+        for pk in order_ids:
+            BROKER.publish('order_deleted', {'id': pk}, key=pk)
+    transaction.on_commit(publish)
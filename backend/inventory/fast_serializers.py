@@ -0,0 +1,140 @@
+from decimal import Decimal
+from django.conf import settings
+from django.db import models
+from django.utils import timezone
+from .models import Order, OrderItem
+from .serializers import CustomerSerializer, ProductSerializer
+
+
+def use_fast_path(request):
+    """
+    Whether a list request should skip DRF serializers for the '.values()'
+    fast path. Opt in per request with '?fast=1' or for every list with
+    settings.INVENTORY_FAST_SERIALIZATION.
+    """
+    flag = request.query_params.get('fast')
+    if flag is not None:
+        return flag.lower() in ('1', 'true', 'yes')
+    return getattr(settings, 'INVENTORY_FAST_SERIALIZATION', False)
+
+
+def _decimal_converter(field):
+    quantum = Decimal(1).scaleb(-field.decimal_places)
+    return lambda value: f'{value.quantize(quantum):f}'
+
+
+def datetime_formatter():
+    """
+    Return a datetime -> str function matching DRF's ISO-8601 DateTimeField
+    output (current time zone, 'Z' for UTC). The time zone is looked up
+    once here rather than per value.
+    """
+    tz = timezone.get_current_timezone() if settings.USE_TZ else None
+
+    def to_string(value):
+        if tz is not None and value.tzinfo is not None:
+            value = value.astimezone(tz)
+        value = value.isoformat()
+        if value.endswith('+00:00'):
+            value = value[:-6] + 'Z'
+        return value
+    return to_string
+
+
+class FastRowSerializer:
+    """
+    Turns '.values()' dicts into the same output as a flat ModelSerializer.
+
+    The field list and any per-field conversions (Decimal to a fixed-point
+    string, datetime to ISO-8601) are compiled once from the serializer
+    class. Each row then costs one dict lookup per converted field instead
+    of a model instance plus a DRF field call per column.
+    """
+    def __init__(self, serializer_class, prefix=''):
+        model = serializer_class.Meta.model
+        self.prefix = prefix
+        self.names = []
+        self.converters = []
+        for name, field in serializer_class().fields.items():
+            if field.write_only:
+                continue
+            self.names.append(name)
+            model_field = model._meta.get_field(field.source)
+            if isinstance(model_field, models.DecimalField):
+                self.converters.append((name, _decimal_converter(model_field)))
+            elif isinstance(model_field, models.DateTimeField):
+                self.converters.append((name, None))
+        self.lookups = [prefix + name for name in self.names]
+
+    def convert(self, row, format_datetime):
+        """
+        Convert a '.values(*self.lookups)' dict (in place when there is no
+        prefix) and return it.
+        """
+        if self.prefix:
+            row = {name: row[lookup] for name, lookup in zip(self.names, self.lookups)}
+        for name, convert in self.converters:
+            value = row[name]
+            if value is not None:
+                row[name] = convert(value) if convert else format_datetime(value)
+        return row
+
+    def convert_many(self, rows):
+        format_datetime = datetime_formatter()
+        return [self.convert(row, format_datetime) for row in rows]
+
+
+FAST_PRODUCT = FastRowSerializer(ProductSerializer)
+FAST_CUSTOMER = FastRowSerializer(CustomerSerializer)
+_ORDER_CUSTOMER = FastRowSerializer(CustomerSerializer, prefix='customer__')
+_ITEM_PRODUCT = FastRowSerializer(ProductSerializer, prefix='product__')
+
+_to_amount = _decimal_converter(Order._meta.get_field('total_amount'))
+_to_unit_price = _decimal_converter(OrderItem._meta.get_field('unit_price'))
+
+# '.values()' lookups for the order list fast path
+ORDER_FAST_FIELDS = ('id', 'created_at', 'total_amount', 'item_count', *_ORDER_CUSTOMER.lookups)
+
+
+def order_item_rows(order_ids):
+    """
+    '.values()' queryset of the items (with products) of the given orders,
+    as consumed by fast_order_rows. Async callers iterate it with 'async for'.
+    """
+    return (
+        OrderItem.objects
+        .filter(order_id__in=list(order_ids))
+        .order_by('id')
+        .values('id', 'order_id', 'quantity', 'unit_price', *_ITEM_PRODUCT.lookups)
+    )
+
+
+def fast_order_rows(order_rows, item_rows=None):
+    """
+    Build OrderSerializer-shaped output from Order '.values(*ORDER_FAST_FIELDS)'
+    rows. All their items and products are loaded with one more query, unless
+    already fetched from order_item_rows() and passed as item_rows.
+    """
+    format_datetime = datetime_formatter()
+    items_by_order = {row['id']: [] for row in order_rows}
+    if item_rows is None:
+        item_rows = order_item_rows(items_by_order)
+    for item in item_rows:
+        items_by_order[item['order_id']].append({
+            'id': item['id'],
+            'product': _ITEM_PRODUCT.convert(item, format_datetime),
+            'quantity': item['quantity'],
+            'unit_price': _to_unit_price(item['unit_price']),
+        })
+
+    return [
+        {
+            'id': row['id'],
+            'customer': _ORDER_CUSTOMER.convert(row, format_datetime),
+            'created_at': format_datetime(row['created_at']),
+            'total_amount': _to_amount(row['total_amount']),
+            'item_count': row['item_count'],
+            'items': items_by_order[row['id']],
+        }
+        for row in order_rows
+    ]
@@ -0,0 +1,97 @@
+import hashlib
+from datetime import timedelta
+from functools import wraps
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.response import Response
+from .models import IdempotencyKey
+
+MAX_KEY_LENGTH = 255
+
+
+def _ttl():
+    return timedelta(seconds=getattr(settings, 'INVENTORY_IDEMPOTENCY_TTL_SECONDS', 24 * 60 * 60))
+
+
+def _request_hash(request):
+    digest = hashlib.sha256()
+    digest.update(f'{request.method} {request.path}\n'.encode())
+    digest.update(request.body)
+    return digest.hexdigest()
+
+
+def _replay(record):
+    response = Response(record.response, status=record.status_code)
+    response['Idempotent-Replayed'] = 'true'
+    return response
+
+
+def idempotent(view):
+    """
+    Make a write view safe to retry with an 'Idempotency-Key' header.
+
+    The first request with a key runs the view and stores its response
+    (anything but a 5xx or an exception) under (user, key), together with a
+    hash of the method, path and body. Repeats within
+    INVENTORY_IDEMPOTENCY_TTL_SECONDS get the stored response back, marked
+    with 'Idempotent-Replayed: true', and never reach the view. Reusing a key
+    with a different request is answered with 422.
+
+    The key's row is inserted in the same transaction as the view's writes,
+    so concurrent duplicates queue on it: the database makes the second
+    insert wait until the first request commits, and it then replays that
+    response. If the first request fails, its row is rolled back with
+    everything else and the next attempt runs the view.
+
+    Requests without the header run as before.
+    """
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        key = request.headers.get('Idempotency-Key')
+        if key is None:
+            return view(request, *args, **kwargs)
+        if not key or len(key) > MAX_KEY_LENGTH:
+            return Response(
+                {'error': f'Idempotency-Key must be 1 to {MAX_KEY_LENGTH} characters'},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        owner = str(request.user.pk) if request.user.is_authenticated else ''
+        request_hash = _request_hash(request)
+        now = timezone.now()
+        with transaction.atomic():
+            records = IdempotencyKey.objects.filter(owner=owner, key=key)
+            records.filter(expires_at__lte=now).delete()
+            try:
+                with transaction.atomic():
+                    record = IdempotencyKey.objects.create(
+                        owner=owner, key=key, request_hash=request_hash, expires_at=now + _ttl(),
+                    )
+            except IntegrityError:
+                # The first request has committed (or, on databases that do
+                # not wait for it, is still running)
+                record = records.first()
+                if record is None or record.status_code is None:
+                    return Response(
+                        {'error': 'A request with this Idempotency-Key is in progress; retry it shortly'},
+                        status=status.HTTP_409_CONFLICT,
+                    )
+                if record.request_hash != request_hash:
+                    return Response(
+                        {'error': 'Idempotency-Key was already used for a different request'},
+                        status=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                    )
+                return _replay(record)
+
+            response = view(request, *args, **kwargs)
+            if response.status_code >= 500 or not isinstance(response, Response):
+                record.delete()
+            else:
+                record.status_code = response.status_code
+                record.response = response.data
+                record.save(update_fields=['status_code', 'response'])
+        return response
+
+    return wrapper
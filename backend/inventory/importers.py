@@ -0,0 +1,175 @@
+import csv
+import time
+from decimal import Decimal, InvalidOperation
+from .cache import invalidate
+from .models import ChangeLog, InventoryMovement, Product
+
+IMPORT_CHUNK_SIZE = 5000
+# Rejected and duplicate rows written to an import's error report
+IMPORT_ERROR_REPORT_LIMIT = 1000
+PRODUCT_IMPORT_COLUMNS = ('sku', 'product_name', 'product_price', 'stock_quantity')
+
+
+def _product_field_limits():
+    fields = {f.name: f for f in Product._meta.concrete_fields}
+    price = fields['product_price']
+    return (
+        fields['sku'].max_length,
+        fields['product_name'].max_length,
+        price.max_digits - price.decimal_places,
+        price.decimal_places,
+    )
+
+
+def _parse_product_row(row, limits):
+    """
+    Validate one CSV row against the Product field constraints.
+
+    This is a cheap check against the field limits, not a full
+    ProductSerializer pass, so large files import quickly.
+
+    Returns:
+        (Product, None) for a valid row or (None, errors) otherwise.
+    """
+    sku_len, name_len, int_digits, decimal_places = limits
+    errors = {}
+
+    sku = (row.get('sku') or '').strip()
+    if not sku:
+        errors['sku'] = 'This field is required.'
+    elif len(sku) > sku_len:
+        errors['sku'] = f'Ensure this field has no more than {sku_len} characters.'
+
+    name = (row.get('product_name') or '').strip()
+    if not name:
+        errors['product_name'] = 'This field is required.'
+    elif len(name) > name_len:
+        errors['product_name'] = f'Ensure this field has no more than {name_len} characters.'
+
+    price = None
+    try:
+        price = Decimal((row.get('product_price') or '').strip())
+        if not price.is_finite() or price < 0:
+            raise InvalidOperation
+        price = price.quantize(Decimal(1).scaleb(-decimal_places))
+        if price.adjusted() >= int_digits:
+            errors['product_price'] = f'Ensure there are no more than {int_digits} digits before the decimal point.'
+    except InvalidOperation:
+        errors['product_price'] = 'A valid non-negative number is required.'
+
+    stock = None
+    try:
+        stock = int((row.get('stock_quantity') or '').strip())
+        if stock < 0:
+            raise ValueError
+    except ValueError:
+        errors['stock_quantity'] = 'A valid non-negative integer is required.'
+
+    if errors:
+        return None, errors
+    return Product(sku=sku, product_name=name, product_price=price, stock_quantity=stock), None
+
+
+def _write_chunk(products):
+    """
+    Upsert one chunk of products in one transaction.
+
+    Returns:
+        int: Number of products written. A SKU that appears more than once
+        counts once; the last row wins.
+    """
+    # Duplicates in one upsert statement are rejected by Postgres
+    unique = list({product.sku: product for product in products}.values())
+    skus = [product.sku for product in unique]
+    # One transaction per chunk; stock overwritten by the upsert goes to the ledger
+    with InventoryMovement.objects.tracking(Product.objects.filter(sku__in=skus), InventoryMovement.Reason.ADJUSTMENT):
+        Product.objects.bulk_create(
+            unique,
+            update_conflicts=True,
+            unique_fields=['sku'],
+            update_fields=['product_name', 'product_price', 'stock_quantity', 'updated_at'],
+        )
+        ChangeLog.objects.record(Product, [product.pk for product in unique])
+        invalidate(Product)
+    return len(unique)
+
+
+def import_products_csv(text_stream, error_file=None, max_errors=None, chunk_size=IMPORT_CHUNK_SIZE, on_chunk=None):
+    """
+    Stream a product CSV into the database, upserting on 'sku'.
+
+    Rows are read and validated one at a time and written in chunks of
+    chunk_size, one transaction per chunk, so memory stays flat whatever the
+    file size. Invalid rows are skipped. Of several rows with the same SKU
+    in one chunk only the last is written; the earlier ones are counted as
+    duplicates.
+
+    Args:
+        text_stream: Text file object with a header row containing
+            sku, product_name, product_price, stock_quantity.
+        error_file (optional): Text file object that receives a CSV of the
+            rejected and duplicate rows (line number, errors, original
+            values).
+        max_errors (int, optional): Stop writing to error_file after this
+            many rows (they are still counted).
+        chunk_size (int): Rows per bulk_create batch.
+        on_chunk (optional): Called with the number of rows read so far
+            after each chunk is written (e.g. to report job progress).
+
+    Returns:
+        dict: 'rows', 'imported' (products written), 'failed', 'duplicates',
+        'seconds' and 'rows_per_second'.
+
+    Raises:
+        ValueError: If the header is missing required columns.
+    """
+    started = time.perf_counter()
+    reader = csv.DictReader(text_stream)
+    missing = [col for col in PRODUCT_IMPORT_COLUMNS if col not in (reader.fieldnames or [])]
+    if missing:
+        raise ValueError(f"Missing CSV column(s): {', '.join(missing)}")
+
+    error_writer = None
+    if error_file is not None:
+        error_writer = csv.writer(error_file)
+        error_writer.writerow(['line', 'errors', *PRODUCT_IMPORT_COLUMNS])
+
+    limits = _product_field_limits()
+    rows = imported = failed = duplicates = reported = 0
+
+    def report(errors, row, line):
+        nonlocal reported
+        reported += 1
+        if error_writer is not None and (max_errors is None or reported <= max_errors):
+            error_writer.writerow([line, errors, *(row.get(col) for col in PRODUCT_IMPORT_COLUMNS)])
+
+    chunk = {}  # sku -> (line, row, product)
+    for row in reader:
+        rows += 1
+        product, errors = _parse_product_row(row, limits)
+        if errors:
+            failed += 1
+            report('; '.join(f'{field}: {message}' for field, message in errors.items()), row, reader.line_num)
+            continue
+        earlier = chunk.pop(product.sku, None)
+        if earlier is not None:
+            duplicates += 1
+            report(f'sku: Duplicate SKU; superseded by line {reader.line_num}.', earlier[1], earlier[0])
+        chunk[product.sku] = (reader.line_num, row, product)
+        if len(chunk) >= chunk_size:
+            imported += _write_chunk([product for _, _, product in chunk.values()])
+            chunk = {}
+            if on_chunk is not None:
+                on_chunk(rows)
+    if chunk:
+        imported += _write_chunk([product for _, _, product in chunk.values()])
+
+    seconds = time.perf_counter() - started
+    return {
+        'rows': rows,
+        'imported': imported,
+        'failed': failed,
+        'duplicates': duplicates,
+        'seconds': round(seconds, 3),
+        'rows_per_second': round(rows / seconds) if seconds else rows,
+    }
@@ -0,0 +1,215 @@
+import logging
+import random
+import threading
+import time
+from contextlib import ExitStack
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+logger = logging.getLogger('inventory.performance')
+
+SLOW_QUERY_LOG_LIMIT = 5
+
+# Histogram bucket upper bounds (Prometheus 'le' labels)
+SECONDS_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+BYTES_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+
+class Histogram:
+    """
+    Cumulative-bucket histogram in the Prometheus exposition format.
+    """
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0
+
+    def observe(self, value):
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+        self.count += 1
+        self.sum += value
+
+    def lines(self, name, labels):
+        for bound, count in zip(self.buckets, self.counts):
+            yield f'{name}_bucket{{{labels},le="{bound}"}} {count}'
+        yield f'{name}_bucket{{{labels},le="+Inf"}} {self.count}'
+        yield f'{name}_sum{{{labels}}} {self.sum:.6g}'
+        yield f'{name}_count{{{labels}}} {self.count}'
+
+
+class MetricsRegistry:
+    """
+    Per-process request metrics keyed by route name. Each worker process
+    keeps its own counts, so scrape every worker (or sum in Prometheus).
+    """
+    HISTOGRAMS = (
+        ('inventory_request_duration_seconds', 'Wall time per request.', SECONDS_BUCKETS),
+        ('inventory_request_db_seconds', 'Time spent in database queries per request.', SECONDS_BUCKETS),
+        ('inventory_request_db_queries', 'Database queries per request.', QUERY_BUCKETS),
+        ('inventory_request_render_seconds', 'Response rendering (serialization) time per request.', SECONDS_BUCKETS),
+        ('inventory_response_bytes', 'Response body size (non-streaming responses).', BYTES_BUCKETS),
+    )
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._histograms = {}
+        self._requests = {}
+
+    def observe(self, route, method, status, values):
+        """
+        Record one request. 'values' maps histogram names to observations;
+        missing names are not observed.
+        """
+        with self._lock:
+            key = (route, method, str(status))
+            self._requests[key] = self._requests.get(key, 0) + 1
+            for name, _, buckets in self.HISTOGRAMS:
+                if values.get(name) is None:
+                    continue
+                histogram = self._histograms.get((name, route))
+                if histogram is None:
+                    histogram = self._histograms[(name, route)] = Histogram(buckets)
+                histogram.observe(values[name])
+
+    def render(self):
+        """
+        Return all metrics as Prometheus text exposition format.
+        """
+        with self._lock:
+            lines = [
+                '# HELP inventory_requests_total Sampled requests by route, method and status.',
+                '# TYPE inventory_requests_total counter',
+            ]
+            for (route, method, status), count in sorted(self._requests.items()):
+                lines.append(f'inventory_requests_total{{route="{route}",method="{method}",status="{status}"}} {count}')
+            for name, help_text, _ in self.HISTOGRAMS:
+                lines += [f'# HELP {name} {help_text}', f'# TYPE {name} histogram']
+                for (metric, route), histogram in sorted(self._histograms.items()):
+                    if metric == name:
+                        lines.extend(histogram.lines(name, f'route="{route}"'))
+        return '\n'.join(lines) + '\n'
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+            self._requests.clear()
+
+
+REGISTRY = MetricsRegistry()
+
+
+class RequestTimings:
+    """
+    Timings collected for one sampled request.
+    """
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.view_started = None
+        self.render_started = None
+        self.render_seconds = None
+        self.db_seconds = 0.0
+        self.queries = []  # (seconds, sql)
+
+    def __call__(self, execute, sql, params, many, context):
+        # connection.execute_wrapper hook, runs around every query
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - started
+            self.db_seconds += elapsed
+            self.queries.append((elapsed, sql))
+
+
+class InstrumentationMiddleware:
+    """
+    Measure sampled requests: wall time, DB query count and time, view and
+    render (serialization) time, and response size per URL name.
+
+    - Adds a Server-Timing header to sampled responses.
+    - Feeds the histograms served by the metrics/ endpoint.
+    - Logs requests slower than INVENTORY_SLOW_REQUEST_MS to the
+      'inventory.performance' logger, with their slowest SQL statements.
+
+    INVENTORY_METRICS_SAMPLE_RATE (0..1) sets the share of requests that is
+    measured. At 0 the middleware removes itself at startup, so there is no
+    per-request cost. Under ASGI, queries that async views run on other
+    threads may be missing from the DB figures.
+    """
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.sample_rate = float(getattr(settings, 'INVENTORY_METRICS_SAMPLE_RATE', 0))
+        if self.sample_rate <= 0:
+            raise MiddlewareNotUsed
+        self.slow_seconds = getattr(settings, 'INVENTORY_SLOW_REQUEST_MS', 500) / 1000
+
+    def __call__(self, request):
+        if self.sample_rate < 1 and random.random() >= self.sample_rate:
+            return self.get_response(request)
+
+        timings = request._inventory_timings = RequestTimings()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(timings))
+            response = self.get_response(request)
+        self._finish(request, response, timings)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        timings = getattr(request, '_inventory_timings', None)
+        if timings is not None:
+            timings.view_started = time.perf_counter()
+
+    def process_template_response(self, request, response):
+        # Called for DRF responses just before they are rendered
+        timings = getattr(request, '_inventory_timings', None)
+        if timings is not None:
+            timings.render_started = time.perf_counter()
+
+            def rendered(response):
+                timings.render_seconds = time.perf_counter() - timings.render_started
+            response.add_post_render_callback(rendered)
+        return response
+
+    def _finish(self, request, response, timings):
+        finished = time.perf_counter()
+        total = finished - timings.started
+        match = getattr(request, 'resolver_match', None)
+        route = (match.url_name or match.view_name) if match else 'unmatched'
+        size = None if response.streaming else len(response.content)
+
+        view_seconds = None
+        if timings.view_started is not None:
+            view_seconds = (timings.render_started or finished) - timings.view_started
+
+        REGISTRY.observe(route, request.method, response.status_code, {
+            'inventory_request_duration_seconds': total,
+            'inventory_request_db_seconds': timings.db_seconds,
+            'inventory_request_db_queries': len(timings.queries),
+            'inventory_request_render_seconds': timings.render_seconds,
+            'inventory_response_bytes': size,
+        })
+
+        parts = [
+            f'total;dur={total * 1000:.1f}',
+            f'db;dur={timings.db_seconds * 1000:.1f};desc="{len(timings.queries)} queries"',
+        ]
+        if view_seconds is not None:
+            parts.append(f'view;dur={view_seconds * 1000:.1f}')
+        if timings.render_seconds is not None:
+            parts.append(f'render;dur={timings.render_seconds * 1000:.1f}')
+        response['Server-Timing'] = ', '.join(parts)
+
+        if total >= self.slow_seconds:
+            slowest = sorted(timings.queries, key=lambda query: query[0], reverse=True)[:SLOW_QUERY_LOG_LIMIT]
+            logger.warning(
+                'Slow request %s %s (%s): %.1f ms, %d queries in %.1f ms\n%s',
+                request.method, request.get_full_path(), route, total * 1000,
+                len(timings.queries), timings.db_seconds * 1000,
+                '\n'.join(f'  {seconds * 1000:.1f} ms  {sql[:300]}' for seconds, sql in slowest),
+            )
@@ -0,0 +1,391 @@
+import io
+import logging
+import os
+import shutil
+import time
+import traceback
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from pathlib import Path
+from django.conf import settings
+from django.db import connection, models, transaction
+from django.urls import reverse
+from django.utils import timezone
+from .importers import IMPORT_ERROR_REPORT_LIMIT, import_products_csv
+from .models import Customer, DailySalesRollup, Job, Order, OrderItem
+from .renderers import json_response
+from .utils import parse_moment
+
+logger = logging.getLogger('inventory.jobs')
+
+# Progress is written to the job row at most this often
+PROGRESS_INTERVAL_SECONDS = 1
+# First retry delay; doubles with each further attempt
+RETRY_DELAY_SECONDS = 10
+# Workers refresh the heartbeat of their running jobs this often
+HEARTBEAT_SECONDS = 30
+# Running jobs with no heartbeat for this long are assumed dead and requeued
+STALE_JOB_SECONDS = 300
+
+# Customers with more orders than this are deleted by a job, in chunks
+CUSTOMER_DELETE_INLINE_ORDERS = 1000
+CUSTOMER_DELETE_CHUNK_SIZE = 500
+# Batch order deletes matching more orders than this run as a job
+ORDER_DELETE_INLINE_LIMIT = 1000
+
+# kind -> (handler, max_attempts)
+JOB_HANDLERS = {}
+
+
+class JobCancelled(Exception):
+    pass
+
+
+def job_handler(kind, max_attempts=1):
+    """
+    Register a function as the handler for a job kind. It is called as
+    handler(context, **job.params) and returns a JSON-serializable result.
+    Retried handlers (max_attempts > 1) must be safe to run again.
+    """
+    def decorator(func):
+        JOB_HANDLERS[kind] = (func, max_attempts)
+        return func
+    return decorator
+
+
+def job_files_dir():
+    path = Path(getattr(settings, 'INVENTORY_JOB_FILES_DIR', Path(settings.BASE_DIR) / 'job_files'))
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def save_upload(upload):
+    """
+    Copy an uploaded file into the job files directory for a job to read.
+
+    Returns:
+        str: Path of the saved file.
+    """
+    path = job_files_dir() / f'upload-{uuid.uuid4().hex}{Path(upload.name).suffix}'
+    with open(path, 'wb') as saved:
+        shutil.copyfileobj(upload.file, saved)
+    return str(path)
+
+
+def enqueue(kind, **params):
+    """
+    Queue a job. The worker can pick it up once the current transaction
+    commits.
+
+    Raises:
+        ValueError: If no handler is registered for kind.
+    """
+    if kind not in JOB_HANDLERS:
+        raise ValueError(f"Unknown job kind '{kind}'")
+    return Job.objects.create(kind=kind, params=params, max_attempts=JOB_HANDLERS[kind][1])
+
+
+def job_data(job, request=None):
+    data = {
+        'id': job.id,
+        'kind': job.kind,
+        'status': job.status,
+        'progress': {
+            'done': job.progress_done,
+            'total': job.progress_total,
+            'fraction': round(job.progress_done / job.progress_total, 4) if job.progress_total else None,
+        },
+        'message': job.message,
+        'result': job.result,
+        'error': job.error.strip().splitlines()[-1] if job.error else None,
+        'attempts': job.attempts,
+        'max_attempts': job.max_attempts,
+        'cancel_requested': job.cancel_requested,
+        'created_at': job.created_at,
+        'started_at': job.started_at,
+        'finished_at': job.finished_at,
+    }
+    if request is not None and job.status == Job.Status.SUCCEEDED and (job.result or {}).get('file'):
+        data['download_url'] = request.build_absolute_uri(reverse('download_job_file', args=[job.id]))
+    return data
+
+
+def wants_background(request):
+    """
+    True if the request asks for its work to run as a job ('?background=1').
+    """
+    return request.GET.get('background', '').lower() in ('1', 'true', 'yes')
+
+
+def job_accepted(request, job):
+    """
+    202 Accepted response for a view that handed its work to a job, with
+    the job's status URL in 'status_url' and the Location header.
+    """
+    url = request.build_absolute_uri(reverse('get_job', args=[job.id]))
+    response = json_response({'job_id': job.id, 'status': job.status, 'status_url': url}, status=202)
+    response['Location'] = url
+    return response
+
+
+class JobContext:
+    """
+    Passed to handlers to report progress. Every progress() call may raise
+    JobCancelled once cancellation has been requested, so handlers should
+    call it between units of work that are safe to stop after.
+
+    Progress is written from a helper thread with its own database
+    connection. It is visible while the handler's transaction is still
+    open, and works while the handler holds a read cursor (SQLite refuses
+    writes on a connection whose read snapshot is out of date).
+    """
+    def __init__(self, job):
+        self.job = job
+        self._reported = 0
+        self._writer = ThreadPoolExecutor(max_workers=1)
+
+    def _write(self, fields):
+        Job.objects.filter(pk=self.job.pk).update(**fields)
+        return Job.objects.filter(pk=self.job.pk, cancel_requested=True).exists()
+
+    def progress(self, done, total=None, message=None, force=False):
+        now = time.monotonic()
+        if not force and now - self._reported < PROGRESS_INTERVAL_SECONDS:
+            return
+        self._reported = now
+        fields = {'progress_done': done, 'heartbeat_at': timezone.now()}
+        if total is not None:
+            fields['progress_total'] = total
+        if message is not None:
+            fields['message'] = message[:200]
+        if self._writer.submit(self._write, fields).result():
+            raise JobCancelled
+
+    def file_path(self, suffix):
+        return job_files_dir() / f'job-{self.job.pk}{suffix}'
+
+    def close(self):
+        self._writer.submit(lambda: connection.close()).result()
+        self._writer.shutdown()
+
+
+def claim_job(worker, kinds=None):
+    """
+    Atomically move the oldest due queued job to running for this worker.
+
+    Returns:
+        Job or None if nothing is due.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        due = Job.objects.filter(status=Job.Status.QUEUED, run_after__lte=now)
+        if kinds:
+            due = due.filter(kind__in=kinds)
+        job = due.select_for_update(skip_locked=True).order_by('run_after', 'id').first()
+        if job is None:
+            return None
+        # Conditional, so two workers can never both claim it
+        claimed = Job.objects.filter(pk=job.pk, status=Job.Status.QUEUED).update(
+            status=Job.Status.RUNNING,
+            attempts=models.F('attempts') + 1,
+            started_at=now,
+            heartbeat_at=now,
+            worker=worker,
+        )
+    if not claimed:
+        return None
+    job.refresh_from_db()
+    return job
+
+
+def send_heartbeat(worker_prefix):
+    """
+    Mark the running jobs of one worker process as alive, so jobs that run
+    long without reporting progress are not taken for stale.
+    """
+    Job.objects.filter(status=Job.Status.RUNNING, worker__startswith=worker_prefix).update(heartbeat_at=timezone.now())
+
+
+def requeue_stale_jobs():
+    """
+    Requeue running jobs whose worker stopped sending heartbeats (it
+    crashed or was killed), or fail them if they are out of attempts.
+
+    Returns:
+        int: Number of jobs requeued or failed.
+    """
+    stale = Job.objects.filter(
+        status=Job.Status.RUNNING,
+        heartbeat_at__lt=timezone.now() - timedelta(seconds=STALE_JOB_SECONDS),
+    )
+    failed = stale.filter(attempts__gte=models.F('max_attempts')).update(
+        status=Job.Status.FAILED, error='Worker stopped responding', finished_at=timezone.now(),
+    )
+    return failed + stale.update(status=Job.Status.QUEUED, worker='')
+
+
+def run_job(job):
+    """
+    Run a claimed job and record its outcome: succeeded with its result,
+    cancelled, requeued with exponential backoff, or failed after its last
+    attempt.
+    """
+    context = JobContext(job)
+    outcome = {}
+    try:
+        if job.cancel_requested:
+            raise JobCancelled
+        handler, _ = JOB_HANDLERS[job.kind]
+        result = handler(context, **job.params)
+    except JobCancelled:
+        outcome.update(status=Job.Status.CANCELLED, message='Cancelled')
+    except Exception:
+        logger.exception('Job %s (%s) failed on attempt %s', job.pk, job.kind, job.attempts)
+        outcome.update(error=traceback.format_exc())
+        if job.attempts < job.max_attempts:
+            delay = RETRY_DELAY_SECONDS * 2 ** (job.attempts - 1)
+            outcome.update(status=Job.Status.QUEUED, run_after=timezone.now() + timedelta(seconds=delay))
+        else:
+            outcome.update(status=Job.Status.FAILED)
+    else:
+        outcome.update(status=Job.Status.SUCCEEDED, result=result, error='')
+    finally:
+        context.close()
+    if outcome['status'] != Job.Status.QUEUED:
+        outcome['finished_at'] = timezone.now()
+    Job.objects.filter(pk=job.pk).update(**outcome)
+
+
+def cancel_job(job):
+    """
+    Cancel a queued job at once; ask a running one to stop at its next
+    progress report.
+
+    Returns:
+        bool: False if the job had already finished.
+    """
+    if Job.objects.filter(pk=job.pk, status=Job.Status.QUEUED).update(
+        status=Job.Status.CANCELLED, cancel_requested=True, finished_at=timezone.now(),
+    ):
+        return True
+    return bool(Job.objects.filter(pk=job.pk, status=Job.Status.RUNNING).update(cancel_requested=True))
+
+
+def retry_job(job):
+    """
+    Queue a failed or cancelled job again with a fresh set of attempts.
+
+    Returns:
+        bool: False if the job is not failed or cancelled.
+    """
+    return bool(
+        Job.objects.filter(pk=job.pk, status__in=[Job.Status.FAILED, Job.Status.CANCELLED]).update(
+            status=Job.Status.QUEUED, attempts=0, cancel_requested=False, run_after=timezone.now(),
+            progress_done=0, message='', error='', finished_at=None,
+        )
+    )
+
+
+@job_handler('rebuild_sales_rollups', max_attempts=3)
+def rebuild_sales_rollups(context, start=None, end=None):
+    context.progress(0, message='Rebuilding daily sales rollups', force=True)
+    return {'rows': DailySalesRollup.objects.rebuild(start, end)}
+
+
+@job_handler('export_orders', max_attempts=3)
+def export_orders(context, format='csv', created_after=None, created_before=None):
+    # Reuses the streaming export (imported here, the views import this module),
+    # written to a file instead of a response
+    from .views.ExportViews import _export_rows, _stream_csv, _stream_ndjson
+
+    orders_filter = {}
+    if created_after:
+        orders_filter['created_at__gte'] = parse_moment(created_after)
+    if created_before:
+        orders_filter['created_at__lt'] = parse_moment(created_before)
+    items = OrderItem.objects.all()
+    if orders_filter:
+        items = items.filter(order__in=Order.objects.filter(**orders_filter))
+    total = items.count()
+
+    path = context.file_path(f'.{format}')
+    counted = 0
+
+    def counting(rows):
+        nonlocal counted
+        for counted, row in enumerate(rows, 1):
+            if counted % 1000 == 0:
+                context.progress(counted, total)
+            yield row
+
+    rows = counting(_export_rows(orders_filter))
+    lines = _stream_csv(rows) if format == 'csv' else _stream_ndjson(rows)
+    try:
+        with open(path, 'w', newline='', encoding='utf-8') as output:
+            output.writelines(lines)
+    except BaseException:
+        path.unlink(missing_ok=True)
+        raise
+    context.progress(counted, total, force=True)
+    return {'rows': counted, 'file': path.name, 'content_type': 'text/csv' if format == 'csv' else 'application/x-ndjson'}
+
+
+@job_handler('import_products')
+def import_products(context, path):
+    # Not retried: the upload is removed after the first attempt
+    error_file = io.StringIO()
+    try:
+        with open(path, encoding='utf-8-sig', newline='') as upload:
+            stats = import_products_csv(
+                upload,
+                error_file=error_file,
+                max_errors=IMPORT_ERROR_REPORT_LIMIT,
+                on_chunk=lambda rows: context.progress(rows, message=f'{rows} rows read'),
+            )
+    finally:
+        os.unlink(path)
+    if stats['failed'] or stats['duplicates']:
+        stats['error_report'] = error_file.getvalue()
+    return stats
+
+
+@job_handler('delete_customer', max_attempts=3)
+def delete_customer(context, customer_id):
+    """
+    Delete a customer's orders in chunks (taking them out of the daily sales
+    rollups), then the customer, so no single transaction holds the
+    database for long. Cancelling stops between chunks, leaving the
+    customer and their remaining orders in place.
+    """
+    orders = Order.objects.filter(customer_id=customer_id)
+    total = orders.count()
+    deleted = orders.delete_in_chunks(
+        CUSTOMER_DELETE_CHUNK_SIZE,
+        on_chunk=lambda deleted: context.progress(deleted, total, message=f'{deleted} of {total} orders deleted'),
+    )
+    context.progress(deleted, total, message='Deleting customer', force=True)
+    customers, _ = Customer.objects.filter(pk=customer_id).delete()
+    return {'orders_deleted': deleted, 'customer_deleted': bool(customers)}
+
+
+@job_handler('delete_orders', max_attempts=3)
+def delete_orders(context, ids=None, created_after=None, created_before=None):
+    """
+    Delete the matching orders and restore their stock, one transaction per
+    chunk. Cancelling stops between chunks; orders already deleted stay
+    deleted, and a retry carries on with the ones left.
+    """
+    orders = Order.objects.all()
+    if ids:
+        orders = orders.filter(id__in=ids)
+    if created_after:
+        orders = orders.filter(created_at__gte=parse_moment(created_after))
+    if created_before:
+        orders = orders.filter(created_at__lt=parse_moment(created_before))
+    total = orders.count()
+    deleted = orders.delete_restoring_stock(
+        on_chunk=lambda deleted: context.progress(deleted, total, message=f'{deleted} of {total} orders deleted'),
+    )
+    context.progress(deleted, total, force=True)
+    return {'orders_deleted': deleted}
@@ -0,0 +1,95 @@
+import time
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from rest_framework.renderers import JSONRenderer
+from inventory.fast_serializers import FAST_PRODUCT, ORDER_FAST_FIELDS, fast_order_rows
+from inventory.models import Customer, Order, OrderItem, Product
+from inventory.renderers import FastJSONRenderer
+from inventory.serializers import OrderSerializer, ProductSerializer
+
+ITEMS_PER_ORDER = 3
+# Rows are serialized a page at a time, like the list endpoints do. Both
+# order paths load items with an IN list of the page's order IDs, which
+# must stay under the database's parameter limit (32766 on SQLite).
+PAGE_SIZE = 1000
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare DRF serializers with the '.values()' fast path for product and order lists. "
+        "Rows are generated inside a transaction that is rolled back afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, nargs='+', default=[10000, 100000], help='Row counts to benchmark.')
+        parser.add_argument('--repeat', type=int, default=3, help='Runs per measurement; the best is reported.')
+
+    def handle(self, *args, rows, repeat, **options):
+        self.stdout.write(f"{'case':<10}{'rows':>9}{'drf (s)':>11}{'fast (s)':>11}{'speedup':>10}")
+        for count in rows:
+            with transaction.atomic():
+                self._seed(count)
+                self._report('products', count, repeat, self._drf_products, self._fast_products)
+                self._report('orders', count, repeat, self._drf_orders, self._fast_orders)
+                transaction.set_rollback(True)
+
+    def _seed(self, count):
+        customers = Customer.objects.bulk_create(
+            Customer(name=f'Bench {i}', email=f'bench{i}@example.com', phone='9999999999', address='Bench street')
+            for i in range(max(count // 10, 1))
+        )
+        products = Product.objects.bulk_create(
+            Product(sku=f'BENCH-{i}', product_name=f'Bench product {i}', product_price='19.99', stock_quantity=100)
+            for i in range(count)
+        )
+        orders = Order.objects.bulk_create(
+            Order(customer=customers[i % len(customers)]) for i in range(count)
+        )
+        OrderItem.objects.bulk_create(
+            OrderItem(order=order, product=products[(i + k) % count], quantity=k + 1, unit_price='19.99')
+            for i, order in enumerate(orders)
+            for k in range(ITEMS_PER_ORDER)
+        )
+
+    def _best(self, repeat, fn):
+        best = None
+        for _ in range(repeat):
+            started = time.perf_counter()
+            fn()
+            elapsed = time.perf_counter() - started
+            best = elapsed if best is None else min(best, elapsed)
+        return best
+
+    def _report(self, case, count, repeat, drf, fast):
+        drf_seconds = self._best(repeat, lambda: drf(count))
+        fast_seconds = self._best(repeat, lambda: fast(count))
+        self.stdout.write(
+            f"{case:<10}{count:>9}{drf_seconds:>11.3f}{fast_seconds:>11.3f}{drf_seconds / fast_seconds:>9.1f}x"
+        )
+
+    def _pages(self, queryset, count):
+        # Keyset pages in ID order, up to count rows in total
+        last_id = 0
+        while count > 0:
+            page = list(queryset.filter(pk__gt=last_id)[:min(PAGE_SIZE, count)])
+            if not page:
+                return
+            yield page
+            last_id = page[-1]['id'] if isinstance(page[-1], dict) else page[-1].pk
+            count -= len(page)
+
+    def _drf_products(self, count):
+        for page in self._pages(Product.objects.order_by('id'), count):
+            JSONRenderer().render(ProductSerializer(page, many=True).data)
+
+    def _fast_products(self, count):
+        for page in self._pages(Product.objects.order_by('id').values(*FAST_PRODUCT.lookups), count):
+            FastJSONRenderer().render(FAST_PRODUCT.convert_many(page))
+
+    def _drf_orders(self, count):
+        for page in self._pages(Order.objects.with_details().order_by('id'), count):
+            JSONRenderer().render(OrderSerializer(page, many=True).data)
+
+    def _fast_orders(self, count):
+        for page in self._pages(Order.objects.order_by('id').values(*ORDER_FAST_FIELDS), count):
+            FastJSONRenderer().render(fast_order_rows(page))
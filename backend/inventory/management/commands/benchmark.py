@@ -0,0 +1,345 @@
+import json
+import platform
+import subprocess
+import time
+from datetime import datetime, timedelta, timezone as dt_timezone
+from urllib.error import HTTPError, URLError
+from urllib.request import Request, urlopen
+import django
+from django.conf import settings
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test import Client
+from django.test.client import BOUNDARY, MULTIPART_CONTENT, encode_multipart
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.utils import timezone
+from inventory import urls as inventory_urls
+from inventory.models import Customer, Order, OrderItem, Product
+
+API_PREFIX = '/api/'
+BATCH_ROWS = 100
+
+# Routes deliberately left out, with the reason recorded in the results
+SKIPPED_ROUTES = {
+    'token_obtain_pair': 'authentication; password hashing dominates',
+    'token_refresh': 'authentication; needs a refresh token',
+    'admin_login': 'authentication; password hashing dominates',
+    'stream_events': 'open-ended Server-Sent Events stream',
+}
+
+
+class Targets:
+    """
+    IDs the benchmark cases read or consume, looked up from the database
+    when a case first needs them (after any rows it depends on exist).
+    """
+    def __init__(self):
+        self._cache = {}
+
+    def _get(self, key, query):
+        if key not in self._cache:
+            self._cache[key] = list(query())
+        return self._cache[key]
+
+    def customer(self):
+        return self._get('customers', lambda: Customer.objects.order_by('id').values_list('id', flat=True)[:1])[0]
+
+    def product(self):
+        return self._get('products', lambda: Product.objects.order_by('id').values_list('id', flat=True)[:1])[0]
+
+    def stocked_products(self):
+        return self._get('stocked', lambda: Product.objects.order_by('-stock_quantity').values_list('id', flat=True)[:2])
+
+    def month_ago(self):
+        return (timezone.localdate() - timedelta(days=30)).isoformat()
+
+    def order(self):
+        return self.orders()[-1]
+
+    def orders(self):
+        return self._get('orders', lambda: Order.objects.order_by('id').values_list('id', flat=True))
+
+    def created(self, model, prefix_field, prefix):
+        return self._get(
+            f'{model._meta.model_name}:{prefix}',
+            lambda: model.objects.filter(**{f'{prefix_field}__startswith': prefix}).order_by('id').values_list('id', flat=True),
+        )
+
+
+def _import_csv(i):
+    lines = ['sku,product_name,product_price,stock_quantity']
+    lines += [f'BENCH-I-{i}-{k},Imported {k},9.99,10' for k in range(BATCH_ROWS)]
+    return SimpleUploadedFile('products.csv', '\n'.join(lines).encode(), content_type='text/csv')
+
+
+# (case name, URL name, method, path, body factory (targets, iteration) or None, writes)
+# Cases run in this order, so rows created by one case can be consumed by a later one.
+BENCHMARKS = (
+    ('get_customers', 'get_customers', 'GET', 'customer/', None, False),
+    ('get_customer_by_id', 'get_customer_by_id', 'GET', lambda t: f'customer/{t.customer()}', None, False),
+    ('get_active_customers', 'get_active_customers', 'GET', 'customer/active/', None, False),
+    ('search_customers', 'search_customers', 'GET', 'customer/search/?q=Customer%201', None, False),
+    ('get_products', 'get_products', 'GET', 'product/', None, False),
+    ('get_products (fast)', 'get_products', 'GET', 'product/?fast=1', None, False),
+    ('get_product_by_id', 'get_product_by_id', 'GET', lambda t: f'product/{t.product()}', None, False),
+    ('search_products', 'search_products', 'GET', 'product/search/?q=Product%201', None, False),
+    ('get_orders', 'get_orders', 'GET', 'order/', None, False),
+    ('get_orders (fast)', 'get_orders', 'GET', 'order/?fast=1', None, False),
+    ('get_orders (sparse)', 'get_orders', 'GET', 'order/?fields=id,customer,created_at,total_amount&expand=customer', None, False),
+    ('get_order_by_id', 'get_order_by_id', 'GET', lambda t: f'order/{t.order()}/', None, False),
+    ('export_orders', 'export_orders', 'GET', lambda t: f'order/export/?format=ndjson&created_after={t.month_ago()}', None, False),
+    ('get_dashboard_summary', 'get_dashboard_summary', 'GET', 'dashboard/summary/', None, False),
+    ('get_sales_report', 'get_sales_report', 'GET', 'reports/sales/?interval=month&by_product=1', None, False),
+    ('get_stock_report', 'get_stock_report', 'GET', lambda t: f'reports/stock/?at={t.month_ago()}', None, False),
+    ('get_cache_stats', 'get_cache_stats', 'GET', 'cache/stats/', None, False),
+    ('get_changes', 'get_changes', 'GET', 'changes/', None, False),
+    ('get_jobs', 'get_jobs', 'GET', 'jobs/', None, False),
+    ('csrf_token_view', 'csrf_token_view', 'GET', 'csrf-token/', None, False),
+    ('async_get_customers', 'async_get_customers', 'GET', 'async/customer/', None, False),
+    ('async_get_customer_by_id', 'async_get_customer_by_id', 'GET', lambda t: f'async/customer/{t.customer()}', None, False),
+    ('async_get_active_customers', 'async_get_active_customers', 'GET', 'async/customer/active/', None, False),
+    ('async_get_products', 'async_get_products', 'GET', 'async/product/', None, False),
+    ('async_get_product_by_id', 'async_get_product_by_id', 'GET', lambda t: f'async/product/{t.product()}', None, False),
+    ('async_get_orders', 'async_get_orders', 'GET', 'async/order/', None, False),
+    ('async_get_order_by_id', 'async_get_order_by_id', 'GET', lambda t: f'async/order/{t.order()}/', None, False),
+    ('create_customer', 'create_customer', 'POST', 'customer/create/', lambda t, i: {
+        'name': f'Bench {i}', 'email': f'bench-customer-{i}@example.com', 'phone': '9999999999', 'address': 'Bench road',
+    }, True),
+    ('update_customer', 'update_customer', 'PUT', 'customer/update/', lambda t, i: {
+        'id': t.customer(), 'address': f'Bench road {i}',
+    }, True),
+    ('create_product', 'create_product', 'POST', 'product/create/', lambda t, i: {
+        'sku': f'BENCH-P-{i}', 'product_name': f'Bench product {i}', 'product_price': '19.99', 'stock_quantity': 100000,
+    }, True),
+    ('update_product', 'update_product', 'PUT', 'product/update/', lambda t, i: {
+        'id': t.product(), 'product_price': f'{10 + i % 90}.50',
+    }, True),
+    ('create_order', 'create_order', 'POST', 'order/create/', lambda t, i: {
+        'customer_id': t.customer(),
+        'items': [{'product_id': pk, 'quantity': 1} for pk in t.stocked_products()],
+    }, True),
+    ('customer_batch (upsert)', 'customer_batch', 'POST', 'customer/batch/', lambda t, i: [
+        {'name': f'Batch {k}', 'email': f'bench-batch-{i}-{k}@example.com', 'phone': '9999999999', 'address': 'Batch road'}
+        for k in range(BATCH_ROWS)
+    ], True),
+    ('customer_batch (delete)', 'customer_batch', 'DELETE', 'customer/batch/', lambda t, i: {
+        'emails': [f'bench-batch-{i}-{k}@example.com' for k in range(BATCH_ROWS)],
+    }, True),
+    ('product_batch (upsert)', 'product_batch', 'POST', 'product/batch/', lambda t, i: [
+        {'sku': f'BENCH-B-{i}-{k}', 'product_name': f'Batch {k}', 'product_price': '5.00', 'stock_quantity': 10}
+        for k in range(BATCH_ROWS)
+    ], True),
+    ('product_batch (delete)', 'product_batch', 'DELETE', 'product/batch/', lambda t, i: {
+        'skus': [f'BENCH-B-{i}-{k}' for k in range(BATCH_ROWS)],
+    }, True),
+    ('import_products', 'import_products', 'POST', 'product/import/', lambda t, i: {'file': _import_csv(i)}, True),
+    ('delete_order', 'delete_order', 'DELETE', 'order/delete/', lambda t, i: {'id': t.orders()[i]}, True),
+    ('delete_orders_batch', 'delete_orders_batch', 'DELETE', 'order/delete/batch/', lambda t, i: {
+        'ids': list(t.orders()[-10 * (i + 1):][:10]),
+    }, True),
+    ('delete_customer', 'delete_customer', 'DELETE', 'customer/delete/', lambda t, i: {
+        'id': t.created(Customer, 'email', 'bench-customer-')[i],
+    }, True),
+    ('delete_product', 'delete_product', 'DELETE', 'product/delete/', lambda t, i: {
+        'id': t.created(Product, 'sku', 'BENCH-P-')[i],
+    }, True),
+)
+
+
+def _percentile(sorted_values, fraction):
+    return sorted_values[min(int(len(sorted_values) * fraction), len(sorted_values) - 1)]
+
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, cwd=settings.BASE_DIR, timeout=5,
+        ).stdout.strip() or None
+    except OSError:
+        return None
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure latency percentiles, throughput and queries per request for every route in inventory/urls.py "
+        "and write the results as JSON. Runs in-process through the Django test client (inside a transaction "
+        "that is rolled back) or, with --base-url, over HTTP against a running server. Seed data first with "
+        "'manage.py seed_data'."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--base-url', help="Benchmark a running server (e.g. 'http://127.0.0.1:8000') instead of in-process.")
+        parser.add_argument('--iterations', type=int, default=50, help='Timed requests per case.')
+        parser.add_argument('--warmup', type=int, default=3, help='Untimed requests per case before measuring.')
+        parser.add_argument('--writes', action='store_true', help='Also run write cases against --base-url (they modify its database).')
+        parser.add_argument('--only', nargs='+', help='Run only cases whose name contains one of these strings.')
+        parser.add_argument('--output', help='Write JSON results to this file (default: stdout).')
+        parser.add_argument('--compare', help='Earlier JSON results to print a comparison against.')
+
+    def handle(self, *args, base_url=None, iterations, warmup, writes=False, only=None, output=None, compare=None, **options):
+        if not Order.objects.exists():
+            raise CommandError("No orders in the database; run 'manage.py seed_data' first.")
+        if iterations < 1 or warmup < 0:
+            raise CommandError('--iterations must be at least 1 and --warmup non-negative.')
+
+        cases = [case for case in BENCHMARKS if not only or any(part in case[0] for part in only)]
+        skipped = dict(SKIPPED_ROUTES)
+        covered = {case[1] for case in BENCHMARKS}
+        for pattern in inventory_urls.urlpatterns:
+            if pattern.name not in covered and pattern.name not in skipped:
+                skipped[pattern.name] = 'no benchmark case defined'
+        if base_url and not writes:
+            for case in cases:
+                if case[5]:
+                    skipped[case[0]] = 'write case; pass --writes to run it against a server'
+            cases = [case for case in cases if not case[5]]
+
+        meta = {
+            'commit': _git_commit(),
+            'started_at': datetime.now(dt_timezone.utc).isoformat(timespec='seconds'),
+            'mode': 'http' if base_url else 'client',
+            'base_url': base_url,
+            'iterations': iterations,
+            'warmup': warmup,
+            'database': connection.vendor,
+            'python': platform.python_version(),
+            'django': django.get_version(),
+            'rows': {
+                'customers': Customer.objects.count(),
+                'products': Product.objects.count(),
+                'orders': Order.objects.count(),
+                'order_items': OrderItem.objects.count(),
+            },
+        }
+
+        if base_url:
+            send = self._http_sender(base_url.rstrip('/'))
+            results = self._run(cases, send, iterations, warmup)
+        else:
+            # Run against a private cache, so responses built from rolled-back rows are never shared
+            private_cache = {'default': {
+                'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+                'LOCATION': 'inventory-benchmark',
+            }}
+            with override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'testserver'], CACHES=private_cache):
+                with transaction.atomic():
+                    results = self._run(cases, self._client_sender(), iterations, warmup)
+                    transaction.set_rollback(True)
+
+        report = {'meta': meta, 'routes': results, 'skipped': skipped}
+        text = json.dumps(report, indent=2, sort_keys=True)
+        if output:
+            with open(output, 'w', encoding='utf-8') as output_file:
+                output_file.write(text + '\n')
+            self._print_table(results)
+            self.stdout.write(f"Results written to {output}")
+        else:
+            self.stdout.write(text)
+        if compare:
+            self._print_comparison(compare, results)
+
+    def _run(self, cases, send, iterations, warmup):
+        targets = Targets()
+        results = {}
+        for name, _, method, path, body, _ in cases:
+            path = API_PREFIX + (path(targets) if callable(path) else path)
+            latencies, queries, errors, statuses = [], [], 0, {}
+            started = time.perf_counter()
+            for i in range(warmup + iterations):
+                payload = body(targets, i) if body else None
+                if i == warmup:
+                    started = time.perf_counter()
+                request_started = time.perf_counter()
+                status, query_count = send(method, path, payload)
+                elapsed = time.perf_counter() - request_started
+                if i < warmup:
+                    continue
+                latencies.append(elapsed * 1000)
+                statuses[str(status)] = statuses.get(str(status), 0) + 1
+                errors += status >= 400
+                if query_count is not None:
+                    queries.append(query_count)
+            wall = time.perf_counter() - started
+
+            latencies.sort()
+            results[name] = {
+                'method': method,
+                'path': path,
+                'requests': iterations,
+                'errors': errors,
+                'statuses': statuses,
+                'requests_per_second': round(iterations / wall, 1),
+                'mean_ms': round(sum(latencies) / len(latencies), 3),
+                'p50_ms': round(_percentile(latencies, 0.5), 3),
+                'p95_ms': round(_percentile(latencies, 0.95), 3),
+                'p99_ms': round(_percentile(latencies, 0.99), 3),
+                'queries_per_request': round(sum(queries) / len(queries), 2) if queries else None,
+            }
+            self.stderr.write(f"  {name}: p50 {results[name]['p50_ms']:.1f} ms")
+        return results
+
+    def _client_sender(self):
+        client = Client()
+
+        def send(method, path, payload):
+            with CaptureQueriesContext(connection) as captured:
+                if isinstance(payload, dict) and 'file' in payload:
+                    response = client.post(path, payload)
+                else:
+                    response = client.generic(
+                        method, path,
+                        data=json.dumps(payload) if payload is not None else '',
+                        content_type='application/json',
+                    )
+                if response.streaming:
+                    b''.join(response.streaming_content)
+            return response.status_code, len(captured)
+        return send
+
+    def _http_sender(self, base_url):
+        def send(method, path, payload):
+            headers, data = {}, None
+            if isinstance(payload, dict) and 'file' in payload:
+                data = encode_multipart(BOUNDARY, payload)
+                headers['Content-Type'] = MULTIPART_CONTENT
+            elif payload is not None:
+                data = json.dumps(payload).encode()
+                headers['Content-Type'] = 'application/json'
+            request = Request(base_url + path, data=data, headers=headers, method=method)
+            try:
+                with urlopen(request, timeout=60) as response:
+                    response.read()
+                    return response.status, None
+            except HTTPError as exc:
+                return exc.code, None
+            except URLError as exc:
+                raise CommandError(f"{method} {base_url + path} failed: {exc.reason}")
+        return send
+
+    def _print_table(self, results):
+        self.stdout.write(f"{'case':<30}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'req/s':>9}{'queries':>9}{'errors':>8}")
+        for name, row in results.items():
+            queries = '-' if row['queries_per_request'] is None else f"{row['queries_per_request']:g}"
+            self.stdout.write(
+                f"{name:<30}{row['p50_ms']:>9.1f}{row['p95_ms']:>9.1f}{row['p99_ms']:>9.1f}"
+                f"{row['requests_per_second']:>9.0f}{queries:>9}{row['errors']:>8}"
+            )
+
+    def _print_comparison(self, path, results):
+        try:
+            with open(path, encoding='utf-8') as previous_file:
+                previous = json.load(previous_file)
+        except (OSError, ValueError) as exc:
+            raise CommandError(f"Cannot read {path}: {exc}")
+        self.stdout.write(f"\nCompared with {previous['meta'].get('commit') or path}:")
+        self.stdout.write(f"{'case':<30}{'p50 before':>12}{'p50 after':>11}{'change':>9}{'queries':>16}")
+        for name, row in results.items():
+            before = previous['routes'].get(name)
+            if before is None:
+                continue
+            change = (row['p50_ms'] - before['p50_ms']) / before['p50_ms'] * 100 if before['p50_ms'] else 0
+            queries = f"{before['queries_per_request']} -> {row['queries_per_request']}"
+            self.stdout.write(
+                f"{name:<30}{before['p50_ms']:>12.1f}{row['p50_ms']:>11.1f}{change:>+8.0f}%{queries:>16}"
+            )
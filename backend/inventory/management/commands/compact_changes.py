@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+from inventory.models import ChangeLog
+
+
+class Command(BaseCommand):
+    help = (
+        "Compact the change feed log: keep only the latest entry per product, customer and order. "
+        "Safe to run at any time, e.g. from cron."
+    )
+
+    def handle(self, *args, **options):
+        deleted = ChangeLog.objects.compact()
+        self.stdout.write(f"Removed {deleted} superseded change log entries, {ChangeLog.objects.count()} left.")
@@ -0,0 +1,188 @@
+import re
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.utils import timezone
+from inventory.models import ChangeLog, Customer, DailySalesRollup, InventoryMovement, Order, OrderItem, Product
+
+ITEMS_PER_ORDER = 3
+
+# (label, URL) of every read endpoint whose queries are checked
+ENDPOINTS = (
+    ('customer list', '/api/customer/'),
+    ('customer detail', '/api/customer/{customer}'),
+    ('customer search', '/api/customer/search/?q=Explain'),
+    ('active customers', '/api/customer/active/'),
+    ('product list', '/api/product/'),
+    ('product detail', '/api/product/{product}'),
+    ('product search', '/api/product/search/?q=Explain'),
+    ('order list', '/api/order/'),
+    ('order list (fast)', '/api/order/?fast=1'),
+    ('order list (sparse)', '/api/order/?fields=id,total_amount&expand=customer'),
+    ('order detail', '/api/order/{order}/'),
+    ('order export', '/api/order/export/?created_after={today}'),
+    ('dashboard summary', '/api/dashboard/summary/'),
+    ('sales report', '/api/reports/sales/?interval=month&by_product=1'),
+    ('stock report', '/api/reports/stock/?at={today}'),
+    ('changes feed', '/api/changes/'),
+    ('job list', '/api/jobs/'),
+    ('async customer list', '/api/async/customer/'),
+    ('async customer detail', '/api/async/customer/{customer}'),
+    ('async active customers', '/api/async/customer/active/'),
+    ('async product list', '/api/async/product/'),
+    ('async product detail', '/api/async/product/{product}'),
+    ('async order list', '/api/async/order/'),
+    ('async order detail', '/api/async/order/{order}/'),
+)
+
+# Full scans that are inherent to a query (whole-table aggregates), keyed
+# by (endpoint label, table). Any other full table or index scan fails the run.
+EXPECTED_SCANS = {
+    ('dashboard summary', 'inventory_order'): 'net sales and units sum every order',
+    ('dashboard summary', 'inventory_orderitem'): 'top sellers sum every order line',
+    ('dashboard summary', 'inventory_customer'): 'counts every active customer',
+    ('active customers', 'inventory_customer'): 'counts every active customer',
+    ('async active customers', 'inventory_customer'): 'counts every active customer',
+    ('stock report', 'inventory_product'): 'one row per product',
+}
+
+# SQLite reports a table walk as a bare 'SCAN <table>' line and a walk of a
+# whole index as 'SCAN <table> USING [COVERING] INDEX <index>'; ranges are
+# 'SEARCH' lines. Virtual (FTS) tables and subqueries do not count.
+SQLITE_SCAN = re.compile(r'^\s*SCAN (\w+)( USING (?:COVERING )?INDEX \w+)?\s*$', re.MULTILINE)
+# PostgreSQL: 'Seq Scan on <table>', or an index scan node without an Index Cond
+POSTGRES_SEQ_SCAN = re.compile(r'^\s*Seq Scan on (\w+)')
+POSTGRES_INDEX_SCAN = re.compile(r'^\s*Index (?:Only )?Scan (?:Backward )?using \w+ on (\w+)')
+# Plan steps that read every row before a LIMIT applies
+UNBOUNDED_STEPS = {
+    'sqlite': ('TEMP B-TREE',),
+    'postgresql': ('Sort', 'Aggregate'),
+}
+EXPLAIN_PREFIX = {
+    'sqlite': 'EXPLAIN QUERY PLAN ',
+    'postgresql': 'EXPLAIN ',
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Run EXPLAIN on every query issued by the read endpoints against a seeded database and fail "
+        "if any of them falls back to an unexpected full table or index scan. Rows are generated "
+        "inside a transaction that is rolled back afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=5000, help='Products and orders to seed.')
+        parser.add_argument('--verbose-plans', action='store_true', help='Print the plan of every query.')
+
+    def handle(self, *args, rows, verbose_plans=False, **options):
+        vendor = connection.vendor
+        if vendor not in EXPLAIN_PREFIX:
+            raise CommandError(f"EXPLAIN parsing is not implemented for the '{vendor}' backend.")
+
+        failures = []
+        with transaction.atomic():
+            ids = self._seed(rows)
+            client = Client()
+            with override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'testserver']):
+                for label, url in ENDPOINTS:
+                    failures += self._check(client, vendor, label, url.format(**ids), verbose_plans)
+            transaction.set_rollback(True)
+
+        if failures:
+            for label, table, kind, sql in failures:
+                self.stderr.write(f"  {label}: full {kind} scan of {table}\n    {sql[:200]}")
+            raise CommandError(
+                f"{len(failures)} quer{'y' if len(failures) == 1 else 'ies'} scan a whole table or index."
+            )
+        self.stdout.write(self.style.SUCCESS(f"{len(ENDPOINTS)} endpoints checked, no unexpected full scans."))
+
+    def _seed(self, count):
+        customers = Customer.objects.bulk_create(
+            Customer(name=f'Explain {i}', email=f'explain{i}@example.com', phone='9999999999',
+                     address='Explain street', isActive=i % 4 != 0)
+            for i in range(max(count // 10, 1))
+        )
+        products = Product.objects.bulk_create(
+            Product(sku=f'EXPLAIN-{i}', product_name=f'Explain product {i}', product_price='19.99',
+                    stock_quantity=i % 50)
+            for i in range(count)
+        )
+        orders = Order.objects.bulk_create(
+            Order(customer=customers[i % len(customers)], total_amount='59.97', item_count=6)
+            for i in range(count)
+        )
+        OrderItem.objects.bulk_create(
+            OrderItem(order=order, product=products[(i + k) % count], quantity=k + 1, unit_price='19.99')
+            for i, order in enumerate(orders)
+            for k in range(ITEMS_PER_ORDER)
+        )
+        DailySalesRollup.objects.rebuild()
+        ChangeLog.objects.record(Customer, [customer.pk for customer in customers])
+        ChangeLog.objects.record(Product, [product.pk for product in products])
+        ChangeLog.objects.record(Order, [order.pk for order in orders])
+        InventoryMovement.objects.record(
+            {product.pk: product.stock_quantity for product in products}, InventoryMovement.Reason.OPENING,
+        )
+        return {
+            'customer': customers[0].pk,
+            'product': products[0].pk,
+            'order': orders[0].pk,
+            'today': timezone.localdate().isoformat(),
+        }
+
+    def _check(self, client, vendor, label, url, verbose_plans):
+        with CaptureQueriesContext(connection) as captured:
+            response = client.get(url)
+            if response.streaming:
+                b''.join(response.streaming_content)
+        if response.status_code != 200:
+            raise CommandError(f"{label}: GET {url} returned {response.status_code}.")
+
+        failures = []
+        self.stdout.write(f"{label} ({len(captured)} queries)")
+        for query in captured.captured_queries:
+            sql = query['sql']
+            if not sql.lstrip().upper().startswith('SELECT'):
+                continue
+            with connection.cursor() as cursor:
+                cursor.execute(EXPLAIN_PREFIX[vendor] + sql)
+                plan = '\n'.join(str(row[-1]) for row in cursor.fetchall())
+            if verbose_plans:
+                self.stdout.write(f"  {sql[:160]}\n    " + plan.replace('\n', '\n    '))
+            for table, kind in self._scans(vendor, plan):
+                if (kind == 'index' or vendor == 'sqlite') and self._bounded(vendor, sql, plan):
+                    # Rows stream in index (or rowid) order and the walk stops at the LIMIT
+                    continue
+                if (label, table) in EXPECTED_SCANS:
+                    continue
+                failures.append((label, table, kind, sql))
+        return failures
+
+    @staticmethod
+    def _scans(vendor, plan):
+        """
+        (table, 'table' or 'index') for every full scan in a plan.
+        """
+        if vendor == 'sqlite':
+            return [
+                (match.group(1), 'index' if match.group(2) else 'table')
+                for match in SQLITE_SCAN.finditer(plan)
+            ]
+        scans = []
+        for node in re.split(r'\n\s*->', plan):
+            if match := POSTGRES_SEQ_SCAN.match(node):
+                scans.append((match.group(1), 'table'))
+            elif (match := POSTGRES_INDEX_SCAN.match(node)) and 'Index Cond' not in node:
+                scans.append((match.group(1), 'index'))
+        return scans
+
+    @staticmethod
+    def _bounded(vendor, sql, plan):
+        return (
+            re.search(r'\bLIMIT \d+', sql) is not None
+            and re.search(r'\bGROUP BY\b', sql) is None
+            and not any(step in plan for step in UNBOUNDED_STEPS[vendor])
+        )
@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand, CommandError
+from inventory.importers import IMPORT_CHUNK_SIZE, import_products_csv
+
+
+class Command(BaseCommand):
+    help = "Import a product catalogue CSV (sku, product_name, product_price, stock_quantity), upserting on sku."
+
+    def add_arguments(self, parser):
+        parser.add_argument('csv_path', help='Path to the catalogue CSV file.')
+        parser.add_argument('--errors', dest='errors_path', help='Write rejected rows to this CSV file.')
+        parser.add_argument('--chunk-size', type=int, default=IMPORT_CHUNK_SIZE, help='Rows per bulk insert batch.')
+
+    def handle(self, *args, csv_path, errors_path=None, chunk_size=IMPORT_CHUNK_SIZE, **options):
+        error_file = open(errors_path, 'w', newline='', encoding='utf-8') if errors_path else None
+        try:
+            with open(csv_path, newline='', encoding='utf-8-sig') as csv_file:
+                stats = import_products_csv(csv_file, error_file=error_file, chunk_size=chunk_size)
+        except (OSError, ValueError) as exc:
+            raise CommandError(str(exc))
+        finally:
+            if error_file is not None:
+                error_file.close()
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Imported {stats['imported']} of {stats['rows']} rows "
+            f"({stats['failed']} rejected, {stats['duplicates']} duplicate SKUs) in {stats['seconds']}s "
+            f"- {stats['rows_per_second']} rows/s"
+        ))
+        if (stats['failed'] or stats['duplicates']) and errors_path:
+            self.stdout.write(f"Rejected and duplicate rows written to {errors_path}")
@@ -0,0 +1,67 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.error import HTTPError, URLError
+from urllib.request import urlopen
+from django.core.management.base import BaseCommand, CommandError
+
+DEFAULT_PATHS = (
+    '/api/product/?fast=1',
+    '/api/async/product/',
+    '/api/customer/active/',
+    '/api/async/customer/active/',
+    '/api/order/?fast=1&page_size=20',
+    '/api/async/order/?page_size=20',
+)
+
+
+def _percentile(sorted_values, fraction):
+    return sorted_values[min(int(len(sorted_values) * fraction), len(sorted_values) - 1)]
+
+
+class Command(BaseCommand):
+    help = (
+        "Send concurrent GET requests to a running server and report throughput and latency per path. "
+        "Run it against the WSGI and the ASGI deployment on the same machine to compare them."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('base_url', help="Server root, e.g. 'http://127.0.0.1:8000'.")
+        parser.add_argument('--paths', nargs='+', default=DEFAULT_PATHS, help='Paths to request.')
+        parser.add_argument('--concurrency', type=int, default=32, help='Requests in flight at once.')
+        parser.add_argument('--requests', type=int, default=2000, help='Requests per path.')
+        parser.add_argument('--timeout', type=float, default=30, help='Seconds before a request counts as failed.')
+
+    def handle(self, *args, base_url, paths, concurrency, requests, timeout, **options):
+        base_url = base_url.rstrip('/')
+        self.stdout.write(f"{'path':<36}{'req/s':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'errors':>8}")
+        for path in paths:
+            url = base_url + path
+            try:
+                urlopen(url, timeout=timeout).read()  # warm up connections and caches
+            except (HTTPError, URLError) as exc:
+                raise CommandError(f"GET {url} failed: {exc}")
+
+            def fetch(_):
+                started = time.perf_counter()
+                try:
+                    with urlopen(url, timeout=timeout) as response:
+                        response.read()
+                    ok = True
+                except (HTTPError, URLError, OSError):
+                    ok = False
+                return ok, time.perf_counter() - started
+
+            started = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=concurrency) as pool:
+                results = list(pool.map(fetch, range(requests)))
+            elapsed = time.perf_counter() - started
+
+            latencies = sorted(seconds * 1000 for ok, seconds in results if ok)
+            errors = sum(1 for ok, _ in results if not ok)
+            if not latencies:
+                self.stdout.write(f"{path:<36}{'-':>9}{'-':>9}{'-':>9}{'-':>9}{errors:>8}")
+                continue
+            self.stdout.write(
+                f"{path:<36}{len(latencies) / elapsed:>9.0f}{_percentile(latencies, 0.5):>9.1f}"
+                f"{_percentile(latencies, 0.95):>9.1f}{_percentile(latencies, 0.99):>9.1f}{errors:>8}"
+            )
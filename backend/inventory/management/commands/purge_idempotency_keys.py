@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+from inventory.models import IdempotencyKey
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete stored Idempotency-Key responses older than INVENTORY_IDEMPOTENCY_TTL_SECONDS. "
+        "Safe to run at any time, e.g. from cron."
+    )
+
+    def handle(self, *args, **options):
+        deleted = IdempotencyKey.objects.purge_expired()
+        self.stdout.write(f"Removed {deleted} expired idempotency keys, {IdempotencyKey.objects.count()} left.")
@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_date
+from inventory.models import DailySalesRollup
+
+
+def _day(value):
+    try:
+        day = parse_date(value)
+    except ValueError:
+        day = None
+    if day is None:
+        raise CommandError(f"Invalid date '{value}', expected YYYY-MM-DD.")
+    return day
+
+
+class Command(BaseCommand):
+    help = "Rebuild the daily sales rollups from order items, for all days or an inclusive date range."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--start', type=_day, help='First day to rebuild (YYYY-MM-DD).')
+        parser.add_argument('--end', type=_day, help='Last day to rebuild (YYYY-MM-DD).')
+
+    def handle(self, *args, start=None, end=None, **options):
+        if start and end and start > end:
+            raise CommandError('--start must not be after --end.')
+        written = DailySalesRollup.objects.rebuild(start=start, end=end)
+        span = f"{start or 'beginning'} to {end or 'today'}"
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {written} rollup rows ({span})."))
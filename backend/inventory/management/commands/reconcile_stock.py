@@ -0,0 +1,51 @@
+from django.db import models, transaction
+from django.db.models.functions import Coalesce
+from django.core.management.base import BaseCommand, CommandError
+from inventory.models import InventoryMovement, Product
+
+
+class Command(BaseCommand):
+    help = (
+        "Check that the stock ledger sums to Product.stock_quantity for every product, in one aggregate "
+        "query. Exits with an error listing mismatches; --fix appends correction movements instead."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--fix', action='store_true', help='Record correction movements for mismatched products.')
+        parser.add_argument('--limit', type=int, default=50, help='Mismatches to list.')
+
+    def handle(self, *args, fix, limit, **options):
+        with transaction.atomic():
+            ledger = (
+                InventoryMovement.objects
+                .filter(product=models.OuterRef('pk'))
+                .values('product')
+                .annotate(total=models.Sum('delta'))
+                .values('total')
+            )
+            queryset = Product.objects.all()
+            if fix:
+                queryset = queryset.select_for_update()
+            mismatches = list(
+                queryset
+                .annotate(ledger=Coalesce(models.Subquery(ledger), 0))
+                .exclude(ledger=models.F('stock_quantity'))
+                .order_by('pk')
+                .values_list('pk', 'sku', 'stock_quantity', 'ledger')
+            )
+            if not mismatches:
+                self.stdout.write(self.style.SUCCESS("Stock ledger matches stock_quantity for every product."))
+                return
+
+            for pk, sku, stock, total in mismatches[:limit]:
+                self.stdout.write(f"{sku} (#{pk}): stock_quantity {stock}, ledger {total}, off by {stock - total:+d}")
+            if len(mismatches) > limit:
+                self.stdout.write(f"... and {len(mismatches) - limit} more")
+
+            if not fix:
+                raise CommandError(f"{len(mismatches)} products do not match the stock ledger (use --fix to correct).")
+            InventoryMovement.objects.record(
+                {pk: stock - total for pk, _, stock, total in mismatches},
+                InventoryMovement.Reason.CORRECTION,
+            )
+            self.stdout.write(self.style.SUCCESS(f"Recorded {len(mismatches)} correction movements."))
@@ -0,0 +1,78 @@
+import logging
+import os
+import signal
+import socket
+import threading
+import time
+from django.core.management.base import BaseCommand
+from django.db import DatabaseError, connection
+from inventory.jobs import (
+    HEARTBEAT_SECONDS, JOB_HANDLERS, STALE_JOB_SECONDS, claim_job, requeue_stale_jobs, run_job, send_heartbeat,
+)
+
+logger = logging.getLogger('inventory.jobs')
+
+
+class Command(BaseCommand):
+    help = (
+        "Run background jobs from the database queue with a pool of worker threads. "
+        "Stop with Ctrl-C or SIGTERM; running jobs finish first."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=2, help='Jobs run at the same time.')
+        parser.add_argument('--poll', type=float, default=1.0, help='Seconds between queue checks when idle.')
+        parser.add_argument('--kinds', nargs='+', choices=sorted(JOB_HANDLERS), help='Only run these job kinds.')
+        parser.add_argument('--once', action='store_true', help='Exit once no job is due instead of waiting.')
+
+    def handle(self, *args, workers, poll, kinds, once, **options):
+        stopping = threading.Event()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(signum, lambda *_: stopping.set())
+
+        name = f'{socket.gethostname()}:{os.getpid()}'
+        requeued = requeue_stale_jobs()
+        if requeued:
+            self.stdout.write(f"Requeued or failed {requeued} stale jobs.")
+
+        def work(number):
+            worker = f'{name}:{number}'
+            try:
+                while not stopping.is_set():
+                    try:
+                        job = claim_job(worker, kinds)
+                        if job is None:
+                            if once:
+                                return
+                            stopping.wait(poll)
+                            continue
+                        self.stdout.write(f"[{worker}] job #{job.pk} {job.kind} attempt {job.attempts}")
+                        started = time.perf_counter()
+                        run_job(job)
+                        job.refresh_from_db(fields=['status'])
+                        self.stdout.write(f"[{worker}] job #{job.pk} {job.status} in {time.perf_counter() - started:.1f}s")
+                    except DatabaseError:
+                        # e.g. the database is briefly unavailable; a job left running
+                        # is requeued once its heartbeat goes stale
+                        logger.exception('Worker %s hit a database error', worker)
+                        connection.close()
+                        stopping.wait(poll)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=work, args=(number,), daemon=True) for number in range(workers)]
+        for thread in threads:
+            thread.start()
+        last_heartbeat = last_check = time.monotonic()
+        while any(thread.is_alive() for thread in threads):
+            for thread in threads:
+                thread.join(timeout=poll)
+            now = time.monotonic()
+            if now - last_heartbeat > HEARTBEAT_SECONDS:
+                send_heartbeat(f'{name}:')
+                last_heartbeat = now
+            if now - last_check > STALE_JOB_SECONDS / 2:
+                # Also picks up jobs of other workers that died
+                requeue_stale_jobs()
+                last_check = now
+        connection.close()
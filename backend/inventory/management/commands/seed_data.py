@@ -0,0 +1,32 @@
+import time
+from django.core.management.base import BaseCommand, CommandError
+from django.db import IntegrityError
+from inventory.seeding import seed_inventory
+
+
+class Command(BaseCommand):
+    help = "Generate reproducible customers, products and orders with realistic distributions for benchmarking."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--customers', type=int, default=1000, help='Customers to create.')
+        parser.add_argument('--products', type=int, default=2000, help='Products to create.')
+        parser.add_argument('--orders', type=int, default=20000, help='Orders to create.')
+        parser.add_argument('--seed', type=int, default=0, help='Random seed; each seed can be loaded once per database.')
+        parser.add_argument('--days', type=int, default=365, help='Spread order dates over this many past days.')
+        parser.add_argument('--max-items', type=int, default=8, help='Maximum lines per order.')
+
+    def handle(self, *args, customers, products, orders, seed, days, max_items, **options):
+        if orders and (customers < 1 or products < 1):
+            raise CommandError('Orders need at least one customer and one product.')
+        if min(customers, products, orders) < 0 or days < 1 or max_items < 1:
+            raise CommandError('Counts must be non-negative, --days and --max-items at least 1.')
+
+        started = time.perf_counter()
+        try:
+            counts = seed_inventory(customers, products, orders, seed=seed, days=days, max_items=max_items)
+        except IntegrityError:
+            raise CommandError(f'Seed {seed} is already loaded in this database; pick another --seed.')
+        self.stdout.write(self.style.SUCCESS(
+            f"Created {counts['customers']} customers, {counts['products']} products, {counts['orders']} orders "
+            f"and {counts['order_items']} order items in {time.perf_counter() - started:.1f}s."
+        ))
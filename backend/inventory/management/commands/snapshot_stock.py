@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+from inventory.models import InventoryMovement
+
+
+class Command(BaseCommand):
+    help = (
+        "Snapshot the stock ledger balance of every product with new movements, so point-in-time stock "
+        "reads only sum the movements since. Run it periodically, e.g. hourly or nightly from cron."
+    )
+
+    def handle(self, *args, **options):
+        written = InventoryMovement.objects.take_snapshot()
+        self.stdout.write(f"Wrote {written} stock snapshots.")
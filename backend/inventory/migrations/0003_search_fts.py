@@ -0,0 +1,22 @@
+from django.db import migrations
+
+
+def create_fts(apps, schema_editor):
+    from inventory.search import install_fts
+    install_fts(schema_editor.connection)
+
+
+def drop_fts(apps, schema_editor):
+    from inventory.search import uninstall_fts
+    uninstall_fts(schema_editor.connection)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory', '0002_search_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_fts, drop_fts),
+    ]
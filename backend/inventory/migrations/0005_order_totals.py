@@ -0,0 +1,58 @@
+from django.db import migrations, models
+from django.db.models import DecimalField, F, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+
+
+def backfill_totals(apps, schema_editor):
+    """
+    Fill unit_price from each product's current price (the best record
+    available for existing orders), then derive order totals from the items.
+    """
+    Product = apps.get_model('inventory', 'Product')
+    Order = apps.get_model('inventory', 'Order')
+    OrderItem = apps.get_model('inventory', 'OrderItem')
+
+    OrderItem.objects.update(
+        unit_price=Subquery(Product.objects.filter(pk=OuterRef('product_id')).values('product_price')[:1])
+    )
+
+    per_order = OrderItem.objects.filter(order_id=OuterRef('pk')).values('order_id')
+    amount = DecimalField(max_digits=12, decimal_places=2)
+    Order.objects.update(
+        total_amount=Coalesce(
+            Subquery(per_order.annotate(total=Sum(F('unit_price') * F('quantity'), output_field=amount)).values('total')),
+            0,
+            output_field=amount,
+        ),
+        item_count=Coalesce(
+            Subquery(per_order.annotate(units=Sum('quantity')).values('units')),
+            0,
+        ),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory', '0004_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='order',
+            name='item_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='order',
+            name='total_amount',
+            field=models.DecimalField(decimal_places=2, default=0, max_digits=12),
+        ),
+        migrations.AddField(
+            model_name='orderitem',
+            name='unit_price',
+            field=models.DecimalField(decimal_places=2, default=0, max_digits=10),
+            preserve_default=False,
+        ),
+        migrations.RunPython(backfill_totals, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 5.2.18 on 2026-10-18 11:19
+
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def log_existing_rows(apps, schema_editor):
+    # One entry per existing row, so a feed read from token 0 is a full snapshot
+    ChangeLog = apps.get_model('inventory', 'ChangeLog')
+    now = timezone.now()
+    for resource in ('product', 'customer', 'order'):
+        ids = apps.get_model('inventory', resource).objects.order_by('id').values_list('id', flat=True)
+        ChangeLog.objects.bulk_create(
+            (ChangeLog(resource=resource, object_id=pk, created_at=now) for pk in ids.iterator(chunk_size=2000)),
+            batch_size=2000,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory', '0007_index_audit'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ChangeLog',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('resource', models.CharField(max_length=20)),
+                ('object_id', models.BigIntegerField()),
+                ('deleted', models.BooleanField(default=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['resource', 'object_id', 'id'], name='changelog_object_idx')],
+            },
+        ),
+        migrations.RunPython(log_existing_rows, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,59 @@
+# Generated by Django 5.2.18 on 2026-10-18 11:25
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+def record_opening_balances(apps, schema_editor):
+    # Current stock becomes each product's opening movement, so the ledger
+    # reconciles from the start
+    InventoryMovement = apps.get_model('inventory', 'InventoryMovement')
+    Product = apps.get_model('inventory', 'Product')
+    now = django.utils.timezone.now()
+    levels = Product.objects.exclude(stock_quantity=0).order_by('id').values_list('id', 'stock_quantity')
+    InventoryMovement.objects.bulk_create(
+        (
+            InventoryMovement(product_id=pk, delta=stock, reason='opening', created_at=now)
+            for pk, stock in levels.iterator(chunk_size=2000)
+        ),
+        batch_size=2000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory', '0008_change_log'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='InventoryMovement',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('delta', models.IntegerField()),
+                ('reason', models.CharField(choices=[('opening', 'Opening'), ('order', 'Order'), ('order_deleted', 'Order Deleted'), ('adjustment', 'Adjustment'), ('correction', 'Correction')], max_length=20)),
+                ('order_id', models.BigIntegerField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('product', models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='movements', to='inventory.product')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['product', 'id'], name='movement_product_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='StockSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('stock_quantity', models.IntegerField()),
+                ('last_movement_id', models.BigIntegerField()),
+                ('taken_at', models.DateTimeField()),
+                ('product', models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='stock_snapshots', to='inventory.product')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['product', 'last_movement_id'], name='snapshot_product_idx')],
+            },
+        ),
+        migrations.RunPython(record_opening_balances, migrations.RunPython.noop),
+    ]
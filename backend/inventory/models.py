@@ -1,4 +1,24 @@
-from django.db import models
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from decimal import Decimal
+from itertools import islice
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connection, models, transaction
+from django.db.models.functions import Coalesce, Now, TruncDate
+from django.utils import timezone
+from .cache import invalidate
+from .events import publish_deleted_orders, publish_stock_levels
+
+ROLLUP_CHUNK_SIZE = 2000
+CHANGE_LOG_BATCH_SIZE = 2000
+LEDGER_BATCH_SIZE = 2000
+ORDER_DELETE_CHUNK_SIZE = 500
+
+# True while _delete_orders deletes orders. It logs their tombstones,
+# publishes their events and bumps the order version in bulk, so the
+# per-row receivers in signals.py skip them
+order_deletes_logged = ContextVar('order_deletes_logged', default=False)
 
 class Customer(models.Model):
     name = models.CharField(max_length=100)
@@ -6,24 +26,245 @@ class Customer(models.Model):
     phone = models.CharField(max_length=10)
     address = models.TextField()
     isActive = models.BooleanField(default=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['name'], name='customer_name_idx'),
+            models.Index(fields=['phone'], name='customer_phone_idx'),
+            # Partial: only active customers are ever filtered on
+            models.Index(fields=['id'], condition=models.Q(isActive=True), name='customer_active_idx'),
+        ]
 
     def __str__(self):
         return self.name
 
+class ProductQuerySet(models.QuerySet):
+    @staticmethod
+    def _per_product(quantities):
+        return models.Case(
+            *[models.When(pk=pk, then=models.Value(qty)) for pk, qty in quantities.items()],
+            output_field=models.PositiveIntegerField(),
+        )
+
+    def reserve_stock(self, quantities):
+        """
+        Deduct stock for several products in a single conditional UPDATE.
+
+        Args:
+            quantities (dict): Mapping of product ID to quantity to deduct.
+
+        Returns:
+            bool: True if every product had enough stock and was decremented.
+            On False some rows may already be decremented, so callers must run
+            this inside a transaction and roll back.
+        """
+        if not quantities:
+            return True
+        delta = self._per_product(quantities)
+        reserved = self.filter(pk__in=quantities, stock_quantity__gte=delta).update(
+            stock_quantity=models.F('stock_quantity') - delta,
+            updated_at=Now(),
+        )
+        ChangeLog.objects.record(Product, quantities)
+        publish_stock_levels(self.filter(pk__in=list(quantities)))
+        invalidate(Product)
+        return reserved == len(quantities)
+
+    def restore_stock(self, quantities):
+        """
+        Add stock back for several products in a single UPDATE.
+
+        Args:
+            quantities (dict): Mapping of product ID to quantity to add back.
+        """
+        if quantities:
+            delta = self._per_product(quantities)
+            self.filter(pk__in=quantities).update(
+                stock_quantity=models.F('stock_quantity') + delta,
+                updated_at=Now(),
+            )
+            ChangeLog.objects.record(Product, quantities)
+            publish_stock_levels(self.filter(pk__in=list(quantities)))
+            invalidate(Product)
+
 class Product(models.Model):
     sku = models.CharField(max_length=30, unique=True)
     product_name = models.CharField(max_length=100)
     product_price = models.DecimalField(max_digits=10, decimal_places=2)
     stock_quantity = models.PositiveIntegerField()
     isActive = models.BooleanField(default=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+
+    objects = ProductQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['product_name'], name='product_name_idx'),
+            # Low/out-of-stock lookups, already in (stock_quantity, id) order
+            models.Index(fields=['stock_quantity', 'id'], name='product_stock_idx'),
+        ]
 
     def __str__(self):
         return f"{self.sku} - {self.product_name}"
 
+class OrderQuerySet(models.QuerySet):
+    def with_details(self):
+        """
+        Load each order's customer, items and item products up front.
+
+        The nested OrderSerializer otherwise issues one query per order for
+        the customer, one per order for its items and one per item for the
+        product. This keeps the read path at a constant two queries. Items
+        come in ID order, like on the '.values()' fast path.
+        """
+        return self.select_related('customer').prefetch_related(
+            models.Prefetch(
+                'orderitem_set',
+                queryset=OrderItem.objects.select_related('product').order_by('id'),
+            )
+        )
+
+    def for_response(self, fields, expand):
+        """
+        Load only the columns and relations a sparse order response needs.
+
+        Args:
+            fields: Order fields being returned ('id', 'customer',
+                'created_at', 'total_amount', 'item_count', 'items').
+            expand: Relations returned in full ('customer', 'items.product').
+        """
+        columns = ['id']
+        queryset = self
+        for name in ('created_at', 'total_amount', 'item_count'):
+            if name in fields:
+                columns.append(name)
+        if 'customer' in fields:
+            columns.append('customer')
+            if 'customer' in expand:
+                queryset = queryset.select_related('customer')
+        if 'items' in fields:
+            items = OrderItem.objects.only('id', 'order', 'product', 'quantity', 'unit_price')
+            if 'items.product' in expand:
+                items = OrderItem.objects.select_related('product')
+            # Explicit: the (order, product) index would otherwise return
+            # items in product order
+            items = items.order_by('id')
+            queryset = queryset.prefetch_related(models.Prefetch('orderitem_set', queryset=items))
+        return queryset.only(*columns)
+
+    def delete_restoring_stock(self, chunk_size=ORDER_DELETE_CHUNK_SIZE, on_chunk=None):
+        """
+        Delete the selected orders and put their items back into stock.
+
+        Orders are deleted in chunks of chunk_size, one transaction per
+        chunk, so the IN lists stay under the database's parameter limit and
+        no single transaction holds the write lock for long. Within a chunk,
+        item quantities are summed per product in the database and restored
+        with one UPDATE and logged to the stock ledger per order, the orders'
+        sales are taken out of the daily rollups and their change log
+        tombstones are written in one bulk INSERT.
+
+        Args:
+            on_chunk: Called with the number of orders deleted so far after
+                each chunk. Raising from it stops the delete, leaving the
+                remaining orders (and their stock) as they were.
+
+        Returns:
+            int: Number of orders deleted.
+        """
+        return self._delete_by_chunk(_delete_orders_restoring_stock, chunk_size, on_chunk)
+
+    def delete_in_chunks(self, chunk_size=ORDER_DELETE_CHUNK_SIZE, on_chunk=None):
+        """
+        Delete the selected orders without restoring stock (e.g. with their
+        customer), in chunks like delete_restoring_stock. Their sales are
+        taken out of the daily rollups.
+
+        Returns:
+            int: Number of orders deleted.
+        """
+        return self._delete_by_chunk(_delete_orders, chunk_size, on_chunk)
+
+    def _delete_by_chunk(self, delete, chunk_size, on_chunk):
+        deleted = 0
+        while True:
+            with transaction.atomic():
+                order_ids = list(
+                    self.order_by('pk').select_for_update().values_list('pk', flat=True)[:chunk_size]
+                )
+                if not order_ids:
+                    return deleted
+                deleted += delete(order_ids)
+            if on_chunk:
+                on_chunk(deleted)
+
+def _delete_orders_restoring_stock(order_ids):
+    """
+    Put the orders' items back into stock, log that to the stock ledger and
+    delete the orders. Run it in a transaction.
+
+    Returns:
+        int: Number of orders deleted.
+    """
+    per_order = defaultdict(dict)
+    quantities = defaultdict(int)
+    rows = (
+        OrderItem.objects.filter(order_id__in=order_ids)
+        .values('order_id', 'product_id')
+        .annotate(total=models.Sum('quantity'))
+        .values_list('order_id', 'product_id', 'total')
+    )
+    for order_id, product_id, total in rows:
+        per_order[order_id][product_id] = total
+        quantities[product_id] += total
+    Product.objects.restore_stock(quantities)
+    movements = [
+        InventoryMovement(
+            product_id=product_id, delta=total, order_id=order_id,
+            reason=InventoryMovement.Reason.ORDER_DELETED,
+        )
+        for order_id, totals in per_order.items()
+        for product_id, total in totals.items()
+    ]
+    InventoryMovement.objects.bulk_create(movements, batch_size=LEDGER_BATCH_SIZE)
+    return _delete_orders(order_ids)
+
+def _delete_orders(order_ids):
+    """
+    Delete orders by ID after taking them out of the daily sales rollups.
+    Their change log tombstones and 'order_deleted' events are written in
+    bulk instead of per row. Run it in a transaction.
+
+    Returns:
+        int: Number of orders deleted.
+    """
+    DailySalesRollup.objects.remove_orders(order_ids)
+    token = order_deletes_logged.set(True)
+    try:
+        _, deleted = Order.objects.filter(pk__in=order_ids).delete()
+    finally:
+        order_deletes_logged.reset(token)
+    ChangeLog.objects.record(Order, order_ids, deleted=True)
+    publish_deleted_orders(order_ids)
+    invalidate(Order)
+    return deleted.get(Order._meta.label, 0)
+
 class Order(models.Model):
     customer = models.ForeignKey(Customer, on_delete=models.CASCADE)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
     products = models.ManyToManyField(Product, through='OrderItem')
+    # Written once when the order is created, from the items' unit prices
+    total_amount = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    item_count = models.PositiveIntegerField(default=0)  # total units ordered
+
+    objects = OrderQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['created_at'], name='order_created_idx'),
+        ]
 
     def __str__(self):
         return f"Order #{self.id} by {self.customer.name}"
@@ -32,6 +273,475 @@ class OrderItem(models.Model):
     product = models.ForeignKey(Product, on_delete=models.CASCADE)
     order = models.ForeignKey(Order, on_delete=models.CASCADE)
     quantity = models.PositiveIntegerField()
+    # Product price at purchase time; later price edits do not change the order
+    unit_price = models.DecimalField(max_digits=10, decimal_places=2)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['order', 'product'], name='orderitem_order_product_idx'),
+        ]
 
     def __str__(self):
         return f"{self.quantity} x {self.product.product_name} (Order #{self.order.id})"
+
+class DailySalesRollupQuerySet(models.QuerySet):
+    def _apply(self, totals, sign):
+        """
+        Add (sign=1) or subtract (sign=-1) units and revenue on rollup rows
+        with a single UPDATE, however many days and products it spans.
+
+        Args:
+            totals (dict): Mapping of (date, product ID) to (units, revenue).
+        """
+        if sign > 0:
+            # Make sure every row exists first; concurrent orders then only race on the UPDATE
+            self.bulk_create(
+                [DailySalesRollup(date=day, product_id=pk) for day, pk in totals],
+                ignore_conflicts=True,
+            )
+        per_day = defaultdict(dict)
+        for (day, pk), values in totals.items():
+            per_day[day][pk] = values
+
+        def delta(index, output_field):
+            # Keyed on the day first, so each row only tests that day's products
+            return models.Case(
+                *[
+                    models.When(date=day, then=models.Case(
+                        *[models.When(product_id=pk, then=models.Value(sign * values[index])) for pk, values in products.items()],
+                        default=models.Value(0),
+                        output_field=output_field,
+                    ))
+                    for day, products in per_day.items()
+                ],
+                default=models.Value(0),
+                output_field=output_field,
+            )
+
+        self.filter(date__in=list(per_day), product_id__in={pk for _, pk in totals}).update(
+            units=models.F('units') + delta(0, models.IntegerField()),
+            revenue=models.F('revenue') + delta(1, models.DecimalField(max_digits=14, decimal_places=2)),
+        )
+
+    def add_order(self, order, items):
+        """
+        Count a newly created order in its day's rollup rows.
+
+        Args:
+            order (Order): The saved order.
+            items (list): Its OrderItems, with unit_price set.
+        """
+        day = timezone.localdate(order.created_at)
+        totals = defaultdict(lambda: (0, Decimal('0')))
+        for item in items:
+            units, revenue = totals[day, item.product_id]
+            totals[day, item.product_id] = (units + item.quantity, revenue + item.unit_price * item.quantity)
+        if totals:
+            self._apply(totals, 1)
+
+    def remove_orders(self, order_ids):
+        """
+        Take orders that are about to be deleted out of the rollups with one
+        aggregate query and one UPDATE. Rows left with no units are removed.
+        """
+        rows = (
+            OrderItem.objects.filter(order_id__in=order_ids)
+            .annotate(day=TruncDate('order__created_at'))
+            .values('day', 'product_id')
+            .annotate(
+                units=models.Sum('quantity'),
+                revenue=models.Sum(models.F('unit_price') * models.F('quantity')),
+            )
+        )
+        totals = {(row['day'], row['product_id']): (row['units'], row['revenue']) for row in rows}
+        if totals:
+            self._apply(totals, -1)
+            self.filter(date__in={day for day, _ in totals}, units__lte=0).delete()
+
+    def rebuild(self, start=None, end=None):
+        """
+        Recompute rollup rows from OrderItems, optionally only for days in
+        [start, end]. Use after bulk changes that bypass add_order /
+        remove_orders (e.g. orders removed by deleting their customer).
+
+        Returns:
+            int: Number of rollup rows written.
+        """
+        days = {}
+        if start:
+            days['date__gte'] = start
+        if end:
+            days['date__lte'] = end
+        sales = (
+            OrderItem.objects
+            .annotate(day=TruncDate('order__created_at'))
+            .filter(**{key.replace('date', 'day'): value for key, value in days.items()})
+            .values('day', 'product_id')
+            .annotate(
+                units=models.Sum('quantity'),
+                revenue=models.Sum(models.F('unit_price') * models.F('quantity')),
+            )
+            .order_by('day', 'product_id')
+        )
+        with transaction.atomic():
+            self.filter(**days).delete()
+            rollups = (
+                DailySalesRollup(date=row['day'], product_id=row['product_id'], units=row['units'], revenue=row['revenue'])
+                for row in sales.iterator(chunk_size=ROLLUP_CHUNK_SIZE)
+            )
+            written = 0
+            while True:
+                chunk = list(islice(rollups, ROLLUP_CHUNK_SIZE))
+                if not chunk:
+                    return written
+                self.bulk_create(chunk)
+                written += len(chunk)
+
+class DailySalesRollup(models.Model):
+    """
+    Units sold and revenue per product per day (in the project time zone),
+    so sales reports read one row per day and product instead of every
+    OrderItem. Kept current by order create/delete.
+    """
+    date = models.DateField()
+    product = models.ForeignKey(Product, on_delete=models.CASCADE)
+    units = models.IntegerField(default=0)
+    revenue = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+
+    objects = DailySalesRollupQuerySet.as_manager()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['date', 'product'], name='rollup_date_product_uniq'),
+        ]
+
+    def __str__(self):
+        return f"{self.date} {self.product_id}: {self.units} units"
+
+class ChangeLogQuerySet(models.QuerySet):
+    def record(self, model, ids, deleted=False):
+        """
+        Log that rows of model were created/updated (or deleted) with one
+        bulk INSERT. Run it in the same transaction as the change itself.
+
+        Args:
+            model: Product, Customer or Order.
+            ids: Primary keys of the changed rows.
+        """
+        resource = model._meta.model_name
+        self.bulk_create(
+            [ChangeLog(resource=resource, object_id=pk, deleted=deleted) for pk in ids],
+            batch_size=CHANGE_LOG_BATCH_SIZE,
+        )
+
+    def compact(self):
+        """
+        Delete every entry that a later entry for the same row supersedes,
+        leaving one entry per row. Clients lose nothing: whatever token they
+        hold, the latest entry of each row is still ahead of it or already
+        seen.
+
+        Returns:
+            int: Number of entries deleted.
+        """
+        newer = ChangeLog.objects.filter(
+            resource=models.OuterRef('resource'),
+            object_id=models.OuterRef('object_id'),
+            id__gt=models.OuterRef('id'),
+        )
+        deleted, _ = self.filter(models.Exists(newer)).delete()
+        return deleted
+
+class ChangeLog(models.Model):
+    """
+    Append-only log of product, customer and order changes behind the
+    changes/ feed. The entry ID is the feed's change token. Deletes are
+    kept as tombstones (deleted=True). Fed by model signals (see
+    signals.py) and by explicit record() calls in the bulk write paths
+    that bypass them.
+    """
+    resource = models.CharField(max_length=20)  # model_name: product, customer or order
+    object_id = models.BigIntegerField()
+    deleted = models.BooleanField(default=False)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    objects = ChangeLogQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['resource', 'object_id', 'id'], name='changelog_object_idx'),
+        ]
+
+    def __str__(self):
+        return f"#{self.id} {self.resource} {self.object_id}{' deleted' if self.deleted else ''}"
+
+class InventoryMovementQuerySet(models.QuerySet):
+    def record(self, deltas, reason, order_id=None):
+        """
+        Append one movement per product with one bulk INSERT. Zero deltas
+        are skipped. Run it in the transaction that changes the stock.
+
+        Args:
+            deltas (dict): Mapping of product ID to signed stock change.
+            reason (str): One of InventoryMovement.Reason.
+            order_id (int): Order that caused the change, if any.
+        """
+        now = timezone.now()
+        self.bulk_create(
+            [
+                InventoryMovement(product_id=pk, delta=delta, reason=reason, order_id=order_id, created_at=now)
+                for pk, delta in deltas.items() if delta
+            ],
+            batch_size=LEDGER_BATCH_SIZE,
+        )
+
+    @contextmanager
+    def tracking(self, products, reason):
+        """
+        Record movements for stock levels overwritten inside the block (product
+        edits, batch upserts, CSV imports). The rows are locked and their
+        levels read before the block and read again after it; each difference
+        becomes a movement. Products created in the block get an opening
+        movement instead.
+
+        Args:
+            products: Product queryset selecting the rows the block writes.
+        """
+        with transaction.atomic():
+            before = dict(products.select_for_update().values_list('pk', 'stock_quantity'))
+            yield
+            after = dict(products.values_list('pk', 'stock_quantity'))
+            self.record({pk: level - before[pk] for pk, level in after.items() if pk in before}, reason)
+            self.record(
+                {pk: level for pk, level in after.items() if pk not in before},
+                InventoryMovement.Reason.OPENING,
+            )
+
+    def stock_at(self, moment, product_ids=None):
+        """
+        Stock level of each product at a point in time: its latest snapshot
+        taken by then plus the movements logged after that snapshot, up to
+        moment. The tail is bounded by how often snapshots are taken.
+
+        Returns:
+            dict: Mapping of product ID to stock level (products created
+            after moment have 0).
+        """
+        snapshot = StockSnapshot.objects.filter(
+            product=models.OuterRef('pk'), taken_at__lte=moment,
+        ).order_by('-last_movement_id')
+        tail = (
+            InventoryMovement.objects
+            .filter(
+                product=models.OuterRef('pk'),
+                id__gt=Coalesce(models.OuterRef('snapshot_movement'), 0),
+                created_at__lte=moment,
+            )
+            .values('product')
+            .annotate(total=models.Sum('delta'))
+            .values('total')
+        )
+        products = Product.objects.all()
+        if product_ids is not None:
+            products = products.filter(pk__in=product_ids)
+        rows = (
+            products
+            .annotate(
+                snapshot_stock=models.Subquery(snapshot.values('stock_quantity')[:1]),
+                snapshot_movement=models.Subquery(snapshot.values('last_movement_id')[:1]),
+            )
+            .annotate(tail=models.Subquery(tail))
+            .order_by('pk')
+            .values_list('pk', 'snapshot_stock', 'tail')
+        )
+        return {pk: (stock or 0) + (tail or 0) for pk, stock, tail in rows}
+
+    def take_snapshot(self):
+        """
+        Write a StockSnapshot for every product with movements since the
+        previous snapshot run, from its previous snapshot plus the new
+        movements only.
+
+        Returns:
+            int: Number of snapshots written.
+        """
+        with transaction.atomic():
+            if connection.vendor == 'postgresql':
+                # Wait for in-flight stock writes, so no movement below the
+                # boundary commits after the snapshot has been taken
+                with connection.cursor() as cursor:
+                    cursor.execute(f'LOCK TABLE {InventoryMovement._meta.db_table} IN SHARE MODE')
+            boundary = self.aggregate(last=models.Max('id'))['last'] or 0
+            # Every product's latest snapshot covers all its movements up to
+            # the previous boundary, so only movements after it are read
+            previous_boundary = StockSnapshot.objects.aggregate(last=models.Max('last_movement_id'))['last'] or 0
+            changes = dict(
+                self.filter(id__gt=previous_boundary, id__lte=boundary)
+                .values('product_id')
+                .annotate(total=models.Sum('delta'))
+                .values_list('product_id', 'total')
+            )
+            previous = StockSnapshot.objects.latest_per_product(changes)
+            now = timezone.now()
+            snapshots = [
+                StockSnapshot(
+                    product_id=pk,
+                    stock_quantity=previous.get(pk, 0) + total,
+                    last_movement_id=boundary,
+                    taken_at=now,
+                )
+                for pk, total in changes.items()
+            ]
+            StockSnapshot.objects.bulk_create(snapshots, batch_size=LEDGER_BATCH_SIZE)
+            return len(snapshots)
+
+class InventoryMovement(models.Model):
+    """
+    Append-only stock ledger: one row per product per stock change. For
+    every product the deltas sum to Product.stock_quantity (checked by the
+    reconcile_stock command).
+    """
+    class Reason(models.TextChoices):
+        OPENING = 'opening'            # product created, or balance before the ledger existed
+        ORDER = 'order'                # stock reserved by a new order
+        ORDER_DELETED = 'order_deleted'  # stock restored by deleting an order
+        ADJUSTMENT = 'adjustment'      # stock_quantity edited, batch upsert or import
+        CORRECTION = 'correction'      # written by reconcile_stock --fix
+
+    # No constraint or cascade: the history outlives deleted products
+    product = models.ForeignKey(Product, on_delete=models.DO_NOTHING, db_constraint=False, related_name='movements')
+    delta = models.IntegerField()
+    reason = models.CharField(max_length=20, choices=Reason.choices)
+    # Plain ID rather than a foreign key, so the reference survives order deletion
+    order_id = models.BigIntegerField(null=True, blank=True)
+    created_at = models.DateTimeField(default=timezone.now)
+
+    objects = InventoryMovementQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            # Point-in-time tails: one product's movements after a snapshot
+            models.Index(fields=['product', 'id'], name='movement_product_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.product_id}: {self.delta:+d} ({self.reason})"
+
+class StockSnapshotQuerySet(models.QuerySet):
+    def latest_per_product(self, product_ids):
+        """
+        Returns:
+            dict: Mapping of product ID to the stock_quantity of its most
+            recent snapshot, for products that have one.
+        """
+        newest = self.filter(product=models.OuterRef('product')).order_by('-last_movement_id').values('pk')[:1]
+        rows = self.filter(product_id__in=list(product_ids), pk=models.Subquery(newest))
+        return dict(rows.values_list('product_id', 'stock_quantity'))
+
+class StockSnapshot(models.Model):
+    """
+    A product's ledger balance including every movement up to
+    last_movement_id. Written by InventoryMovement.objects.take_snapshot()
+    (the snapshot_stock command) so point-in-time stock reads only sum the
+    movements after the latest snapshot.
+    """
+    product = models.ForeignKey(Product, on_delete=models.DO_NOTHING, db_constraint=False, related_name='stock_snapshots')
+    stock_quantity = models.IntegerField()
+    last_movement_id = models.BigIntegerField()
+    taken_at = models.DateTimeField()
+
+    objects = StockSnapshotQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['product', 'last_movement_id'], name='snapshot_product_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.product_id} @ {self.taken_at}: {self.stock_quantity}"
+
+class Job(models.Model):
+    """
+    A unit of background work in the database-backed job queue (see
+    jobs.py). The run_jobs command claims queued jobs and runs them.
+    """
+    class Status(models.TextChoices):
+        QUEUED = 'queued'
+        RUNNING = 'running'
+        SUCCEEDED = 'succeeded'
+        FAILED = 'failed'
+        CANCELLED = 'cancelled'
+
+    kind = models.CharField(max_length=50)  # handler name registered in jobs.py
+    params = models.JSONField(default=dict)
+    status = models.CharField(max_length=10, choices=Status.choices, default=Status.QUEUED)
+    progress_done = models.PositiveBigIntegerField(default=0)
+    progress_total = models.PositiveBigIntegerField(null=True, blank=True)
+    message = models.CharField(max_length=200, blank=True)
+    result = models.JSONField(null=True, blank=True)
+    error = models.TextField(blank=True)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    max_attempts = models.PositiveSmallIntegerField(default=1)
+    cancel_requested = models.BooleanField(default=False)
+    run_after = models.DateTimeField(default=timezone.now)  # earliest start, pushed back on retry
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    heartbeat_at = models.DateTimeField(null=True, blank=True)  # last sign of life from the worker
+    worker = models.CharField(max_length=100, blank=True)
+
+    class Meta:
+        indexes = [
+            # Claiming: the oldest due job among the queued ones
+            models.Index(fields=['run_after', 'id'], condition=models.Q(status='queued'), name='job_queued_idx'),
+        ]
+
+    def __str__(self):
+        return f"Job #{self.id} {self.kind} ({self.status})"
+
+class IdempotencyKeyQuerySet(models.QuerySet):
+    def purge_expired(self):
+        """
+        Delete the records whose TTL has passed.
+
+        Returns:
+            int: Number of records deleted.
+        """
+        deleted, _ = self.filter(expires_at__lte=timezone.now()).delete()
+        return deleted
+
+class IdempotencyKey(models.Model):
+    """
+    The stored response to a write sent with an Idempotency-Key header (see
+    idempotency.py), replayed when the client repeats the request.
+    status_code is null while the first request is still running.
+    """
+    owner = models.CharField(max_length=64, blank=True)  # user pk; blank for anonymous clients
+    key = models.CharField(max_length=255)
+    request_hash = models.CharField(max_length=64)  # sha256 of method, path and body
+    status_code = models.PositiveSmallIntegerField(null=True, blank=True)
+    response = models.JSONField(null=True, blank=True, encoder=DjangoJSONEncoder)
+    created_at = models.DateTimeField(auto_now_add=True)
+    expires_at = models.DateTimeField(db_index=True)
+
+    objects = IdempotencyKeyQuerySet.as_manager()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['owner', 'key'], name='idempotency_owner_key'),
+        ]
+
+    def __str__(self):
+        return f"{self.owner or 'anonymous'}:{self.key} ({self.status_code or 'pending'})"
+
+class TableVersion(models.Model):
+    """
+    Write counter per resource, bumped inside every write transaction (see
+    cache.invalidate). Cached responses and list ETags are keyed on it. It
+    lives in the database so every worker process sees the same version.
+    """
+    resource = models.CharField(max_length=20, unique=True)  # model_name
+    version = models.BigIntegerField()
+
+    def __str__(self):
+        return f"{self.resource} v{self.version}"
@@ -0,0 +1,111 @@
+from rest_framework.pagination import CursorPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class IdCursorPagination(CursorPagination):
+    """
+    Keyset pagination over the primary key.
+
+    - Pages are fetched with 'WHERE id > <cursor>' instead of OFFSET, so deep
+      pages cost the same as the first one.
+    - The cursor is opaque to clients; follow the 'next'/'previous' links.
+    - Clients may ask for a smaller or larger page via '?page_size=',
+      capped at max_page_size.
+    """
+    ordering = 'id'
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 500
+
+
+class RecentFirstCursorPagination(IdCursorPagination):
+    """
+    Keyset pagination that returns the newest rows first.
+
+    Ids are assigned in insertion order, so '-id' matches '-created_at'
+    while staying on the primary key index.
+    """
+    ordering = '-id'
+
+
+class SearchPagination:
+    """
+    Page-number pagination for ranked search results.
+
+    Relevance order has no stable key for keyset paging, so pages are taken
+    by offset. That is cheap here because users rarely go past the first few
+    pages of a search. One extra row is fetched to tell whether there is a
+    next page, so no COUNT query is needed.
+    """
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+
+    def _int_param(self, request, name, default, maximum=None):
+        try:
+            value = int(request.query_params.get(name, default))
+        except (TypeError, ValueError):
+            value = default
+        value = max(value, 1)
+        return min(value, maximum) if maximum else value
+
+    def get_response(self, request, search, serializer_class):
+        """
+        Run search(offset, limit) for the requested page and return a Response
+        with 'results', 'next' and 'previous' like the list endpoints.
+        """
+        page = self._int_param(request, 'page', 1)
+        size = self._int_param(request, self.page_size_query_param, self.page_size, self.max_page_size)
+        rows = search((page - 1) * size, size + 1)
+        url = request.build_absolute_uri()
+        return Response({
+            'next': replace_query_param(url, 'page', page + 1) if len(rows) > size else None,
+            'previous': replace_query_param(url, 'page', page - 1) if page > 1 else None,
+            'results': serializer_class(rows[:size], many=True).data,
+        })
+
+
+class AsyncKeysetPagination:
+    """
+    Forward-only keyset pagination for the async views, which cannot use
+    DRF's synchronous CursorPagination.
+
+    The cursor is the last ID of the previous page ('?after=<id>'), and rows
+    are read with 'WHERE id > after' (or '<' when newest_first). Pages come
+    with a 'next' link only; 'previous' is always null.
+    """
+    page_size = IdCursorPagination.page_size
+    page_size_query_param = 'page_size'
+    max_page_size = IdCursorPagination.max_page_size
+
+    def __init__(self, newest_first=False):
+        self.newest_first = newest_first
+
+    async def get_page(self, request, rows):
+        """
+        Fetch one page of a '.values()' queryset.
+
+        Returns:
+            dict with 'next', 'previous' and the page's raw 'results' rows.
+
+        Raises:
+            ValueError: If 'after' is not an integer.
+        """
+        after = request.GET.get('after')
+        try:
+            size = int(request.GET.get(self.page_size_query_param, self.page_size))
+        except ValueError:
+            size = self.page_size
+        size = min(max(size, 1), self.max_page_size)
+
+        if after is not None:
+            rows = rows.filter(**{'id__lt' if self.newest_first else 'id__gt': int(after)})
+        rows = rows.order_by('-id' if self.newest_first else 'id')[:size + 1]
+        page = [row async for row in rows]
+
+        next_url = None
+        if len(page) > size:
+            page = page[:size]
+            next_url = replace_query_param(request.build_absolute_uri(), 'after', page[-1]['id'])
+        return {'next': next_url, 'previous': None, 'results': page}
@@ -0,0 +1,37 @@
+from django.http import HttpResponse
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # optional dependency
+    orjson = None
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer that encodes with orjson when it is installed.
+
+    Types orjson does not know (Decimal, lazy strings, ...) and datetimes
+    go through DRF's own JSONEncoder.default, so the output matches the
+    stock renderer.
+    Indented (browsable/pretty) output and a missing orjson both fall back
+    to the stock renderer.
+    """
+    _fallback_encoder = JSONEncoder()
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or data is None:
+            return super().render(data, accepted_media_type, renderer_context)
+        renderer_context = renderer_context or {}
+        if self.get_indent(accepted_media_type, renderer_context):
+            return super().render(data, accepted_media_type, renderer_context)
+        return orjson.dumps(data, default=self._fallback_encoder.default, option=orjson.OPT_PASSTHROUGH_DATETIME)
+
+
+def json_response(data, status=200):
+    """
+    Plain Django response with the same JSON body as a DRF Response, for
+    views that cannot use @api_view (async and streaming views).
+    """
+    return HttpResponse(FastJSONRenderer().render(data), status=status, content_type='application/json')
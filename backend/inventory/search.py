@@ -0,0 +1,107 @@
+from django.db import connection
+from django.db.models import Case, IntegerField, Q, Value, When
+from .models import Customer, Product
+
+# model -> (FTS5 table, indexed columns, bm25 column weights)
+# The FTS tables only exist on SQLite; other databases use the ORM fallback.
+FTS_TABLES = {
+    Product: ('inventory_product_fts', ('sku', 'product_name'), (10.0, 1.0)),
+    Customer: ('inventory_customer_fts', ('name', 'email', 'phone'), (1.0, 5.0, 5.0)),
+}
+
+# The trigram tokenizer cannot match shorter queries
+FTS_MIN_QUERY_LENGTH = 3
+
+
+def _fts_statements(table, fts, columns):
+    cols = ', '.join(columns)
+    new = ', '.join(f'new.{c}' for c in columns)
+    old = ', '.join(f'old.{c}' for c in columns)
+    return [
+        (fts, f"CREATE VIRTUAL TABLE {fts} USING fts5({cols}, content='{table}', content_rowid='id', tokenize='trigram')"),
+        (f'{fts}_ai', f"CREATE TRIGGER {fts}_ai AFTER INSERT ON {table} BEGIN "
+                      f"INSERT INTO {fts}(rowid, {cols}) VALUES (new.id, {new}); END"),
+        (f'{fts}_ad', f"CREATE TRIGGER {fts}_ad AFTER DELETE ON {table} BEGIN "
+                      f"INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.id, {old}); END"),
+        (f'{fts}_au', f"CREATE TRIGGER {fts}_au AFTER UPDATE OF {cols} ON {table} BEGIN "
+                      f"INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.id, {old}); "
+                      f"INSERT INTO {fts}(rowid, {cols}) VALUES (new.id, {new}); END"),
+    ]
+
+
+def install_fts(db_connection, create=True):
+    """
+    Create any missing FTS5 search table or sync trigger on SQLite.
+
+    Triggers (not model signals) keep the index in sync, so bulk_create,
+    bulk_update and queryset updates are covered too. SQLite drops triggers
+    when a migration rebuilds a table, so this also runs after every migrate
+    with create=False. That run only repairs FTS tables that already exist
+    and re-indexes any table whose triggers had to be recreated.
+    """
+    if db_connection.vendor != 'sqlite':
+        return
+    with db_connection.cursor() as cursor:
+        cursor.execute("SELECT name FROM sqlite_master WHERE type IN ('table', 'trigger')")
+        existing = {name for (name,) in cursor.fetchall()}
+        for model, (fts, columns, _) in FTS_TABLES.items():
+            if model._meta.db_table not in existing or (fts not in existing and not create):
+                continue
+            missing = [sql for name, sql in _fts_statements(model._meta.db_table, fts, columns) if name not in existing]
+            for sql in missing:
+                cursor.execute(sql)
+            if missing:
+                cursor.execute(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+
+
+def uninstall_fts(db_connection):
+    if db_connection.vendor != 'sqlite':
+        return
+    with db_connection.cursor() as cursor:
+        for fts, _, _ in FTS_TABLES.values():
+            for suffix in ('ai', 'ad', 'au'):
+                cursor.execute(f'DROP TRIGGER IF EXISTS {fts}_{suffix}')
+            cursor.execute(f'DROP TABLE IF EXISTS {fts}')
+
+
+def _fts_search(model, query, offset, limit):
+    fts, _, weights = FTS_TABLES[model]
+    phrase = '"' + query.replace('"', '""') + '"'
+    rank = f"bm25({fts}, {', '.join(str(w) for w in weights)})"
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"SELECT rowid FROM {fts} WHERE {fts} MATCH %s ORDER BY {rank}, rowid LIMIT %s OFFSET %s",
+            [phrase, limit, offset],
+        )
+        ids = [row[0] for row in cursor.fetchall()]
+    found = model.objects.in_bulk(ids)
+    return [found[pk] for pk in ids if pk in found]
+
+
+def _orm_search(model, query, offset, limit):
+    _, columns, _ = FTS_TABLES[model]
+    matches = Q()
+    ranking = []
+    for position, column in enumerate(columns):
+        matches |= Q(**{f'{column}__icontains': query})
+        ranking.append(When(**{f'{column}__iexact': query}, then=Value(position)))
+        ranking.append(When(**{f'{column}__istartswith': query}, then=Value(len(columns) + position)))
+    return list(
+        model.objects.filter(matches)
+        .annotate(search_rank=Case(*ranking, default=Value(2 * len(columns)), output_field=IntegerField()))
+        .order_by('search_rank', 'id')[offset:offset + limit]
+    )
+
+
+def search(model, query, offset=0, limit=20):
+    """
+    Return up to 'limit' rows of model matching query, best matches first.
+
+    Matches are prefix or substring matches on the columns in FTS_TABLES.
+    On SQLite queries of three or more characters use the FTS5 index ranked
+    by bm25. Shorter queries and other databases use ranked icontains
+    lookups.
+    """
+    if connection.vendor == 'sqlite' and len(query) >= FTS_MIN_QUERY_LENGTH:
+        return _fts_search(model, query, offset, limit)
+    return _orm_search(model, query, offset, limit)
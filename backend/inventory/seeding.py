@@ -0,0 +1,128 @@
+import random
+from datetime import timedelta
+from decimal import Decimal
+from itertools import accumulate
+from django.db import transaction
+from django.utils import timezone
+from .cache import invalidate
+from .models import ChangeLog, Customer, DailySalesRollup, InventoryMovement, Order, OrderItem, Product
+
+SEED_BATCH_SIZE = 2000
+
+# Units per order line and how often each occurs
+LINE_QUANTITIES = (1, 2, 3, 4, 5, 10)
+LINE_QUANTITY_WEIGHTS = (50, 20, 12, 8, 6, 4)
+
+
+def _zipf_weights(count, exponent):
+    # Cumulative weights so random.choices does not re-sum them on every call
+    return list(accumulate(1 / (rank + 1) ** exponent for rank in range(count)))
+
+
+def seed_inventory(customers, products, orders, seed=0, days=365, max_items=8):
+    """
+    Generate a reproducible data set with realistic shapes.
+
+    - A few products sell far more than the rest (Zipf popularity), and
+      repeat customers place most orders.
+    - Orders have 1..max_items lines (most have one or two) with small
+      quantities. They are spread over the last 'days' days, with IDs in
+      date order.
+    - About 10% of customers are inactive and 5% of products are out of
+      stock.
+
+    Rows use unit prices and totals like real orders and are logged to the
+    change feed. The daily sales rollups are rebuilt afterwards. The same
+    seed gives the same data.
+    SKUs and emails embed the seed, so a seed can only be loaded once per
+    database.
+
+    Returns:
+        dict: Number of rows created per table.
+    """
+    rng = random.Random(seed)
+    now = timezone.now()
+
+    with transaction.atomic():
+        customer_rows = Customer.objects.bulk_create(
+            (
+                Customer(
+                    name=f'Customer {seed}-{i}',
+                    email=f'customer{seed}.{i}@example.com',
+                    phone=f'{rng.randrange(6000000000, 9999999999)}',
+                    address=f'{rng.randint(1, 999)} Market Road, Block {rng.randint(1, 40)}',
+                    isActive=rng.random() >= 0.1,
+                )
+                for i in range(customers)
+            ),
+            batch_size=SEED_BATCH_SIZE,
+        )
+        ChangeLog.objects.record(Customer, [c.pk for c in customer_rows])
+        product_rows = Product.objects.bulk_create(
+            (
+                Product(
+                    sku=f'SKU-{seed}-{i:06d}',
+                    product_name=f'Product {seed}-{i}',
+                    product_price=Decimal(f'{max(rng.lognormvariate(5.5, 1.0), 1):.2f}'),
+                    stock_quantity=0 if rng.random() < 0.05 else rng.randint(1, 500),
+                )
+                for i in range(products)
+            ),
+            batch_size=SEED_BATCH_SIZE,
+        )
+        ChangeLog.objects.record(Product, [p.pk for p in product_rows])
+        InventoryMovement.objects.record(
+            {p.pk: p.stock_quantity for p in product_rows}, InventoryMovement.Reason.OPENING,
+        )
+
+        # Popularity ranks are shuffled so busy rows are spread over the ID range
+        by_popularity = rng.sample(product_rows, len(product_rows))
+        product_weights = _zipf_weights(len(by_popularity), 1.1)
+        by_loyalty = rng.sample(customer_rows, len(customer_rows))
+        customer_weights = _zipf_weights(len(by_loyalty), 0.8)
+
+        moments = sorted(now - timedelta(seconds=rng.uniform(0, days * 86400)) for _ in range(orders))
+        item_count = 0
+        for start in range(0, orders, SEED_BATCH_SIZE):
+            batch = moments[start:start + SEED_BATCH_SIZE]
+            lines = []
+            for _ in batch:
+                size = 1
+                while size < max_items and rng.random() < 0.45:
+                    size += 1
+                picked = {p.pk: p for p in rng.choices(by_popularity, cum_weights=product_weights, k=size)}
+                lines.append([
+                    (product, rng.choices(LINE_QUANTITIES, LINE_QUANTITY_WEIGHTS)[0])
+                    for product in picked.values()
+                ])
+
+            order_rows = Order.objects.bulk_create([
+                Order(
+                    customer=rng.choices(by_loyalty, cum_weights=customer_weights)[0],
+                    total_amount=sum((p.product_price * qty for p, qty in order_lines), Decimal('0')),
+                    item_count=sum(qty for _, qty in order_lines),
+                )
+                for order_lines in lines
+            ])
+            # created_at is auto_now_add, which bulk_create always sets to now
+            for order, moment in zip(order_rows, batch):
+                order.created_at = moment
+            Order.objects.bulk_update(order_rows, ['created_at'], batch_size=500)
+
+            items = OrderItem.objects.bulk_create([
+                OrderItem(order=order, product=product, quantity=qty, unit_price=product.product_price)
+                for order, order_lines in zip(order_rows, lines)
+                for product, qty in order_lines
+            ])
+            item_count += len(items)
+            ChangeLog.objects.record(Order, [order.pk for order in order_rows])
+
+        DailySalesRollup.objects.rebuild()
+        invalidate(Product, Customer, Order)
+
+    return {
+        'customers': len(customer_rows),
+        'products': len(product_rows),
+        'orders': orders,
+        'order_items': item_count,
+    }
@@ -1,5 +1,8 @@
+from collections import defaultdict
+from decimal import Decimal
+from django.db import transaction
 from rest_framework import serializers
-from .models import Customer, Product, Order, OrderItem
+from .models import Customer, DailySalesRollup, InventoryMovement, Product, Order, OrderItem
 
 class CustomerSerializer(serializers.ModelSerializer):
     """
@@ -15,11 +18,47 @@ class ProductSerializer(serializers.ModelSerializer):
     """
     Serializer for Product model.
     Includes all fields for full CRUD support.
+    Stock set on create or changed on update is logged to the stock ledger.
     """
     class Meta:
         model = Product
         fields = '__all__'
 
+    def create(self, validated_data):
+        with transaction.atomic():
+            product = super().create(validated_data)
+            InventoryMovement.objects.record({product.pk: product.stock_quantity}, InventoryMovement.Reason.OPENING)
+        return product
+
+    def update(self, instance, validated_data):
+        if 'stock_quantity' not in validated_data:
+            return super().update(instance, validated_data)
+        products = Product.objects.filter(pk=instance.pk)
+        with InventoryMovement.objects.tracking(products, InventoryMovement.Reason.ADJUSTMENT):
+            return super().update(instance, validated_data)
+
+
+class CustomerUpsertSerializer(CustomerSerializer):
+    """
+    Customer serializer used by batch upserts.
+
+    The unique check on 'email' is dropped because an existing email
+    means "update this customer" rather than a validation error.
+    """
+    class Meta(CustomerSerializer.Meta):
+        extra_kwargs = {'email': {'validators': []}}
+
+
+class ProductUpsertSerializer(ProductSerializer):
+    """
+    Product serializer used by batch upserts.
+
+    The unique check on 'sku' is dropped because an existing SKU
+    means "update this product" rather than a validation error.
+    """
+    class Meta(ProductSerializer.Meta):
+        extra_kwargs = {'sku': {'validators': []}}
+
 
 class OrderItemSerializer(serializers.ModelSerializer):
     """
@@ -35,7 +74,19 @@ class OrderItemSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = OrderItem
-        fields = ['id', 'product', 'product_id', 'quantity']
+        fields = ['id', 'product', 'product_id', 'quantity', 'unit_price']
+        read_only_fields = ['unit_price']
+
+
+class OrderItemRefSerializer(serializers.ModelSerializer):
+    """
+    Read-only order item with the product as a plain ID, used when
+    'items.product' is not expanded.
+    """
+    class Meta:
+        model = OrderItem
+        fields = ['id', 'product', 'quantity', 'unit_price']
+        read_only_fields = fields
 
 
 class OrderSerializer(serializers.ModelSerializer):
@@ -44,6 +95,8 @@ class OrderSerializer(serializers.ModelSerializer):
 
     - Returns nested customer and items data (read-only).
     - Accepts customer ID and item list in POST requests.
+    - Reads can be narrowed through the 'fields' and 'expand' context keys
+      (see get_fields); without them the full nested output is returned.
     """
     customer = CustomerSerializer(read_only=True)
     customer_id = serializers.PrimaryKeyRelatedField(
@@ -51,39 +104,96 @@ class OrderSerializer(serializers.ModelSerializer):
     )
     items = OrderItemSerializer(source='orderitem_set', many=True)
 
+    # Values accepted by the 'fields' and 'expand' query parameters
+    readable_fields = ('id', 'customer', 'created_at', 'total_amount', 'item_count', 'items')
+    expandable = ('customer', 'items.product')
+
     class Meta:
         model = Order
-        fields = ['id', 'customer', 'customer_id', 'created_at', 'items']
+        fields = ['id', 'customer', 'customer_id', 'created_at', 'total_amount', 'item_count', 'items']
+        read_only_fields = ['total_amount', 'item_count']
+
+    def get_fields(self):
+        """
+        Apply sparse fieldsets from the serializer context.
+
+        - context['fields']: only these readable fields are returned.
+        - context['expand']: relations to nest in full. Relations that are not
+          expanded are returned as IDs ('customer' as the customer ID, each
+          item's 'product' as the product ID).
+        """
+        fields = super().get_fields()
+        only = self.context.get('fields')
+        expand = self.context.get('expand')
+        if only is None and expand is None:
+            return fields
+
+        expand = expand or ()
+        if 'customer' not in expand:
+            fields['customer'] = serializers.PrimaryKeyRelatedField(read_only=True)
+        if 'items.product' not in expand:
+            fields['items'] = OrderItemRefSerializer(source='orderitem_set', many=True, read_only=True)
+        if only is not None:
+            for name in list(fields):
+                if name in self.readable_fields and name not in only:
+                    del fields[name]
+        return fields
 
     def create(self, validated_data):
         """
         Override default create method to:
-        - Validate stock for all products first.
-        - If all stock is sufficient, create the Order and OrderItems.
+        - Reserve stock for all products with one conditional UPDATE.
+        - Create the Order with its total_amount/item_count and bulk-create
+          its OrderItems, each capturing the product's current unit_price.
+        - Log the stock taken to the stock ledger and add the order to the
+          daily sales rollups.
+
+        Everything runs in one transaction, so if any product is short the
+        whole order is rolled back and no stock is deducted.
         """
         items_data = validated_data.pop('orderitem_set')
 
-        # First, check all products have sufficient stock
+        # Merge repeated lines for the same product before reserving stock
+        products = {}
+        quantities = defaultdict(int)
         for item_data in items_data:
             product = item_data['product']
-            quantity = item_data['quantity']
-            if product.stock_quantity < quantity:
-                raise serializers.ValidationError(
-                    {"detail": f"Not enough stock for product '{product.product_name}'"}
+            products[product.pk] = product
+            quantities[product.pk] += item_data['quantity']
+
+        total_amount = sum(
+            (item_data['product'].product_price * item_data['quantity'] for item_data in items_data),
+            Decimal('0'),
+        )
+
+        with transaction.atomic():
+            if Product.objects.reserve_stock(quantities):
+                order = Order.objects.create(
+                    total_amount=total_amount,
+                    item_count=sum(quantities.values()),
+                    **validated_data
                 )
-
-        # Now create the Order, since validation passed
-        order = Order.objects.create(**validated_data)
-
-        # Deduct stock and create OrderItems
-        for item_data in items_data:
-            product = item_data['product']
-            quantity = item_data['quantity']
-
-            product.stock_quantity -= quantity
-            product.save()
-
-            OrderItem.objects.create(order=order, product=product, quantity=quantity)
-
-        return order
-
+                items = OrderItem.objects.bulk_create([
+                    OrderItem(
+                        order=order,
+                        product=item_data['product'],
+                        quantity=item_data['quantity'],
+                        unit_price=item_data['product'].product_price,
+                    )
+                    for item_data in items_data
+                ])
+                InventoryMovement.objects.record(
+                    {pk: -qty for pk, qty in quantities.items()},
+                    InventoryMovement.Reason.ORDER,
+                    order_id=order.pk,
+                )
+                DailySalesRollup.objects.add_order(order, items)
+                return order
+            transaction.set_rollback(True)
+
+        # Reservation failed; report a product whose stock is now insufficient
+        stock = dict(Product.objects.filter(pk__in=quantities).values_list('pk', 'stock_quantity'))
+        short_id = next((pk for pk, qty in quantities.items() if stock.get(pk, 0) < qty), next(iter(quantities)))
+        raise serializers.ValidationError(
+            {"detail": f"Not enough stock for product '{products[short_id].product_name}'"}
+        )
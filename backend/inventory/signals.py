@@ -0,0 +1,83 @@
+from django.db import connections
+from django.db.models.signals import post_delete, post_migrate, post_save, pre_delete
+from django.dispatch import receiver
+from .cache import invalidate
+from .events import publish_on_commit
+from .models import ChangeLog, Customer, Order, OrderItem, Product, order_deletes_logged
+from .search import install_fts
+
+
+@receiver(post_migrate)
+def restore_search_index(sender, using, **kwargs):
+    """
+    Recreate FTS triggers after migrations, since SQLite drops them
+    whenever a migration rebuilds the product or customer table.
+    """
+    if sender.name == 'inventory':
+        install_fts(connections[using], create=False)
+
+
+@receiver(post_save, sender=Product)
+@receiver(post_delete, sender=Product)
+@receiver(post_save, sender=Customer)
+@receiver(post_delete, sender=Customer)
+@receiver(post_save, sender=Order)
+@receiver(post_delete, sender=Order)
+def invalidate_cached_responses(sender, **kwargs):
+    if sender is Order and order_deletes_logged.get():
+        return
+    invalidate(sender)
+
+
+@receiver(post_save, sender=Product)
+@receiver(post_save, sender=Customer)
+@receiver(post_save, sender=Order)
+def log_change(sender, instance, **kwargs):
+    ChangeLog.objects.record(sender, [instance.pk])
+
+
+@receiver(post_delete, sender=Product)
+@receiver(post_delete, sender=Customer)
+@receiver(post_delete, sender=Order)
+def log_deletion(sender, instance, **kwargs):
+    # Also fires for orders removed by a customer delete cascade
+    if sender is Order and order_deletes_logged.get():
+        return
+    ChangeLog.objects.record(sender, [instance.pk], deleted=True)
+
+
+@receiver(pre_delete, sender=Product)
+def log_orders_losing_items(sender, instance, **kwargs):
+    # Deleting a product cascades to its order items, which changes those orders
+    order_ids = OrderItem.objects.filter(product=instance).values_list('order_id', flat=True).distinct()
+    ChangeLog.objects.record(Order, order_ids)
+    invalidate(Order)
+
+
+@receiver(post_save, sender=Product)
+def publish_stock_level(sender, instance, **kwargs):
+    publish_on_commit('stock', {
+        'id': instance.pk,
+        'sku': instance.sku,
+        'product_name': instance.product_name,
+        'stock_quantity': instance.stock_quantity,
+    }, key=instance.pk)
+
+
+@receiver(post_save, sender=Order)
+def publish_new_order(sender, instance, created, **kwargs):
+    if created:
+        publish_on_commit('order_created', {
+            'id': instance.pk,
+            'customer_id': instance.customer_id,
+            'total_amount': instance.total_amount,
+            'item_count': instance.item_count,
+            'created_at': instance.created_at,
+        }, key=instance.pk)
+
+
+@receiver(post_delete, sender=Order)
+def publish_deleted_order(sender, instance, **kwargs):
+    if order_deletes_logged.get():
+        return
+    publish_on_commit('order_deleted', {'id': instance.pk}, key=instance.pk)
@@ -0,0 +1,127 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+from django.db import connection
+from django.test import Client, TestCase, TransactionTestCase
+from django.urls import reverse
+from .models import Customer, InventoryMovement, Order, OrderItem, Product
+
+
+def make_orders(count, items_per_order=3):
+    """
+    Create count orders, each from its own customer, with items_per_order
+    items for different products.
+    """
+    products = [
+        Product.objects.create(
+            sku=f'SKU-{count}-{n}', product_name=f'Product {n}',
+            product_price=Decimal('10.00') + n, stock_quantity=100,
+        )
+        for n in range(items_per_order)
+    ]
+    orders = []
+    for n in range(count):
+        customer = Customer.objects.create(
+            name=f'Customer {n}', email=f'customer{count}-{n}@example.com',
+            phone='9999999999', address='Somewhere',
+        )
+        order = Order.objects.create(customer=customer)
+        for product in products:
+            OrderItem.objects.create(order=order, product=product, quantity=1, unit_price=product.product_price)
+        orders.append(order)
+    return orders
+
+
+class OrderQueryCountTests(TestCase):
+    """
+    The order endpoints load customers, items and products up front, so
+    their query count must not grow with the number of orders or items.
+    """
+    # Table versions (ETag), orders with their customers, items with products
+    LIST_QUERIES = 3
+    # Row timestamps (ETag), the order with its customer, items with products
+    DETAIL_QUERIES = 3
+
+    def test_order_list_with_one_order(self):
+        make_orders(1)
+        with self.assertNumQueries(self.LIST_QUERIES):
+            response = self.client.get(reverse('get_orders'))
+        self.assertEqual(len(response.json()['results']), 1)
+
+    def test_order_list_with_many_orders(self):
+        make_orders(20, items_per_order=5)
+        with self.assertNumQueries(self.LIST_QUERIES):
+            response = self.client.get(reverse('get_orders'))
+        self.assertEqual(len(response.json()['results']), 20)
+
+    def test_order_detail_with_one_item(self):
+        order, = make_orders(1, items_per_order=1)
+        with self.assertNumQueries(self.DETAIL_QUERIES):
+            response = self.client.get(reverse('get_order_by_id', args=[order.id]))
+        self.assertEqual(len(response.json()['items']), 1)
+
+    def test_order_detail_with_many_items(self):
+        order = make_orders(20, items_per_order=10)[-1]
+        with self.assertNumQueries(self.DETAIL_QUERIES):
+            response = self.client.get(reverse('get_order_by_id', args=[order.id]))
+        self.assertEqual(len(response.json()['items']), 10)
+
+
+class FastOrderListTests(TestCase):
+    def test_fast_path_matches_serializer_output(self):
+        # Items added out of product order, so an unordered prefetch that
+        # follows the (order, product) index would come back reordered
+        order, = make_orders(1)
+        products = list(Product.objects.order_by('-id'))
+        for product in products:
+            OrderItem.objects.create(order=order, product=product, quantity=2, unit_price=product.product_price)
+        make_orders(5)
+
+        serialized = self.client.get(reverse('get_orders'), {'fast': '0'})
+        fast = self.client.get(reverse('get_orders'), {'fast': '1'})
+        self.assertEqual(serialized.status_code, 200)
+        self.assertEqual(serialized.content, fast.content)
+        items = serialized.json()['results'][-1]['items']
+        self.assertEqual([item['id'] for item in items], sorted(item['id'] for item in items))
+
+
+class ConcurrentOrderTests(TransactionTestCase):
+    """
+    Orders placed in parallel against limited stock: stock never goes
+    negative, every accepted order is stored with its ledger movement, and
+    every other order is refused.
+    """
+    STOCK = 50
+    ORDERS = 80
+    THREADS = 16
+
+    def test_parallel_orders_never_oversell(self):
+        product = Product.objects.create(
+            sku='SKU-LIMITED', product_name='Limited', product_price=Decimal('5.00'), stock_quantity=self.STOCK,
+        )
+        customer = Customer.objects.create(
+            name='Customer', email='customer@example.com', phone='9999999999', address='Somewhere',
+        )
+        payload = {'customer_id': customer.id, 'items': [{'product_id': product.id, 'quantity': 1}]}
+        start = threading.Barrier(self.THREADS, timeout=30)
+
+        def place_order(n):
+            if n < self.THREADS:
+                start.wait()  # let the first wave race each other
+            try:
+                return Client().post(reverse('create_order'), payload, content_type='application/json').status_code
+            finally:
+                connection.close()
+
+        with ThreadPoolExecutor(max_workers=self.THREADS) as pool:
+            statuses = list(pool.map(place_order, range(self.ORDERS)))
+
+        self.assertEqual(statuses.count(201), self.STOCK)
+        self.assertEqual(statuses.count(400), self.ORDERS - self.STOCK)
+        product.refresh_from_db()
+        self.assertEqual(product.stock_quantity, 0)
+        self.assertEqual(Order.objects.count(), self.STOCK)
+        self.assertEqual(OrderItem.objects.filter(product=product).count(), self.STOCK)
+        movements = InventoryMovement.objects.filter(product=product, reason=InventoryMovement.Reason.ORDER)
+        self.assertEqual(movements.count(), self.STOCK)
+        self.assertEqual(sum(movements.values_list('delta', flat=True)), -self.STOCK)
@@ -7,6 +7,15 @@ from .views import ProductViews
 from .views import OrderViews
 from .views import AdminView
 from .views import CsrfView
+from .views import DashboardViews
+from .views import ExportViews
+from .views import CacheViews
+from .views import ReportViews
+from .views import AsyncViews
+from .views import MetricsViews
+from .views import ChangeViews
+from .views import EventViews
+from .views import JobViews
 
 urlpatterns = [
     
@@ -17,25 +26,69 @@ urlpatterns = [
     # Customer End-points
     path('customer/', CustomerViews.get_customers, name='get_customers'),
     path('customer/active/', CustomerViews.get_active_customers, name='get_active_customers'),
+    path('customer/search/', CustomerViews.search_customers, name='search_customers'),
     path('customer/create/', CustomerViews.create_customer, name='create_customer'),
     path('customer/update/', CustomerViews.update_customer, name='update_customer'),
     path('customer/delete/', CustomerViews.delete_customer, name='delete_customer'),
+    path('customer/batch/', CustomerViews.customer_batch, name='customer_batch'),
     path('customer/<int:id>', CustomerViews.get_customers, name='get_customer_by_id'),
 
 
     # Product End-points
     path('product/', ProductViews.get_products, name='get_products'),
+    path('product/search/', ProductViews.search_products, name='search_products'),
     path('product/create/', ProductViews.create_product, name='create_product'),
     path('product/update/', ProductViews.update_product, name='update_product'),
     path('product/delete/', ProductViews.delete_product, name='delete_product'),
+    path('product/batch/', ProductViews.product_batch, name='product_batch'),
+    path('product/import/', ProductViews.import_products, name='import_products'),
     path('product/<int:id>', ProductViews.get_products, name='get_product_by_id'),
 
     # Order Routes
     path('order/', OrderViews.get_orders, name='get_orders'),
     path('order/create/', OrderViews.create_order, name="create_order"),
     path('order/delete/', OrderViews.delete_order, name="delete_order"),
+    path('order/delete/batch/', OrderViews.delete_orders_batch, name="delete_orders_batch"),
+    path('order/export/', ExportViews.export_orders, name="export_orders"),
     path('order/<int:id>/', OrderViews.get_order, name="get_order_by_id"),
+
+    # Dashboard Routes
+    path('dashboard/summary/', DashboardViews.get_dashboard_summary, name="get_dashboard_summary"),
+
+    # Async Read Routes (for ASGI deployments)
+    path('async/customer/', AsyncViews.get_customers, name='async_get_customers'),
+    path('async/customer/active/', AsyncViews.get_active_customers, name='async_get_active_customers'),
+    path('async/customer/<int:id>', AsyncViews.get_customers, name='async_get_customer_by_id'),
+    path('async/product/', AsyncViews.get_products, name='async_get_products'),
+    path('async/product/<int:id>', AsyncViews.get_products, name='async_get_product_by_id'),
+    path('async/order/', AsyncViews.get_orders, name='async_get_orders'),
+    path('async/order/<int:id>/', AsyncViews.get_order, name='async_get_order_by_id'),
+
+    # Report Routes
+    path('reports/sales/', ReportViews.get_sales_report, name="get_sales_report"),
+    path('reports/sales/rebuild/', ReportViews.rebuild_sales_report, name="rebuild_sales_report"),
+    path('reports/stock/', ReportViews.get_stock_report, name="get_stock_report"),
+
+    # Background Jobs
+    path('jobs/', JobViews.get_jobs, name="get_jobs"),
+    path('jobs/<int:id>/', JobViews.get_job, name="get_job"),
+    path('jobs/<int:id>/cancel/', JobViews.cancel, name="cancel_job"),
+    path('jobs/<int:id>/retry/', JobViews.retry, name="retry_job"),
+    path('jobs/<int:id>/download/', JobViews.download_file, name="download_job_file"),
     
+    # Cache Stats
+    path('cache/stats/', CacheViews.get_cache_stats, name="get_cache_stats"),
+
+    # Change Feed (delta sync)
+    path('changes/', ChangeViews.get_changes, name="get_changes"),
+
+    # Live Events (Server-Sent Events, ASGI)
+    path('events/', EventViews.stream_events, name="stream_events"),
+    path('events/status/', EventViews.get_event_status, name="get_event_status"),
+
+    # Request Metrics (Prometheus)
+    path('metrics/', MetricsViews.get_metrics, name="get_metrics"),
+
     # Admin Login
     path('admin-login/', AdminView.admin_login, name='admin_login'),
     
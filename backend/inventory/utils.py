@@ -0,0 +1,36 @@
+from datetime import datetime, time
+from decimal import Decimal
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+
+def parse_moment(value):
+    """
+    Parse an ISO date or datetime string into an aware datetime.
+
+    A bare date is taken as midnight. Naive values are interpreted in the
+    current time zone.
+
+    Returns:
+        datetime or None if the value cannot be parsed.
+    """
+    try:
+        moment = parse_datetime(str(value))
+        if moment is None:
+            day = parse_date(str(value))
+            if day is None:
+                return None
+            moment = datetime.combine(day, time.min)
+    except ValueError:
+        return None
+    if timezone.is_naive(moment):
+        moment = timezone.make_aware(moment)
+    return moment
+
+
+def format_money(value):
+    """
+    Render an amount like the API's other money fields: a decimal string
+    with two places. DRF would send a bare Decimal as a JSON float.
+    """
+    return str(Decimal(value).quantize(Decimal('0.01')))
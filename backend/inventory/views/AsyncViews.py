@@ -0,0 +1,123 @@
+from django.views.decorators.http import require_GET
+from rest_framework import status
+from ..fast_serializers import (
+    FAST_CUSTOMER, FAST_PRODUCT, ORDER_FAST_FIELDS, datetime_formatter, fast_order_rows, order_item_rows,
+)
+from ..pagination import AsyncKeysetPagination
+from ..models import Customer, Order, Product
+from ..renderers import json_response
+
+# Async read endpoints for ASGI deployments (see backend/asgi.py). They use
+# the async ORM and the '.values()' fast serializers, so a worker can serve
+# other requests while these wait on the database. Output matches the
+# synchronous endpoints, except that lists page forward with '?after=<id>'.
+# ETag and response caching only apply to the synchronous endpoints. DRF
+# views cannot be async, so responses are rendered with json_response.
+
+
+async def _list(request, rows, convert, newest_first=False):
+    try:
+        page = await AsyncKeysetPagination(newest_first).get_page(request, rows)
+    except ValueError:
+        return json_response({'error': "'after' must be an integer ID"}, status=status.HTTP_400_BAD_REQUEST)
+    page['results'] = await convert(page['results'])
+    return json_response(page)
+
+
+async def _products(rows):
+    return FAST_PRODUCT.convert_many(rows)
+
+
+async def _customers(rows):
+    return FAST_CUSTOMER.convert_many(rows)
+
+
+async def _orders(rows):
+    items = [item async for item in order_item_rows(row['id'] for row in rows)]
+    return fast_order_rows(rows, items)
+
+
+async def _detail(model, serializer, id):
+    row = await model.objects.filter(id=id).values(*serializer.lookups).afirst()
+    if row is None:
+        name = model._meta.verbose_name.capitalize()
+        return json_response({'error': f"{name} with ID {id} does not exist"}, status=status.HTTP_404_NOT_FOUND)
+    return json_response(serializer.convert(row, datetime_formatter()))
+
+
+@require_GET
+async def get_products(request, id=None):
+    """
+    Async variant of ProductViews.get_products.
+
+    Query Params:
+        - after / page_size (optional): List paging, see AsyncKeysetPagination.
+
+    Returns:
+        - 200 OK with a product, or a page of products ('results', 'next',
+          'previous') when no ID is given.
+        - 400 Bad Request if 'after' is not an integer.
+        - 404 Not Found if product with given ID does not exist.
+    """
+    if id:
+        return await _detail(Product, FAST_PRODUCT, id)
+    return await _list(request, Product.objects.values(*FAST_PRODUCT.lookups), _products)
+
+
+@require_GET
+async def get_customers(request, id=None):
+    """
+    Async variant of CustomerViews.get_customers.
+
+    Query Params:
+        - after / page_size (optional): List paging, see AsyncKeysetPagination.
+
+    Returns:
+        - 200 OK with a customer, or a page of customers when no ID is given.
+        - 400 Bad Request if 'after' is not an integer.
+        - 404 Not Found if customer with given ID does not exist.
+    """
+    if id:
+        return await _detail(Customer, FAST_CUSTOMER, id)
+    return await _list(request, Customer.objects.values(*FAST_CUSTOMER.lookups), _customers)
+
+
+@require_GET
+async def get_active_customers(request):
+    """
+    Async variant of CustomerViews.get_active_customers.
+
+    Returns:
+        - 200 OK with the number of active customers.
+    """
+    return json_response(await Customer.objects.filter(isActive=True).acount())
+
+
+@require_GET
+async def get_orders(request):
+    """
+    Async variant of OrderViews.get_orders (full nested orders, newest first).
+
+    Query Params:
+        - after / page_size (optional): List paging, see AsyncKeysetPagination.
+
+    Returns:
+        - 200 OK with 'results', 'next' and 'previous'.
+        - 400 Bad Request if 'after' is not an integer.
+    """
+    return await _list(request, Order.objects.values(*ORDER_FAST_FIELDS), _orders, newest_first=True)
+
+
+@require_GET
+async def get_order(request, id):
+    """
+    Async variant of OrderViews.get_order.
+
+    Returns:
+        - 200 OK with the full nested order.
+        - 404 Not Found if order with given ID does not exist.
+    """
+    row = await Order.objects.filter(id=id).values(*ORDER_FAST_FIELDS).afirst()
+    if row is None:
+        return json_response({'error': 'Order not found'}, status=status.HTTP_404_NOT_FOUND)
+    return json_response((await _orders([row]))[0])
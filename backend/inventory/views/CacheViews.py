@@ -0,0 +1,14 @@
+from rest_framework.decorators import api_view
+from rest_framework.response import Response
+from rest_framework import status
+from ..cache import get_stats
+
+@api_view(['GET'])
+def get_cache_stats(request):
+    """
+    Return read-through cache hit/miss counters per cached resource.
+
+    Returns:
+        - 200 OK with hits, misses and hit ratio for products and customers.
+    """
+    return Response(get_stats(), status=status.HTTP_200_OK)
@@ -0,0 +1,96 @@
+from datetime import timedelta
+from django.conf import settings
+from django.utils import timezone
+from rest_framework.decorators import api_view
+from rest_framework.response import Response
+from rest_framework import status
+from ..fast_serializers import FAST_CUSTOMER, FAST_PRODUCT, ORDER_FAST_FIELDS, fast_order_rows
+from ..models import ChangeLog, Customer, Order, Product
+
+DEFAULT_CHANGES_LIMIT = 500
+MAX_CHANGES_LIMIT = 5000
+
+def _products(ids):
+    return FAST_PRODUCT.convert_many(Product.objects.filter(pk__in=ids).values(*FAST_PRODUCT.lookups))
+
+def _customers(ids):
+    return FAST_CUSTOMER.convert_many(Customer.objects.filter(pk__in=ids).values(*FAST_CUSTOMER.lookups))
+
+def _orders(ids):
+    return fast_order_rows(list(Order.objects.filter(pk__in=ids).values(*ORDER_FAST_FIELDS)))
+
+# resource -> function loading the current rows for a list of IDs
+CHANGE_RESOURCES = {
+    'product': _products,
+    'customer': _customers,
+    'order': _orders,
+}
+
+def _int_param(request, name, default):
+    try:
+        value = int(request.query_params.get(name, default))
+    except ValueError:
+        return None
+    return value if value >= 0 else None
+
+@api_view(['GET'])
+def get_changes(request):
+    """
+    Return the products, customers and orders that changed after a change
+    token, so a client can keep a local copy in sync by downloading only
+    what changed.
+
+    Start with since=0 (a full snapshot, paged), then pass the returned
+    'next' token on each later call. Repeat while 'more' is true.
+
+    Query Params:
+        - since (optional): Change token from a previous response. Default 0.
+        - resources (optional): Comma-separated subset of 'product',
+          'customer', 'order'. Default all.
+        - limit (optional): Max change log entries read per call (default
+          500, max 5000).
+
+    Returns:
+        - 200 OK with 'next', 'more' and, per resource, 'updated' (current
+          rows, shaped like the list endpoints) and 'deleted' (IDs).
+          Order rows embed their customer and products as they are now.
+        - 400 Bad Request for an invalid token, resource or limit.
+    """
+    since = _int_param(request, 'since', 0)
+    limit = _int_param(request, 'limit', DEFAULT_CHANGES_LIMIT)
+    if since is None or not limit:
+        return Response({'error': 'since and limit must be non-negative integers'}, status=status.HTTP_400_BAD_REQUEST)
+    limit = min(limit, MAX_CHANGES_LIMIT)
+
+    resources = list(CHANGE_RESOURCES)
+    if request.query_params.get('resources'):
+        resources = [name.strip() for name in request.query_params['resources'].split(',') if name.strip()]
+        unknown = [name for name in resources if name not in CHANGE_RESOURCES]
+        if unknown:
+            return Response(
+                {'error': f"Unknown resources: {', '.join(unknown)}. Choose from: {', '.join(CHANGE_RESOURCES)}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+    entries = ChangeLog.objects.filter(id__gt=since, resource__in=resources)
+    settle = getattr(settings, 'INVENTORY_CHANGES_SETTLE_SECONDS', 0)
+    if settle:
+        entries = entries.filter(created_at__lte=timezone.now() - timedelta(seconds=settle))
+    entries = list(entries.order_by('id').values_list('id', 'resource', 'object_id', 'deleted')[:limit + 1])
+    more = len(entries) > limit
+    entries = entries[:limit]
+
+    # Only the latest entry per row matters
+    latest = {resource: {} for resource in resources}
+    for _, resource, object_id, deleted in entries:
+        latest[resource][object_id] = deleted
+
+    data = {'since': since, 'next': entries[-1][0] if entries else since, 'more': more}
+    for resource in resources:
+        changed = [pk for pk, deleted in latest[resource].items() if not deleted]
+        updated = CHANGE_RESOURCES[resource](changed) if changed else []
+        # Rows deleted after their entry was logged show up as deletes now
+        found = {row['id'] for row in updated}
+        deleted = [pk for pk, deleted in latest[resource].items() if deleted or pk not in found]
+        data[resource] = {'updated': updated, 'deleted': deleted}
+    return Response(data, status=status.HTTP_200_OK)
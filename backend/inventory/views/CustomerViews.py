@@ -1,19 +1,36 @@
+from django.db import transaction
 from rest_framework.decorators import api_view
 from rest_framework.response import Response
 from rest_framework import status
+from ..conditional import conditional_get
 from ..models import Customer
-from ..serializers import CustomerSerializer
+from ..serializers import CustomerSerializer, CustomerUpsertSerializer
+from ..batch import batch_response
+from ..pagination import IdCursorPagination, SearchPagination
+from ..search import search
+from ..cache import cached_response
+from ..fast_serializers import FAST_CUSTOMER, use_fast_path
+from ..jobs import CUSTOMER_DELETE_INLINE_ORDERS, enqueue, job_accepted, wants_background
+from ..idempotency import idempotent
 
+@conditional_get(Customer)
 @api_view(['GET'])
+@cached_response('customer')
 def get_customers(request, id=None):
     """
-    Retrieve a single customer by ID or return all customers.
+    Retrieve a single customer by ID or return a page of customers.
 
     Args:
         id (int, optional): Customer ID (passed via URL or query).
 
+    Query Params:
+        - cursor / page_size (optional): List paging, see IdCursorPagination.
+        - fast (optional): '1' to build list rows from '.values()' instead of
+          the serializer (same output, less CPU).
+
     Returns:
-        - 200 OK with serialized customer(s) data.
+        - 200 OK with serialized customer data, or a cursor page of customers
+          ('results', 'next', 'previous') when no ID is given.
         - 404 Not Found if customer with given ID does not exist.
     """
     if id:
@@ -27,26 +44,57 @@ def get_customers(request, id=None):
                 status=status.HTTP_404_NOT_FOUND
             )
     else:
-        customers = Customer.objects.all()
-        serializer = CustomerSerializer(customers, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        paginator = IdCursorPagination()
+        if use_fast_path(request):
+            page = paginator.paginate_queryset(Customer.objects.values(*FAST_CUSTOMER.lookups), request)
+            return paginator.get_paginated_response(FAST_CUSTOMER.convert_many(page))
+        page = paginator.paginate_queryset(Customer.objects.all(), request)
+        serializer = CustomerSerializer(page, many=True)
+        return paginator.get_paginated_response(serializer.data)
     
+@api_view(['GET'])
+def search_customers(request):
+    """
+    Search customers by prefix or substring of 'name', 'email' or 'phone'.
+
+    Query Params:
+        - q: Search text.
+        - page / page_size (optional): Result page, best matches first.
+
+    Returns:
+        - 200 OK with ranked 'results' and 'next'/'previous' page links.
+        - 400 Bad Request if 'q' is missing.
+    """
+    query = request.query_params.get('q', '').strip()
+    if not query:
+        return Response({'error': "Search text 'q' is required"}, status=status.HTTP_400_BAD_REQUEST)
+
+    return SearchPagination().get_response(
+        request,
+        lambda offset, limit: search(Customer, query, offset, limit),
+        CustomerSerializer,
+    )
+
 @api_view(['GET'])
 def get_active_customers(request):
     active_count = Customer.objects.filter(isActive=True).count()
     return Response(active_count, status=status.HTTP_200_OK)
 
 @api_view(['POST'])
+@idempotent
 def create_customer(request):
     """
     Create a new customer using the provided request data.
 
     Expects:
         JSON body with required customer fields.
+        Optional 'Idempotency-Key' header (see idempotency.py).
 
     Returns:
         - 201 Created on success with serialized customer data.
         - 400 Bad Request if data validation fails.
+        - 409 Conflict / 422 Unprocessable Entity for an Idempotency-Key
+          still in use or reused with a different request.
     """
     serializer = CustomerSerializer(data=request.data)
     if serializer.is_valid():
@@ -97,13 +145,21 @@ def update_customer(request):
 @api_view(['DELETE'])
 def delete_customer(request):
     """
-    Delete a customer by ID.
+    Delete a customer by ID, together with their orders.
+
+    Customers with many orders are deleted by a background job, in chunks,
+    instead of in one long transaction.
 
     Expects:
         - JSON body containing the 'id' of the customer to delete.
 
+    Query Params:
+        - background (optional): '1' to always use a background job.
+
     Returns:
         - 204 No Content on successful deletion.
+        - 202 Accepted with the job ID if the customer has more than 1000
+          orders or background mode was requested.
         - 400 Bad Request if ID is missing.
         - 404 Not Found if customer does not exist.
     """
@@ -116,5 +172,28 @@ def delete_customer(request):
     except Customer.DoesNotExist:
         return Response({'error': 'Customer not found'}, status=status.HTTP_404_NOT_FOUND)
 
-    customer.delete()
+    if wants_background(request) or customer.order_set.count() > CUSTOMER_DELETE_INLINE_ORDERS:
+        return job_accepted(request, enqueue('delete_customer', customer_id=customer.pk))
+
+    with transaction.atomic():
+        # Same path as the job, so the orders also leave the sales rollups
+        customer.order_set.delete_in_chunks()
+        customer.delete()
     return Response({'message': 'Customer deleted successfully'}, status=status.HTTP_204_NO_CONTENT)
+
+@api_view(['POST', 'DELETE'])
+def customer_batch(request):
+    """
+    Upsert or delete many customers in one request, keyed on 'email'.
+
+    Expects:
+        - POST: JSON array of customer objects. Existing 'email' values are
+          updated, new ones are created.
+        - DELETE: JSON body with 'emails', a list of values to delete.
+
+    Returns:
+        - 200 OK with a per-row result ('created', 'updated', 'skipped',
+          'error', 'deleted' or 'not_found') and a count per status.
+        - 400 Bad Request if the body is malformed or too large.
+    """
+    return batch_response(request, CustomerUpsertSerializer, 'email', 'emails')
@@ -0,0 +1,85 @@
+from django.db.models import Count, DecimalField, Q, Sum
+from django.db.models.functions import Coalesce
+from rest_framework.decorators import api_view
+from rest_framework.response import Response
+from rest_framework import status
+from ..models import Customer, Product, Order, OrderItem
+from ..utils import format_money
+
+DEFAULT_LOW_STOCK_THRESHOLD = 5
+TOP_SELLING_LIMIT = 5
+STOCK_DETAIL_LIMIT = 20
+
+@api_view(['GET'])
+def get_dashboard_summary(request):
+    """
+    Return the admin dashboard figures computed with database aggregates.
+
+    Query Params:
+        - low_stock_threshold (optional): Products with 0 < stock <= threshold
+          count as low stock. Defaults to 5.
+
+    Returns:
+        - 200 OK with customer, order, revenue and stock figures, plus the top
+          selling products and a bounded list of low/out-of-stock products.
+        - 400 Bad Request if the threshold is not a non-negative integer.
+    """
+    try:
+        threshold = int(request.query_params.get('low_stock_threshold', DEFAULT_LOW_STOCK_THRESHOLD))
+    except (TypeError, ValueError):
+        threshold = -1
+    if threshold < 0:
+        return Response(
+            {'error': 'low_stock_threshold must be a non-negative integer'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    low_stock = Q(stock_quantity__gt=0, stock_quantity__lte=threshold)
+    out_of_stock = Q(stock_quantity=0)
+
+    # Both sets lie within stock_quantity <= threshold, so only that index range is read
+    stock_counts = Product.objects.filter(stock_quantity__lte=threshold).aggregate(
+        low_stock_count=Count('id', filter=low_stock),
+        out_of_stock_count=Count('id', filter=out_of_stock),
+    )
+
+    # Totals are stored on each order at creation, so revenue is a single-column sum
+    sales = Order.objects.aggregate(
+        net_sales=Coalesce(Sum('total_amount'), 0, output_field=DecimalField(max_digits=14, decimal_places=2)),
+        units_sold=Coalesce(Sum('item_count'), 0),
+    )
+
+    top_selling = (
+        OrderItem.objects
+        .values('product_id', 'product__product_name')
+        .annotate(total_sold=Sum('quantity'))
+        .order_by('-total_sold', 'product_id')[:TOP_SELLING_LIMIT]
+    )
+
+    stock_fields = ('id', 'sku', 'product_name', 'stock_quantity')
+
+    return Response({
+        'active_customers': Customer.objects.filter(isActive=True).count(),
+        'total_orders': Order.objects.count(),
+        'net_sales': format_money(sales['net_sales']),
+        'units_sold': sales['units_sold'],
+        'low_stock_threshold': threshold,
+        'low_stock_count': stock_counts['low_stock_count'],
+        'out_of_stock_count': stock_counts['out_of_stock_count'],
+        'top_selling_products': [
+            {
+                'product_id': row['product_id'],
+                'product_name': row['product__product_name'],
+                'total_sold': row['total_sold'],
+            }
+            for row in top_selling
+        ],
+        'low_stock_products': list(
+            Product.objects.filter(low_stock).order_by('stock_quantity', 'id')
+            .values(*stock_fields)[:STOCK_DETAIL_LIMIT]
+        ),
+        'out_of_stock_products': list(
+            Product.objects.filter(out_of_stock).order_by('id')
+            .values(*stock_fields)[:STOCK_DETAIL_LIMIT]
+        ),
+    }, status=status.HTTP_200_OK)
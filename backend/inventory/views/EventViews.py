@@ -0,0 +1,94 @@
+import asyncio
+from django.core.handlers.asgi import ASGIRequest
+from django.http import StreamingHttpResponse
+from django.views.decorators.http import require_GET
+from rest_framework.decorators import api_view
+from rest_framework.response import Response
+from rest_framework import status
+from ..events import BROKER, COALESCE_SECONDS, HEARTBEAT_SECONDS, RETRY_MILLISECONDS
+from ..renderers import json_response
+
+
+def _can_stream(request):
+    # Only ASGI serves the stream as it is produced. WSGI (runserver included)
+    # would read the endless iterator to the end, holding a thread forever
+    # without sending a byte.
+    return isinstance(request, ASGIRequest)
+
+
+def _last_event_id(request):
+    # EventSource resends the header on reconnect; the query param lets
+    # clients resume after a page reload
+    value = request.headers.get('Last-Event-ID') or request.GET.get('last_event_id')
+    try:
+        return int(value) if value else None
+    except ValueError:
+        return 0  # unknown ID: the client gets a reset
+
+
+async def _stream(last_event_id):
+    # Subscribe on first iteration, on the loop that serves the stream
+    subscription, replay_ok = BROKER.subscribe(last_event_id)
+    try:
+        yield f'retry: {RETRY_MILLISECONDS}\n\n'
+        if not replay_ok:
+            yield 'event: reset\ndata: {}\n\n'
+        while True:
+            if not await subscription.wait(HEARTBEAT_SECONDS):
+                yield ': heartbeat\n\n'
+                continue
+            await asyncio.sleep(COALESCE_SECONDS)
+            events, overflowed = subscription.drain()
+            if overflowed:
+                # Too far behind: a single reset replaces the dropped events
+                yield 'event: reset\ndata: {}\n\n'
+            else:
+                yield ''.join(event.encode() for event in events)
+    finally:
+        BROKER.unsubscribe(subscription)
+
+
+@require_GET
+async def stream_events(request):
+    """
+    Server-Sent Events stream of live stock and order changes.
+
+    Events (JSON 'data', with an 'id' usable as Last-Event-ID):
+        - stock: {id, sku, product_name, stock_quantity} after order
+          create/delete and product create/update. Within a burst only the
+          latest level per product is sent.
+        - order_created: {id, customer_id, total_amount, item_count, created_at}.
+        - order_deleted: {id}.
+        - reset: events were missed (replay no longer possible or the client
+          fell behind); refetch current state.
+
+    Query Params:
+        - last_event_id (optional): Resume after this event, like the
+          Last-Event-ID header.
+
+    Returns:
+        - 200 OK with a text/event-stream response that stays open. A
+          heartbeat comment is sent every 15 seconds while idle.
+        - 501 Not Implemented when the server is not running under ASGI.
+    """
+    if not _can_stream(request):
+        return json_response(
+            {'error': 'Live events need the ASGI server (see backend/asgi.py)'},
+            status=status.HTTP_501_NOT_IMPLEMENTED,
+        )
+    response = StreamingHttpResponse(_stream(_last_event_id(request)), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'  # stop nginx from buffering the stream
+    return response
+
+
+@api_view(['GET'])
+def get_event_status(request):
+    """
+    Report whether this server can stream live events, so clients open the
+    events/ stream only when it will work.
+
+    Returns:
+        - 200 OK with 'streaming' (bool).
+    """
+    return Response({'streaming': _can_stream(request._request)}, status=status.HTTP_200_OK)
@@ -0,0 +1,114 @@
+from django.http import FileResponse
+from rest_framework.decorators import api_view
+from rest_framework.response import Response
+from rest_framework import status
+from ..jobs import cancel_job, job_data, job_files_dir, retry_job
+from ..models import Job
+
+JOB_LIST_LIMIT = 100
+
+def _get_job(id):
+    try:
+        return Job.objects.get(pk=id)
+    except Job.DoesNotExist:
+        return None
+
+@api_view(['GET'])
+def get_jobs(request):
+    """
+    List the most recent background jobs, newest first.
+
+    Query Params:
+        - status (optional): Only jobs in this status.
+        - kind (optional): Only jobs of this kind.
+
+    Returns:
+        - 200 OK with up to 100 jobs.
+        - 400 Bad Request for an unknown status.
+    """
+    jobs = Job.objects.defer('error').order_by('-id')
+    if request.query_params.get('status'):
+        if request.query_params['status'] not in Job.Status.values:
+            return Response(
+                {'error': f"status must be one of: {', '.join(Job.Status.values)}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        jobs = jobs.filter(status=request.query_params['status'])
+    if request.query_params.get('kind'):
+        jobs = jobs.filter(kind=request.query_params['kind'])
+    return Response([job_data(job, request) for job in jobs[:JOB_LIST_LIMIT]], status=status.HTTP_200_OK)
+
+@api_view(['GET'])
+def get_job(request, id):
+    """
+    Return a background job's status, progress and, once finished, its
+    result or error.
+
+    Returns:
+        - 200 OK with the job. Succeeded jobs that wrote a file include a
+          'download_url'.
+        - 404 Not Found if the job does not exist.
+    """
+    job = _get_job(id)
+    if job is None:
+        return Response({'error': 'Job not found'}, status=status.HTTP_404_NOT_FOUND)
+    return Response(job_data(job, request), status=status.HTTP_200_OK)
+
+@api_view(['POST'])
+def cancel(request, id):
+    """
+    Cancel a job. Queued jobs are cancelled at once; running jobs stop at
+    their next progress report.
+
+    Returns:
+        - 202 Accepted with the job.
+        - 404 Not Found if the job does not exist.
+        - 409 Conflict if the job has already finished.
+    """
+    job = _get_job(id)
+    if job is None:
+        return Response({'error': 'Job not found'}, status=status.HTTP_404_NOT_FOUND)
+    if not cancel_job(job):
+        return Response({'error': f'Job is already {job.status}'}, status=status.HTTP_409_CONFLICT)
+    job.refresh_from_db()
+    return Response(job_data(job, request), status=status.HTTP_202_ACCEPTED)
+
+@api_view(['POST'])
+def retry(request, id):
+    """
+    Queue a failed or cancelled job again.
+
+    Returns:
+        - 202 Accepted with the job.
+        - 404 Not Found if the job does not exist.
+        - 409 Conflict if the job is not failed or cancelled.
+    """
+    job = _get_job(id)
+    if job is None:
+        return Response({'error': 'Job not found'}, status=status.HTTP_404_NOT_FOUND)
+    if not retry_job(job):
+        return Response({'error': f'Only failed or cancelled jobs can be retried, job is {job.status}'}, status=status.HTTP_409_CONFLICT)
+    job.refresh_from_db()
+    return Response(job_data(job, request), status=status.HTTP_202_ACCEPTED)
+
+@api_view(['GET'])
+def download_file(request, id):
+    """
+    Download the file written by a succeeded job (e.g. an order export).
+
+    Returns:
+        - 200 OK with the file as an attachment.
+        - 404 Not Found if the job does not exist or has no file.
+    """
+    job = _get_job(id)
+    if job is None or job.status != Job.Status.SUCCEEDED or not (job.result or {}).get('file'):
+        return Response({'error': 'No file for this job'}, status=status.HTTP_404_NOT_FOUND)
+    path = job_files_dir() / job.result['file']
+    if not path.exists():
+        return Response({'error': 'No file for this job'}, status=status.HTTP_404_NOT_FOUND)
+    return FileResponse(
+        open(path, 'rb'),
+        as_attachment=True,
+        filename=path.name,
+        content_type=job.result.get('content_type'),
+    )
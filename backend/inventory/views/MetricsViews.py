@@ -0,0 +1,15 @@
+from django.http import HttpResponse
+from rest_framework.decorators import api_view
+from ..instrumentation import REGISTRY
+
+@api_view(['GET'])
+def get_metrics(request):
+    """
+    Return the sampled request metrics of this worker process in the
+    Prometheus text format.
+
+    Returns:
+        - 200 OK with request counters and latency, DB, render and size
+          histograms per route (empty while sampling is off).
+    """
+    return HttpResponse(REGISTRY.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
@@ -1,21 +1,83 @@
 from rest_framework.decorators import api_view
 from rest_framework.response import Response
-from rest_framework import status
+from rest_framework import serializers, status
+from ..conditional import conditional_get
 from ..serializers import OrderSerializer
-from ..models import Order, Product, OrderItem
+from ..pagination import RecentFirstCursorPagination
+from ..fast_serializers import ORDER_FAST_FIELDS, fast_order_rows, use_fast_path
+from ..models import Order
+from ..utils import parse_moment
+from ..idempotency import idempotent
+from ..jobs import ORDER_DELETE_INLINE_LIMIT, enqueue, job_accepted, wants_background
+
+def _sparse_options(request):
+    """
+    Read the 'fields' and 'expand' query parameters.
+
+    Returns:
+        (fields, expand) as tuples, or (None, None) when neither is given.
 
+    Raises:
+        ValidationError (400) for unknown names.
+    """
+    fields = request.query_params.get('fields')
+    expand = request.query_params.get('expand')
+    if fields is None and expand is None:
+        return None, None
+
+    options = {}
+    for param, value, allowed in (
+        ('fields', fields, OrderSerializer.readable_fields),
+        ('expand', expand, OrderSerializer.expandable),
+    ):
+        if value is None:
+            options[param] = allowed if param == 'fields' else ()
+            continue
+        names = tuple(name.strip() for name in value.split(',') if name.strip())
+        unknown = [name for name in names if name not in allowed]
+        if unknown:
+            raise serializers.ValidationError(
+                {param: f"Unknown value(s): {', '.join(unknown)}. Allowed: {', '.join(allowed)}"}
+            )
+        options[param] = names
+    return options['fields'], options['expand']
+
+@conditional_get(Order)
 @api_view(['GET'])
 def get_orders(request):
     """
-    Retrieve all orders from the database.
+    Retrieve a page of orders, newest first.
+
+    Query Params:
+        - cursor (optional): Opaque cursor taken from a previous 'next' link.
+        - page_size (optional): Number of orders per page (server-side capped).
+        - fields (optional): Comma-separated order fields to return
+          (id, customer, created_at, total_amount, item_count, items).
+        - expand (optional): Comma-separated relations to nest in full
+          (customer, items.product). Once 'fields' or 'expand' is given, any
+          relation not expanded is returned as an ID. Without either, the
+          full nested order is returned.
+        - fast (optional): '1' to build full rows from '.values()' instead of
+          OrderSerializer (same output, less CPU).
 
     Returns:
-        - 200 OK with a list of all serialized orders.
+        - 200 OK with 'results', 'next' and 'previous'.
+        - 400 Bad Request for unknown 'fields' or 'expand' values.
     """
-    orders = Order.objects.all()
-    serializer = OrderSerializer(orders, many=True)
-    return Response(serializer.data, status=status.HTTP_200_OK)
-
+    fields, expand = _sparse_options(request)
+    paginator = RecentFirstCursorPagination()
+    if fields is not None:
+        page = paginator.paginate_queryset(Order.objects.for_response(fields, expand), request)
+        serializer = OrderSerializer(page, many=True, context={'fields': fields, 'expand': expand})
+        return paginator.get_paginated_response(serializer.data)
+    if use_fast_path(request):
+        page = paginator.paginate_queryset(Order.objects.values(*ORDER_FAST_FIELDS), request)
+        return paginator.get_paginated_response(fast_order_rows(page))
+    page = paginator.paginate_queryset(Order.objects.with_details(), request)
+    serializer = OrderSerializer(page, many=True)
+    return paginator.get_paginated_response(serializer.data)
+
+@conditional_get(Order)
 @api_view(['GET'])
 def get_order(request, id):
     """
@@ -24,29 +86,43 @@ def get_order(request, id):
     Args:
         id (int): Order ID passed in the URL.
 
+    Query Params:
+        - fields / expand (optional): Same as for the order list.
+
     Returns:
         - 200 OK with serialized order data.
+        - 400 Bad Request for unknown 'fields' or 'expand' values.
         - 404 Not Found if order with given ID does not exist.
     """
+    fields, expand = _sparse_options(request)
+    if fields is None:
+        orders = Order.objects.with_details()
+    else:
+        orders = Order.objects.for_response(fields, expand)
     try:
-        order = Order.objects.get(id=id)
+        order = orders.get(id=id)
     except Order.DoesNotExist:
         return Response({'error': 'Order not found'}, status=status.HTTP_404_NOT_FOUND)
 
-    serializer = OrderSerializer(order)
+    serializer = OrderSerializer(order, context={'fields': fields, 'expand': expand})
     return Response(serializer.data, status=status.HTTP_200_OK)
 
 @api_view(['POST'])
+@idempotent
 def create_order(request):
     """
     Create a new order with nested order items.
 
     Expects:
         - JSON body with valid customer ID and list of items.
+        - Optional 'Idempotency-Key' header: a retry with the same key gets
+          the first response back instead of placing the order again.
 
     Returns:
         - 201 Created on successful order creation.
         - 400 Bad Request if validation fails.
+        - 409 Conflict / 422 Unprocessable Entity for an Idempotency-Key
+          still in use or reused with a different request.
     """
     serializer = OrderSerializer(data=request.data)
     if serializer.is_valid():
@@ -63,7 +139,8 @@ def delete_order(request):
         - JSON body with the 'id' of the order to delete.
 
     Logic:
-        - Each item's product stock is incremented before deletion.
+        - Item quantities are restored per product in one atomic update
+          before the order is deleted.
 
     Returns:
         - 204 No Content on success.
@@ -74,15 +151,71 @@ def delete_order(request):
     if not order_id:
         return Response({'error': 'Order ID is required'}, status=status.HTTP_400_BAD_REQUEST)
 
-    try:
-        order = Order.objects.get(id=order_id)
-    except Order.DoesNotExist:
+    if not Order.objects.filter(id=order_id).delete_restoring_stock():
         return Response({'error': 'Order not found'}, status=status.HTTP_404_NOT_FOUND)
 
-    # Restore stock quantities for each order item
-    for item in order.orderitem_set.all():
-        item.product.stock_quantity += item.quantity
-        item.product.save()
-
-    order.delete()
     return Response({'message': 'Order deleted successfully'}, status=status.HTTP_204_NO_CONTENT)
+
+@api_view(['DELETE'])
+def delete_orders_batch(request):
+    """
+    Delete many orders in one request and restore their stock.
+
+    Up to 1000 matching orders are deleted inline; larger deletes are
+    handed to a background job, which deletes them in chunks.
+
+    Expects:
+        - JSON body with 'ids' (list of at most 1000 order IDs) and/or a date
+          range given by 'created_after' / 'created_before' (ISO dates or
+          datetimes). At least one of them is required.
+
+    Query Params:
+        - background (optional): '1' to always use a background job.
+
+    Returns:
+        - 200 OK with the number of orders deleted.
+        - 202 Accepted with the job ID if more than 1000 orders match or
+          background mode was requested.
+        - 400 Bad Request if no filter is given or a value is invalid.
+    """
+    ids = request.data.get('ids')
+    created_after = request.data.get('created_after')
+    created_before = request.data.get('created_before')
+    if not ids and not created_after and not created_before:
+        return Response(
+            {'error': "Provide 'ids' and/or 'created_after'/'created_before'"},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    orders = Order.objects.all()
+    if ids:
+        if not isinstance(ids, list) or not all(str(i).isdigit() for i in ids):
+            return Response({'error': "'ids' must be a list of order IDs"}, status=status.HTTP_400_BAD_REQUEST)
+        if len(ids) > ORDER_DELETE_INLINE_LIMIT:
+            return Response(
+                {'error': f"'ids' can list at most {ORDER_DELETE_INLINE_LIMIT} orders; use a date range for more"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        orders = orders.filter(id__in=ids)
+    for field, value, lookup in (
+        ('created_after', created_after, 'created_at__gte'),
+        ('created_before', created_before, 'created_at__lt'),
+    ):
+        if value:
+            moment = parse_moment(value)
+            if moment is None:
+                return Response({'error': f"Invalid '{field}' value"}, status=status.HTTP_400_BAD_REQUEST)
+            orders = orders.filter(**{lookup: moment})
+
+    if wants_background(request) or orders.count() > ORDER_DELETE_INLINE_LIMIT:
+        job = enqueue(
+            'delete_orders', ids=ids or None, created_after=created_after or None,
+            created_before=created_before or None,
+        )
+        return job_accepted(request, job)
+
+    deleted = orders.delete_restoring_stock()
+    return Response(
+        {'message': f'{deleted} order(s) deleted successfully', 'deleted': deleted},
+        status=status.HTTP_200_OK
+    )
@@ -1,19 +1,37 @@
+import io
 from rest_framework.decorators import api_view
 from rest_framework.response import Response
 from rest_framework import status
-from ..serializers import ProductSerializer
+from ..conditional import conditional_get
+from ..serializers import ProductSerializer, ProductUpsertSerializer
+from ..batch import batch_response
+from ..importers import IMPORT_ERROR_REPORT_LIMIT, import_products_csv
+from ..pagination import IdCursorPagination, SearchPagination
+from ..search import search
+from ..cache import cached_response
+from ..fast_serializers import FAST_PRODUCT, use_fast_path
 from ..models import Product
+from ..jobs import enqueue, job_accepted, save_upload, wants_background
+from ..idempotency import idempotent
 
+@conditional_get(Product)
 @api_view(['GET'])
+@cached_response('product')
 def get_products(request, id=None):
     """
-    Retrieve a single product by ID or return all products.
+    Retrieve a single product by ID or return a page of products.
 
     Args:
         id (int, optional): Product ID (can be passed via URL).
 
+    Query Params:
+        - cursor / page_size (optional): List paging, see IdCursorPagination.
+        - fast (optional): '1' to build list rows from '.values()' instead of
+          the serializer (same output, less CPU).
+
     Returns:
-        - 200 OK with serialized product(s) data.
+        - 200 OK with serialized product data, or a cursor page of products
+          ('results', 'next', 'previous') when no ID is given.
         - 404 Not Found if product with given ID does not exist.
     """
     if id:
@@ -27,21 +45,52 @@ def get_products(request, id=None):
                 status=status.HTTP_404_NOT_FOUND
             )
     else:
-        products = Product.objects.all()
-        serializer = ProductSerializer(products, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        paginator = IdCursorPagination()
+        if use_fast_path(request):
+            page = paginator.paginate_queryset(Product.objects.values(*FAST_PRODUCT.lookups), request)
+            return paginator.get_paginated_response(FAST_PRODUCT.convert_many(page))
+        page = paginator.paginate_queryset(Product.objects.all(), request)
+        serializer = ProductSerializer(page, many=True)
+        return paginator.get_paginated_response(serializer.data)
+
+@api_view(['GET'])
+def search_products(request):
+    """
+    Search products by prefix or substring of 'sku' or 'product_name'.
+
+    Query Params:
+        - q: Search text.
+        - page / page_size (optional): Result page, best matches first.
+
+    Returns:
+        - 200 OK with ranked 'results' and 'next'/'previous' page links.
+        - 400 Bad Request if 'q' is missing.
+    """
+    query = request.query_params.get('q', '').strip()
+    if not query:
+        return Response({'error': "Search text 'q' is required"}, status=status.HTTP_400_BAD_REQUEST)
+
+    return SearchPagination().get_response(
+        request,
+        lambda offset, limit: search(Product, query, offset, limit),
+        ProductSerializer,
+    )
 
 @api_view(['POST'])
+@idempotent
 def create_product(request):
     """
     Create a new product using provided request data.
 
     Expects:
         - JSON body with required product fields.
+        - Optional 'Idempotency-Key' header (see idempotency.py).
 
     Returns:
         - 201 Created with product data on success.
         - 400 Bad Request if validation fails.
+        - 409 Conflict / 422 Unprocessable Entity for an Idempotency-Key
+          still in use or reused with a different request.
     """
     serializer = ProductSerializer(data=request.data)
     if serializer.is_valid():
@@ -107,3 +156,61 @@ def delete_product(request):
 
     product.delete()
     return Response({'message': 'Product deleted successfully'}, status=status.HTTP_204_NO_CONTENT)
+
+@api_view(['POST', 'DELETE'])
+def product_batch(request):
+    """
+    Upsert or delete many products in one request, keyed on 'sku'.
+
+    Expects:
+        - POST: JSON array of product objects. Existing 'sku' values are
+          updated, new ones are created.
+        - DELETE: JSON body with 'skus', a list of values to delete.
+
+    Returns:
+        - 200 OK with a per-row result ('created', 'updated', 'skipped',
+          'error', 'deleted' or 'not_found') and a count per status.
+        - 400 Bad Request if the body is malformed or too large.
+    """
+    return batch_response(request, ProductUpsertSerializer, 'sku', 'skus')
+
+@api_view(['POST'])
+def import_products(request):
+    """
+    Import a product catalogue CSV uploaded as multipart field 'file'.
+
+    Expects:
+        - CSV with header sku, product_name, product_price, stock_quantity.
+          Existing SKUs are updated, new ones are created.
+
+    Query Params:
+        - background (optional): '1' to import in a background job.
+
+    Returns:
+        - 200 OK with row counts, throughput and, if any rows were rejected
+          or superseded by a later row with the same SKU, an 'error_report'
+          CSV (capped at the first 1000 such rows).
+        - 202 Accepted with the job ID in background mode; the job result
+          holds the same data.
+        - 400 Bad Request if no file is given or the header is invalid.
+    """
+    upload = request.FILES.get('file')
+    if upload is None:
+        return Response({'error': "CSV file is required in the 'file' field"}, status=status.HTTP_400_BAD_REQUEST)
+
+    if wants_background(request):
+        return job_accepted(request, enqueue('import_products', path=save_upload(upload)))
+
+    error_file = io.StringIO()
+    try:
+        stats = import_products_csv(
+            io.TextIOWrapper(upload.file, encoding='utf-8-sig', newline=''),
+            error_file=error_file,
+            max_errors=IMPORT_ERROR_REPORT_LIMIT,
+        )
+    except (UnicodeDecodeError, ValueError) as exc:
+        return Response({'error': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+
+    if stats['failed'] or stats['duplicates']:
+        stats['error_report'] = error_file.getvalue()
+    return Response(stats, status=status.HTTP_200_OK)
@@ -0,0 +1,153 @@
+from datetime import timedelta
+from django.db.models import DecimalField, F, Sum
+from django.db.models.functions import Coalesce, TruncMonth, TruncWeek
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+from rest_framework.decorators import api_view
+from rest_framework.response import Response
+from rest_framework import status
+from ..jobs import enqueue, job_accepted
+from ..models import DailySalesRollup, InventoryMovement
+from ..utils import format_money, parse_moment
+
+DEFAULT_REPORT_DAYS = 30
+
+# Period expression per 'interval'; weeks start on Monday
+REPORT_INTERVALS = {
+    'day': F('date'),
+    'week': TruncWeek('date'),
+    'month': TruncMonth('date'),
+}
+
+def _parse_day(value):
+    try:
+        return parse_date(value)
+    except ValueError:
+        return None
+
+@api_view(['GET'])
+def get_sales_report(request):
+    """
+    Return revenue and units sold per day, week or month, read from the
+    pre-aggregated daily sales rollups.
+
+    Query Params:
+        - start, end (optional): Inclusive ISO dates (YYYY-MM-DD). Default to
+          the last 30 days ending today.
+        - interval (optional): 'day' (default), 'week' or 'month'.
+        - by_product (optional): '1' to split every period per product.
+        - product (optional): Only report this product ID.
+
+    Returns:
+        - 200 OK with the range, 'totals' and one row per period (and product).
+        - 400 Bad Request for invalid dates, range, interval or product.
+    """
+    today = timezone.localdate()
+    end = _parse_day(request.query_params['end']) if 'end' in request.query_params else today
+    start = (
+        _parse_day(request.query_params['start']) if 'start' in request.query_params
+        else end and end - timedelta(days=DEFAULT_REPORT_DAYS - 1)
+    )
+    if start is None or end is None:
+        return Response({'error': 'start and end must be dates (YYYY-MM-DD)'}, status=status.HTTP_400_BAD_REQUEST)
+    if start > end:
+        return Response({'error': 'start must not be after end'}, status=status.HTTP_400_BAD_REQUEST)
+
+    interval = request.query_params.get('interval', 'day')
+    if interval not in REPORT_INTERVALS:
+        return Response(
+            {'error': f"interval must be one of: {', '.join(REPORT_INTERVALS)}"},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    by_product = request.query_params.get('by_product', '').lower() in ('1', 'true', 'yes')
+
+    rollups = DailySalesRollup.objects.filter(date__gte=start, date__lte=end)
+    if 'product' in request.query_params:
+        try:
+            rollups = rollups.filter(product_id=int(request.query_params['product']))
+        except ValueError:
+            return Response({'error': 'product must be an integer ID'}, status=status.HTTP_400_BAD_REQUEST)
+
+    money = DecimalField(max_digits=14, decimal_places=2)
+    group = ['period', 'product_id', 'product__product_name'] if by_product else ['period']
+    rows = (
+        rollups
+        .annotate(period=REPORT_INTERVALS[interval])
+        .values(*group)
+        .annotate(units=Sum('units'), revenue=Sum('revenue'))
+        .order_by(*group[:2])
+    )
+    totals = rollups.aggregate(
+        units=Coalesce(Sum('units'), 0),
+        revenue=Coalesce(Sum('revenue'), 0, output_field=money),
+    )
+
+    results = []
+    for row in rows:
+        entry = {'period': row['period'], 'units': row['units'], 'revenue': format_money(row['revenue'])}
+        if by_product:
+            entry['product_id'] = row['product_id']
+            entry['product_name'] = row['product__product_name']
+        results.append(entry)
+
+    return Response({
+        'start': start,
+        'end': end,
+        'interval': interval,
+        'totals': {'units': totals['units'], 'revenue': format_money(totals['revenue'])},
+        'results': results,
+    }, status=status.HTTP_200_OK)
+
+@api_view(['POST'])
+def rebuild_sales_report(request):
+    """
+    Recompute the daily sales rollups from the order items in a background
+    job, e.g. after bulk changes that bypass them.
+
+    Expects:
+        - Optional JSON body with 'start' and/or 'end' (ISO dates) to limit
+          the rebuild to those days.
+
+    Returns:
+        - 202 Accepted with the job ID.
+        - 400 Bad Request for invalid dates.
+    """
+    days = {}
+    for name in ('start', 'end'):
+        if request.data.get(name):
+            day = _parse_day(str(request.data[name]))
+            if day is None:
+                return Response({'error': f'{name} must be a date (YYYY-MM-DD)'}, status=status.HTTP_400_BAD_REQUEST)
+            days[name] = day.isoformat()
+    return job_accepted(request, enqueue('rebuild_sales_rollups', **days))
+
+@api_view(['GET'])
+def get_stock_report(request):
+    """
+    Return stock levels at a point in time, read from the stock ledger: each
+    product's latest snapshot before that time plus the movements after it.
+
+    Query Params:
+        - at (required): ISO datetime, or a date meaning its midnight.
+        - product (optional): Comma-separated product IDs. Default all.
+
+    Returns:
+        - 200 OK with 'at' and one {product_id, stock_quantity} per product.
+        - 400 Bad Request for a missing or invalid time or product list.
+    """
+    moment = parse_moment(request.query_params.get('at', ''))
+    if moment is None:
+        return Response({'error': "'at' must be an ISO date or datetime"}, status=status.HTTP_400_BAD_REQUEST)
+
+    product_ids = None
+    if request.query_params.get('product'):
+        try:
+            product_ids = [int(pk) for pk in request.query_params['product'].split(',')]
+        except ValueError:
+            return Response({'error': 'product must be a comma-separated list of IDs'}, status=status.HTTP_400_BAD_REQUEST)
+
+    levels = InventoryMovement.objects.stock_at(moment, product_ids)
+    return Response({
+        'at': moment,
+        'results': [{'product_id': pk, 'stock_quantity': stock} for pk, stock in levels.items()],
+    }, status=status.HTTP_200_OK)
@@ -0,0 +1,27 @@
+import axios from "axios";
+
+// Shape returned by the cursor-paginated list endpoints (customer/, product/, order/)
+export interface Page<T> {
+  next: string | null;
+  previous: string | null;
+  results: T[];
+}
+
+export const fetchPage = async <T>(url: string): Promise<Page<T>> => {
+  const res = await axios.get<Page<T>>(url);
+  return res.data;
+};
+
+// Follows 'next' links until the list is exhausted. Only use this where the
+// whole table is genuinely needed (e.g. dropdowns); list pages should load
+// incrementally with fetchPage instead.
+export const fetchAllPages = async <T>(url: string): Promise<T[]> => {
+  const rows: T[] = [];
+  let next: string | null = url;
+  while (next) {
+    const page: Page<T> = await fetchPage<T>(next);
+    rows.push(...page.results);
+    next = page.next;
+  }
+  return rows;
+};
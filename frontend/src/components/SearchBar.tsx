@@ -7,6 +7,7 @@ interface Props {
   value: string;
   onChange: (e: React.ChangeEvent<HTMLInputElement>) => void;
   api: string; // base API endpoint like "http://127.0.0.1:8000/api/customer/"
+  searchApi?: string; // optional text search endpoint like ".../api/customer/search/"
   onResult: (data: any | null) => void; // result of the fetch
   width?: number | string;
 }
@@ -16,6 +17,7 @@ export default function SearchBar({
   value,
   onChange,
   api,
+  searchApi,
   onResult,
   width = 400,
 }: Props) {
@@ -25,6 +27,12 @@ export default function SearchBar({
       return;
     }
     try {
+      // Numeric input is an ID lookup; anything else goes to the search endpoint
+      if (searchApi && !/^\d+$/.test(value.trim())) {
+        const res = await axios.get(searchApi, { params: { q: value.trim() } });
+        onResult(res.data.results);
+        return;
+      }
       const res = await axios.get(`${api}${value}`);
       onResult(res.data);
     } catch (err) {
@@ -10,8 +10,8 @@ import { DataGrid } from "@mui/x-data-grid";
 import type { GridPaginationModel, GridColDef } from "@mui/x-data-grid";
 import { Edit } from "@mui/icons-material";
 import AddIcon from "@mui/icons-material/Add";
-import axios from "axios";
 import { useEffect, useState } from "react";
+import { fetchAllPages } from "../../api/pagination";
 import Update from "./Update";
 import Create from "./Create";
 
@@ -39,8 +39,7 @@ const List = () => {
 
   const fetchCustomers = async () => {
     try {
-      const res = await axios.get<Customer[]>(BASE_URL + "customer/");
-      setCustomers(res.data);
+      setCustomers(await fetchAllPages<Customer>(BASE_URL + "customer/"));
     } catch (err) {
       console.error("Failed to fetch customers", err);
     }
@@ -5,14 +5,15 @@ import {
   Tooltip,
   useTheme,
   Alert,
+  Button,
 } from "@mui/material";
 import { DataGrid } from "@mui/x-data-grid";
 import type { GridPaginationModel, GridColDef } from "@mui/x-data-grid";
 import { Edit } from "@mui/icons-material";
-import axios from "axios";
 import { useEffect, useState } from "react";
 import Update from "./UpdateCustomer";
 import SearchBar from "../../components/SearchBar";
+import { fetchPage } from "../../api/pagination";
 
 interface Customer {
   id: number;
@@ -37,11 +38,14 @@ const ListCustomer = () => {
   });
   const [selectedCustomerId, setSelectedCustomerId] = useState<number | null>(null);
   const [shouldRefresh, setShouldRefresh] = useState(false);
+  const [nextUrl, setNextUrl] = useState<string | null>(null);
+  const [loadingMore, setLoadingMore] = useState(false);
   const fetchCustomers = async () => {
     try {
-      const res = await axios.get<Customer[]>(BASE_URL + "customer/");
-      setCustomers(res.data);
-      setFilteredCustomers(res.data);
+      const page = await fetchPage<Customer>(BASE_URL + "customer/");
+      setCustomers(page.results);
+      setFilteredCustomers(page.results);
+      setNextUrl(page.next);
       setError(null);
     } catch (err) {
       console.error("Failed to fetch customers", err);
@@ -53,14 +57,34 @@ const ListCustomer = () => {
     fetchCustomers();
   }, [shouldRefresh]);
 
-  const handleSearchResult = (data: Customer | "reset" | null) => {
+  const loadMore = async () => {
+    if (!nextUrl) return;
+    setLoadingMore(true);
+    try {
+      const page = await fetchPage<Customer>(nextUrl);
+      const loaded = [...customers, ...page.results];
+      setCustomers(loaded);
+      setFilteredCustomers(loaded);
+      setNextUrl(page.next);
+    } catch (err) {
+      console.error("Failed to load more customers", err);
+      setError("Failed to load more customers.");
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
+  const handleSearchResult = (data: Customer | Customer[] | "reset" | null) => {
     if (data === "reset") {
       setFilteredCustomers(customers);
       setError(null);
       return;
     }
 
-    if (data) {
+    if (Array.isArray(data)) {
+      setFilteredCustomers(data);
+      setError(data.length ? null : "No customers match the search.");
+    } else if (data) {
       setFilteredCustomers([data]);
       setError(null);
     } else {
@@ -133,10 +157,11 @@ const ListCustomer = () => {
 
       <Box mb={2}>
         <SearchBar
-          placeholder="Search by Customer ID"
+          placeholder="Search by Customer ID, name, email or phone"
           value={search}
           onChange={(e) => setSearch(e.target.value)}
           api={BASE_URL + "customer/"}
+          searchApi={BASE_URL + "customer/search/"}
           onResult={handleSearchResult}
         />
       </Box>
@@ -185,6 +210,14 @@ const ListCustomer = () => {
           }}
         />
       </Box>
+
+      {nextUrl && filteredCustomers === customers && (
+        <Box mt={2} textAlign="center">
+          <Button variant="outlined" onClick={loadMore} disabled={loadingMore}>
+            {loadingMore ? "Loading..." : "Load more"}
+          </Button>
+        </Box>
+      )}
     </Box>
   );
 };
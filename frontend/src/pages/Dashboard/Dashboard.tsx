@@ -11,79 +11,76 @@ interface Product {
 }
 
 interface TopSellingProduct {
+  product_id: number;
   product_name: string;
-  totalSold: number;
+  total_sold: number;
 }
 
+interface DashboardSummary {
+  active_customers: number;
+  total_orders: number;
+  net_sales: string;
+  low_stock_count: number;
+  out_of_stock_count: number;
+  top_selling_products: TopSellingProduct[];
+  low_stock_products: Product[];
+  out_of_stock_products: Product[];
+}
+
+const LOW_STOCK_THRESHOLD = 5;
+const LIVE_REFRESH_DELAY_MS = 1000;
+
 const Dashboard = () => {
   const theme = useTheme();
   const BASE_URL = import.meta.env.VITE_BASE_URL;
 
-  const [activeCustomersStats, setActiveCustomersStats] = useState<number>(0);
-  const [lowStockProducts, setLowStockProducts] = useState<Product[]>([]);
-  const [outOfStockProducts, setOutOfStockProducts] = useState<Product[]>([]);
-  const [topSellingProducts, setTopSellingProducts] = useState<TopSellingProduct[]>([]);
-  const [netSales, setNetSales] = useState<number>(0);
-
-  const computeTopSellingProducts = (orders: any[]): TopSellingProduct[] => {
-    const productSalesMap: Record<number, TopSellingProduct> = {};
-
-    orders.forEach((order) => {
-      order.items.forEach((item: any) => {
-        const id = item.product.id;
-        const name = item.product.product_name;
-        const quantity = item.quantity;
-
-        if (!productSalesMap[id]) {
-          productSalesMap[id] = {
-            product_name: name,
-            totalSold: 0,
-          };
-        }
-
-        productSalesMap[id].totalSold += quantity;
-      });
-    });
-
-    return Object.values(productSalesMap)
-      .sort((a, b) => b.totalSold - a.totalSold)
-      .slice(0, 5);
-  };
-
-  const computeNetSales = (orders: any[]): number => {
-    let total = 0;
-    orders.forEach((order) => {
-      order.items.forEach((item: any) => {
-        const price = parseFloat(item.product.product_price);
-        total += price * item.quantity;
-      });
-    });
-    return total;
-  };
+  const [summary, setSummary] = useState<DashboardSummary | null>(null);
 
   const fetchData = async () => {
     try {
-      const productRes = await axios.get(BASE_URL + "product/");
-      const products: Product[] = productRes.data;
-
-      setLowStockProducts(products.filter((p) => p.stock_quantity > 0 && p.stock_quantity <= 5));
-      setOutOfStockProducts(products.filter((p) => p.stock_quantity === 0));
-
-      const activeRes = await axios.get(BASE_URL + "customer/active/");
-      setActiveCustomersStats(activeRes.data);
-
-      const orderRes = await axios.get(BASE_URL + "order/");
-      const orders = orderRes.data;
-
-      setTopSellingProducts(computeTopSellingProducts(orders));
-      setNetSales(computeNetSales(orders));
+      const res = await axios.get<DashboardSummary>(BASE_URL + "dashboard/summary/", {
+        params: { low_stock_threshold: LOW_STOCK_THRESHOLD },
+      });
+      setSummary(res.data);
     } catch (error) {
       console.error("Error fetching dashboard data:", error);
     }
   };
 
+  const activeCustomersStats = summary?.active_customers ?? 0;
+  const netSales = Number(summary?.net_sales ?? 0);
+  const topSellingProducts = summary?.top_selling_products ?? [];
+  const lowStockProducts = summary?.low_stock_products ?? [];
+  const outOfStockProducts = summary?.out_of_stock_products ?? [];
+
   useEffect(() => {
     fetchData();
+
+    // Live updates: refetch the summary shortly after stock or order events.
+    // Only servers running under ASGI can stream them, so ask first.
+    // EventSource reconnects by itself and resumes via Last-Event-ID.
+    let refresh: ReturnType<typeof setTimeout> | undefined;
+    let events: EventSource | undefined;
+    let closed = false;
+    const scheduleRefresh = () => {
+      clearTimeout(refresh);
+      refresh = setTimeout(fetchData, LIVE_REFRESH_DELAY_MS);
+    };
+    axios
+      .get<{ streaming: boolean }>(BASE_URL + "events/status/")
+      .then((res) => {
+        if (closed || !res.data.streaming) return;
+        events = new EventSource(BASE_URL + "events/");
+        ["stock", "order_created", "order_deleted", "reset"].forEach((type) =>
+          events?.addEventListener(type, scheduleRefresh)
+        );
+      })
+      .catch((error) => console.error("Error checking live events:", error));
+    return () => {
+      closed = true;
+      clearTimeout(refresh);
+      events?.close();
+    };
   }, []);
 
   return (
@@ -124,7 +121,7 @@ const Dashboard = () => {
               Low Stock Products
             </Typography>
             <Typography variant="h4" fontWeight="bold" color="warning.main">
-              {lowStockProducts.length}
+              {summary?.low_stock_count ?? 0}
             </Typography>
           </Paper>
         </Grid>
@@ -136,7 +133,7 @@ const Dashboard = () => {
               Out of Stock Products
             </Typography>
             <Typography variant="h4" fontWeight="bold" color="error">
-              {outOfStockProducts.length}
+              {summary?.out_of_stock_count ?? 0}
             </Typography>
           </Paper>
         </Grid>
@@ -150,8 +147,8 @@ const Dashboard = () => {
             <Divider sx={{ mb: 1 }} />
             {topSellingProducts.length > 0 ? (
               topSellingProducts.map((prod, index) => (
-                <Typography key={index} variant="body1" sx={{ mb: 0.5 }}>
-                  {index + 1}. {prod.product_name} — {prod.totalSold} sold
+                <Typography key={prod.product_id} variant="body1" sx={{ mb: 0.5 }}>
+                  {index + 1}. {prod.product_name} — {prod.total_sold} sold
                 </Typography>
               ))
             ) : (
@@ -166,7 +163,7 @@ const Dashboard = () => {
         <Grid item xs={12} md={6}>
           <Paper sx={{ p: 3, borderRadius: 2 }}>
             <Typography variant="subtitle2" color="warning.main" gutterBottom>
-              Low Stock Details (≤ 5)
+              Low Stock Details (≤ {LOW_STOCK_THRESHOLD})
             </Typography>
             <Divider sx={{ mb: 1 }} />
             {lowStockProducts.length > 0 ? (
@@ -14,6 +14,7 @@ import AddIcon from "@mui/icons-material/Add";
 import DeleteIcon from "@mui/icons-material/Delete";
 import axios from "axios";
 import { useEffect, useState } from "react";
+import { fetchAllPages } from "../../api/pagination";
 
 interface Customer {
   id: number;
@@ -44,17 +45,20 @@ const CreateOrder = ({ onClose }: Props) => {
 
   const [responseMsg, setResponseMsg] = useState("");
   const [isError, setIsError] = useState(false);
+  // Sent with every submit of the same order, so the server places it only
+  // once even if an earlier attempt timed out after going through
+  const [idempotencyKey, setIdempotencyKey] = useState(() => crypto.randomUUID());
 
   useEffect(() => {
     const fetchData = async () => {
       try {
-        const [custRes, prodRes] = await Promise.all([
-          axios.get(BASE_URL + "customer/"),
-          axios.get(BASE_URL + "product/"),
+        const [allCustomers, allProducts] = await Promise.all([
+          fetchAllPages<any>(BASE_URL + "customer/"),
+          fetchAllPages<any>(BASE_URL + "product/"),
         ]);
 
-        const activeCustomers = custRes.data.filter((cust: any) => cust.isActive);
-        const activeProducts = prodRes.data.filter((prod: any) => (prod.isActive && prod.stock_quantity > 0));
+        const activeCustomers = allCustomers.filter((cust: any) => cust.isActive);
+        const activeProducts = allProducts.filter((prod: any) => (prod.isActive && prod.stock_quantity > 0));
         setCustomers(activeCustomers);
         setProducts(activeProducts);
       } catch (err) {
@@ -106,13 +110,19 @@ const CreateOrder = ({ onClose }: Props) => {
     };
 
     try {
-      await axios.post(BASE_URL + "order/create/", payload);
+      await axios.post(BASE_URL + "order/create/", payload, {
+        headers: { "Idempotency-Key": idempotencyKey },
+      });
       setIsError(false);
       setResponseMsg("Order placed successfully!");
       setTimeout(onClose, 1200);
     } catch (err: any) {
       console.error(err);
       setIsError(true);
+      // The server answered and keeps that answer for this key; the next
+      // (possibly edited) submit is a new request. Without a response, keep
+      // the key so a retry cannot place the order twice.
+      if (err?.response) setIdempotencyKey(crypto.randomUUID());
 
       const errorMsg =
         err?.response?.data?.detail ||
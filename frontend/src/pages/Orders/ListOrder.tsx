@@ -6,11 +6,13 @@ import {
   AccordionDetails,
   Divider,
   Stack,
+  Button,
   useTheme,
 } from "@mui/material";
 import ExpandMoreIcon from "@mui/icons-material/ExpandMore";
-import axios from "axios";
 import { useEffect, useState } from "react";
+import axios from "axios";
+import { fetchPage } from "../../api/pagination";
 
 interface Customer {
   id: number;
@@ -34,24 +36,34 @@ interface OrderItem {
   id: number;
   product: Product;
   quantity: number;
+  unit_price: string;
 }
 
 interface Order {
   id: number;
   customer: Customer;
   created_at: string;
-  items: OrderItem[];
+  total_amount: string;
+  item_count: number;
 }
 
+// The list only needs order summaries; items are loaded when an order is opened
+const LIST_QUERY = "?fields=id,customer,created_at,total_amount,item_count&expand=customer";
+const ITEMS_QUERY = "?fields=items&expand=items.product";
+
 const ListOrder = () => {
   const theme = useTheme();
   const BASE_URL = import.meta.env.VITE_BASE_URL;
   const [orders, setOrders] = useState<Order[]>([]);
+  const [nextUrl, setNextUrl] = useState<string | null>(null);
+  const [loadingMore, setLoadingMore] = useState(false);
+  const [itemsByOrder, setItemsByOrder] = useState<Record<number, OrderItem[]>>({});
 
   const fetchOrders = async () => {
     try {
-      const res = await axios.get<Order[]>(BASE_URL + "order/");
-      setOrders(res.data);
+      const page = await fetchPage<Order>(BASE_URL + "order/" + LIST_QUERY);
+      setOrders(page.results);
+      setNextUrl(page.next);
     } catch (err) {
       console.error("Failed to fetch orders", err);
     }
@@ -61,11 +73,28 @@ const ListOrder = () => {
     fetchOrders();
   }, []);
 
-  const calculateTotal = (items: OrderItem[]) => {
-    return items.reduce((sum, item) => {
-      const price = parseFloat(item.product.product_price || "0");
-      return sum + price * item.quantity;
-    }, 0);
+  const loadMore = async () => {
+    if (!nextUrl) return;
+    setLoadingMore(true);
+    try {
+      const page = await fetchPage<Order>(nextUrl);
+      setOrders((prev) => [...prev, ...page.results]);
+      setNextUrl(page.next);
+    } catch (err) {
+      console.error("Failed to load more orders", err);
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
+  const loadItems = async (orderId: number) => {
+    if (itemsByOrder[orderId]) return;
+    try {
+      const res = await axios.get<{ items: OrderItem[] }>(`${BASE_URL}order/${orderId}/${ITEMS_QUERY}`);
+      setItemsByOrder((prev) => ({ ...prev, [orderId]: res.data.items }));
+    } catch (err) {
+      console.error("Failed to fetch order items", err);
+    }
   };
 
   return (
@@ -78,7 +107,11 @@ const ListOrder = () => {
         <Typography>No orders found.</Typography>
       ) : (
         orders.map((order) => (
-          <Accordion key={order.id} sx={{ mb: 2 }}>
+          <Accordion
+            key={order.id}
+            sx={{ mb: 2 }}
+            onChange={(_, expanded) => expanded && loadItems(order.id)}
+          >
             <AccordionSummary expandIcon={<ExpandMoreIcon />}>
               <Box>
                 <Typography variant="h6" fontWeight={600}>
@@ -110,11 +143,13 @@ const ListOrder = () => {
                   Items Ordered
                 </Typography>
 
-                {order.items.length === 0 ? (
+                {!itemsByOrder[order.id] ? (
+                  <Typography color="text.secondary">Loading items...</Typography>
+                ) : itemsByOrder[order.id].length === 0 ? (
                   <Typography color="text.secondary">No items in this order.</Typography>
                 ) : (
                   <Box>
-                    {order.items.map((item) => (
+                    {itemsByOrder[order.id].map((item) => (
                       <Box
                         key={item.id}
                         sx={{
@@ -136,10 +171,10 @@ const ListOrder = () => {
                         </Box>
                         <Box textAlign="right">
                           <Typography>
-                            ₹{parseFloat(item.product.product_price).toFixed(2)} × {item.quantity}
+                            ₹{parseFloat(item.unit_price).toFixed(2)} × {item.quantity}
                           </Typography>
                           <Typography fontWeight={600}>
-                            ₹{(parseFloat(item.product.product_price) * item.quantity).toFixed(2)}
+                            ₹{(parseFloat(item.unit_price) * item.quantity).toFixed(2)}
                           </Typography>
                         </Box>
                       </Box>
@@ -151,13 +186,21 @@ const ListOrder = () => {
 
                 {/* Total */}
                 <Typography fontSize="1.2rem" fontWeight={600}>
-                  Total: ₹{calculateTotal(order.items).toFixed(2)}
+                  Total: ₹{parseFloat(order.total_amount).toFixed(2)} ({order.item_count} units)
                 </Typography>
               </Box>
             </AccordionDetails>
           </Accordion>
         ))
       )}
+
+      {nextUrl && (
+        <Box mt={2} textAlign="center">
+          <Button variant="outlined" onClick={loadMore} disabled={loadingMore}>
+            {loadingMore ? "Loading..." : "Load more"}
+          </Button>
+        </Box>
+      )}
     </Box>
   );
 };
@@ -5,14 +5,15 @@ import {
   Tooltip,
   useTheme,
   Alert,
+  Button,
 } from "@mui/material";
 import { DataGrid } from "@mui/x-data-grid";
 import type { GridPaginationModel, GridColDef } from "@mui/x-data-grid";
 import { Edit } from "@mui/icons-material";
-import axios from "axios";
 import { useEffect, useState } from "react";
 import UpdateProduct from "./UpdateProduct";
 import SearchBar from "../../components/SearchBar";
+import { fetchPage } from "../../api/pagination";
 
 interface Product {
   id: number;
@@ -37,12 +38,15 @@ const ListProduct = () => {
   });
   const [selectedProductId, setSelectedProductId] = useState<number | null>(null);
   const [shouldRefresh, setShouldRefresh] = useState(false);
+  const [nextUrl, setNextUrl] = useState<string | null>(null);
+  const [loadingMore, setLoadingMore] = useState(false);
 
   const fetchProducts = async () => {
     try {
-      const res = await axios.get<Product[]>(BASE_URL + "product/");
-      setProducts(res.data);
-      setFilteredProducts(res.data);
+      const page = await fetchPage<Product>(BASE_URL + "product/");
+      setProducts(page.results);
+      setFilteredProducts(page.results);
+      setNextUrl(page.next);
       setError(null);
     } catch (err) {
       console.error("Failed to fetch products", err);
@@ -54,14 +58,34 @@ const ListProduct = () => {
     fetchProducts();
   }, [shouldRefresh]);
 
-  const handleSearchResult = (data: Product | "reset" | null) => {
+  const loadMore = async () => {
+    if (!nextUrl) return;
+    setLoadingMore(true);
+    try {
+      const page = await fetchPage<Product>(nextUrl);
+      const loaded = [...products, ...page.results];
+      setProducts(loaded);
+      setFilteredProducts(loaded);
+      setNextUrl(page.next);
+    } catch (err) {
+      console.error("Failed to load more products", err);
+      setError("Failed to load more products.");
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
+  const handleSearchResult = (data: Product | Product[] | "reset" | null) => {
     if (data === "reset") {
       setFilteredProducts(products);
       setError(null);
       return;
     }
 
-    if (data) {
+    if (Array.isArray(data)) {
+      setFilteredProducts(data);
+      setError(data.length ? null : "No products match the search.");
+    } else if (data) {
       setFilteredProducts([data]);
       setError(null);
     } else {
@@ -156,10 +180,11 @@ const ListProduct = () => {
 
       <Box mb={2}>
         <SearchBar
-          placeholder="Search by Product ID"
+          placeholder="Search by Product ID, SKU or name"
           value={search}
           onChange={(e) => setSearch(e.target.value)}
           api={BASE_URL + "product/"}
+          searchApi={BASE_URL + "product/search/"}
           onResult={handleSearchResult}
         />
       </Box>
@@ -208,6 +233,14 @@ const ListProduct = () => {
           }}
         />
       </Box>
+
+      {nextUrl && filteredProducts === products && (
+        <Box mt={2} textAlign="center">
+          <Button variant="outlined" onClick={loadMore} disabled={loadingMore}>
+            {loadingMore ? "Loading..." : "Load more"}
+          </Button>
+        </Box>
+      )}
     </Box>
   );
 };